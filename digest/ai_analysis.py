@@ -6,6 +6,7 @@ import json
 import re
 from typing import Dict, List, Any
 
+from . import instrumentation
 from .models import NewsStory
 
 try:
@@ -41,13 +42,19 @@ def ai_analyze_stories(
         prompt=ai_prompt
     )
     model_cfg = ai_prompts_config["ai_model"]
-    response = anthropic_client.messages.create(
-        model=model_cfg["name"],
-        max_tokens=model_cfg["analysis_max_tokens"],
-        temperature=model_cfg["analysis_temperature"],
-        messages=[{"role": "user", "content": system_instruction}],
-    )
-    response_text = response.content[0].text.strip()
+    with instrumentation.track(
+        "analysis", "anthropic", language=language, model=model_cfg["name"], stories=len(all_stories)
+    ) as call:
+        call.bytes_sent = len(system_instruction.encode("utf-8"))
+        response = anthropic_client.messages.create(
+            model=model_cfg["name"],
+            max_tokens=model_cfg["analysis_max_tokens"],
+            temperature=model_cfg["analysis_temperature"],
+            messages=[{"role": "user", "content": system_instruction}],
+        )
+        response_text = response.content[0].text.strip()
+        call.bytes_received = len(response_text.encode("utf-8"))
+        instrumentation.record_claude_usage(call, response, model_cfg)
     cleaned = response_text
     if cleaned.startswith("```json"):
         cleaned = cleaned[7:]
@@ -187,10 +194,18 @@ async def ai_synthesize_content(
     )
     system_msg = get_system_message(language, ai_prompts_config)
     model_cfg = ai_prompts_config["ai_model"]
-    response = anthropic_client.messages.create(
-        model=model_cfg["name"],
-        max_tokens=model_cfg["synthesis_max_tokens"],
-        temperature=model_cfg["synthesis_temperature"],
-        messages=[{"role": "user", "content": f"{system_msg} {prompt}"}],
-    )
-    return response.content[0].text.strip()
+    content = f"{system_msg} {prompt}"
+    with instrumentation.track(
+        "synthesis", "anthropic", language=language, model=model_cfg["name"], theme=theme
+    ) as call:
+        call.bytes_sent = len(content.encode("utf-8"))
+        response = anthropic_client.messages.create(
+            model=model_cfg["name"],
+            max_tokens=model_cfg["synthesis_max_tokens"],
+            temperature=model_cfg["synthesis_temperature"],
+            messages=[{"role": "user", "content": content}],
+        )
+        text = response.content[0].text.strip()
+        call.bytes_received = len(text.encode("utf-8"))
+        instrumentation.record_claude_usage(call, response, model_cfg)
+    return text
@@ -0,0 +1,176 @@
+"""
+Provider-neutral digest: sections of sentences, rendered to provider-specific TTS text on demand.
+
+Synthesis builds a DigestDocument; Edge TTS text (non-breaking spaces, spelled-out acronyms) and the
+plain text used by Pocket, ElevenLabs and DD are both rendered from it, and each render is cached on
+the document. The document is saved next to the transcript as news_digest_ai_<date>.digest.json so a
+later run can feed another provider from the same digest without reversing Edge edits. A transcript
+edited by hand after that no longer matches the document's Edge rendering; load_for_transcript() then
+drops the document so the edited text is what gets voiced.
+
+Edge TTS can also be driven with SSML (tts_settings.edge_tts.ssml_mode): ssml_fragments() gives one
+escaped sentence per fragment followed by an explicit <break/>, longer between sections, instead of
+steering Edge's pauses with non-breaking spaces and rewritten periods.
+"""
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from xml.sax.saxutils import escape
+
+SECTION_INTRO = "intro"
+SECTION_THEME = "theme"
+SECTION_CLOSING = "closing"
+
+FORMAT_VERSION = 1
+
+# Sentences are split at a single space after . ! or ?, so " ".join(sentences) restores the text.
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?]) ")
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split section text into sentences (lossless: " ".join() gives the text back)."""
+    text = text.strip()
+    return _SENTENCE_SPLIT_RE.split(text) if text else []
+
+
+@dataclass
+class Section:
+    """One part of the digest: the intro, one theme's synthesis, or the closing."""
+
+    kind: str
+    sentences: List[str] = field(default_factory=list)
+    title: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return " ".join(self.sentences)
+
+    @classmethod
+    def from_text(cls, kind: str, text: str, title: Optional[str] = None) -> "Section":
+        return cls(kind=kind, sentences=split_sentences(text), title=title)
+
+
+def _render_edge(doc: "DigestDocument") -> str:
+    from .digest_synthesis import get_normalizer  # digest_synthesis builds documents
+
+    return get_normalizer(doc.language, edge=True).normalize(doc.raw_text())
+
+
+def _render_plain(doc: "DigestDocument") -> str:
+    from .digest_synthesis import get_normalizer
+
+    return get_normalizer(doc.language, edge=False).normalize(doc.raw_text())
+
+
+# Provider -> renderer. Pocket, ElevenLabs and DD read ordinary text; only Edge needs its workarounds.
+RENDERERS: Dict[str, Callable[["DigestDocument"], str]] = {
+    "edge_tts": _render_edge,
+    "pocket_tts": _render_plain,
+    "elevenlabs": _render_plain,
+    "dd_tts": _render_plain,
+}
+
+
+def _break_tag(ms: int) -> str:
+    return f"<break time='{int(ms)}ms'/>" if ms > 0 else ""
+
+
+class DigestDocument:
+    """Structured digest for one language and day."""
+
+    def __init__(self, language: str, sections: List[Section], date: Optional[str] = None):
+        self.language = language
+        self.sections = sections
+        self.date = date
+        self._renders: Dict[str, str] = {}
+
+    def raw_text(self) -> str:
+        """Synthesized text before any TTS normalization."""
+        return " ".join(s.text for s in self.sections if s.sentences)
+
+    def render(self, provider: str) -> str:
+        """TTS text for a provider (cached per document)."""
+        text = self._renders.get(provider)
+        if text is None:
+            renderer = RENDERERS.get(provider, _render_plain)
+            text = self._renders[provider] = renderer(self)
+        return text
+
+    def render_sections(self, provider: str) -> List[str]:
+        """TTS text for each non-empty section, rendered on its own (one request per section)."""
+        return [DigestDocument(self.language, [s], self.date).render(provider) for s in self.sections if s.sentences]
+
+    def ssml_fragments(self, sentence_break_ms: int = 250, section_break_ms: int = 800) -> List[str]:
+        """
+        Edge TTS SSML body as one fragment per sentence: the XML-escaped sentence (plain rendering,
+        no Edge workarounds) followed by the break before the next one. Fragments are safe split
+        points; the last one has no break.
+        """
+        from .digest_synthesis import get_normalizer
+
+        normalize = get_normalizer(self.language, edge=False).normalize
+        fragments: List[str] = []
+        sections = [s for s in self.sections if s.sentences]
+        for i, section in enumerate(sections):
+            last_section = i == len(sections) - 1
+            for j, sentence in enumerate(section.sentences):
+                text = normalize(sentence).strip()
+                if not text:
+                    continue
+                if j < len(section.sentences) - 1:
+                    pause = _break_tag(sentence_break_ms)
+                else:
+                    pause = "" if last_section else _break_tag(section_break_ms)
+                fragments.append(escape(text) + pause)
+        return fragments
+
+    def to_dict(self) -> dict:
+        return {
+            "version": FORMAT_VERSION,
+            "language": self.language,
+            "date": self.date,
+            "sections": [asdict(s) for s in self.sections],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DigestDocument":
+        sections = [
+            Section(kind=s["kind"], sentences=list(s.get("sentences") or []), title=s.get("title"))
+            for s in data.get("sections", [])
+        ]
+        return cls(data["language"], sections, date=data.get("date"))
+
+    def save(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=1)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "DigestDocument":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def document_path(transcript_path: str) -> str:
+    """news_digest_ai_<date>.txt -> news_digest_ai_<date>.digest.json (same directory)."""
+    base, _ = os.path.splitext(transcript_path)
+    return base + ".digest.json"
+
+
+def load_for_transcript(transcript_path: str, transcript_text: str) -> Optional[DigestDocument]:
+    """
+    The document saved with a transcript, or None when there is none or the transcript was edited
+    since (transcript_text, the transcript body, differs from the document's Edge rendering).
+    """
+    path = document_path(transcript_path)
+    if not os.path.exists(path):
+        return None
+    document = DigestDocument.load(path)
+    if document.render("edge_tts").strip() != transcript_text.strip():
+        return None
+    return document
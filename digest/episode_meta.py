@@ -0,0 +1,157 @@
+"""
+Per-episode metadata sidecar, written by the generator next to the MP3.
+
+audio/news_digest_ai_<date>.mp3 -> audio/news_digest_ai_<date>.meta.json holds what the generator
+already knew when it made the episode: duration, words, WPS, size, SHA-256, themes, story count,
+provider/voice (and the providers a hedged TTS chain tried, digest/hedging.py) and phase timings. The
+RSS and website scripts read it instead of decoding audio or parsing the transcript header, and fall
+back to computing values when it is missing or stale (the MP3's size no longer matches, e.g. after a
+re-encode outside the generator).
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+FORMAT_VERSION = 1
+
+
+def meta_path(audio_path: str) -> str:
+    """news_digest_ai_<date>.mp3 -> news_digest_ai_<date>.meta.json (same directory)."""
+    base, _ = os.path.splitext(str(audio_path))
+    return base + ".meta.json"
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+@dataclass
+class EpisodeMeta:
+    """Facts about one generated episode (audio + transcript)."""
+
+    language: str
+    date: str  # YYYY-MM-DD
+    audio_file: str  # basename
+    transcript_file: str  # basename
+    duration_s: float
+    words: int
+    wps: float
+    size_bytes: int
+    sha256: str
+    generated_at: str  # ISO 8601, UTC
+    tts_provider: Optional[str] = None
+    voice: Optional[str] = None
+    tts_attempts: List[dict] = field(default_factory=list)
+    themes: List[str] = field(default_factory=list)
+    story_count: Optional[int] = None
+    timings_s: Dict[str, float] = field(default_factory=dict)
+    loudness_lufs: Optional[float] = None
+    format_version: int = FORMAT_VERSION
+
+    @property
+    def theme_count(self) -> int:
+        return len(self.themes)
+
+    @property
+    def generated_datetime(self) -> Optional[datetime]:
+        try:
+            return datetime.fromisoformat(self.generated_at)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def for_episode(
+        cls,
+        audio_path: str,
+        transcript_path: str,
+        language: str,
+        audio_stats: dict,
+        *,
+        tts_provider: Optional[str] = None,
+        voice: Optional[str] = None,
+        tts_attempts: Optional[List[dict]] = None,
+        themes: Optional[List[str]] = None,
+        story_count: Optional[int] = None,
+        timings_s: Optional[Dict[str, float]] = None,
+        episode_date: Optional[str] = None,
+    ) -> "EpisodeMeta":
+        """Build from generate_audio_digest's stats; size and hash are taken from the MP3 on disk."""
+        post = audio_stats.get("postprocess") or {}
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        return cls(
+            language=language,
+            date=episode_date or now.date().isoformat(),
+            audio_file=os.path.basename(audio_path),
+            transcript_file=os.path.basename(transcript_path),
+            duration_s=round(float(audio_stats.get("duration") or 0.0), 3),
+            words=int(audio_stats.get("words") or 0),
+            wps=round(float(audio_stats.get("wps") or 0.0), 3),
+            size_bytes=os.path.getsize(audio_path),
+            sha256=file_sha256(audio_path),
+            generated_at=now.isoformat(),
+            tts_provider=tts_provider,
+            voice=voice,
+            tts_attempts=list(tts_attempts or []),
+            themes=list(themes or []),
+            story_count=story_count,
+            timings_s={k: round(v, 3) for k, v in (timings_s or {}).items()},
+            loudness_lufs=post.get("integrated_lufs"),
+        )
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["theme_count"] = self.theme_count
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EpisodeMeta":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+    def save(self, path: str) -> None:
+        """Write atomically, so a reader never sees half a file."""
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["EpisodeMeta"]:
+        """The sidecar at path, or None if it is missing, unreadable or from a newer format."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format_version", 0) > FORMAT_VERSION:
+                return None
+            return cls.from_dict(data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+
+def write_for_episode(audio_path: str, transcript_path: str, language: str, audio_stats: dict, **kwargs) -> EpisodeMeta:
+    """Build and save the sidecar for audio_path; returns it."""
+    meta = EpisodeMeta.for_episode(audio_path, transcript_path, language, audio_stats, **kwargs)
+    meta.save(meta_path(audio_path))
+    return meta
+
+
+def load_for_audio(audio_path: str) -> Optional[EpisodeMeta]:
+    """The sidecar of audio_path if it still describes that file (same size), else None."""
+    meta = EpisodeMeta.load(meta_path(audio_path))
+    if meta is None:
+        return None
+    try:
+        if os.path.getsize(audio_path) != meta.size_bytes:
+            return None
+    except OSError:
+        return None
+    return meta
@@ -9,6 +9,7 @@ from typing import List
 import requests
 from bs4 import BeautifulSoup
 
+from . import instrumentation
 from .models import NewsStory
 
 
@@ -92,8 +93,10 @@ def fetch_headlines_from_source(
     """Extract headlines from a single source and return NewsStory list."""
     try:
         print(f"📡 Scanning {source_name}...")
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        with instrumentation.track("fetch", source_name, language=language, url=url) as call:
+            response = requests.get(url, headers=headers, timeout=10)
+            call.bytes_received = len(response.content)
+            response.raise_for_status()
         soup = BeautifulSoup(response.content, "html.parser")
         stories = []
         selectors = get_selectors_for_language(language)
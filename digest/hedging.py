@@ -0,0 +1,249 @@
+"""
+TTS provider chains with hedged requests: when the preferred provider is slow to produce audio, the
+next one in the chain starts alongside it and whichever finishes first is kept.
+
+voices.<lang>.tts_chain lists providers in order of preference (e.g. ["dd_tts", "edge_tts",
+"pocket_tts"]). Every attempt renders to its own file in a temporary directory outside the output
+directory and the winner is moved into place, so a cancelled or failed attempt never leaves a
+half-written episode behind. That includes Pocket, whose worker thread cannot be cancelled and may
+still be writing after its attempt lost: the directory is removed and nothing reaches docs/.
+
+Each attempt gets a latency budget from its provider's history in the call ledger: the p95 time to
+first audio over the language's last history_runs runs, times budget_multiplier (never below
+min_budget_s). Whole-file providers that record no first byte (Pocket) use the call duration instead,
+and so do duration_budget_providers: DD only sends the WAV body once synthesis is done, so its first
+byte says nothing about progress. A provider with no history gets default_budget_s. If the newest attempt has produced no audio when its
+budget runs out, the next provider starts as well; if it fails, the next one starts at once. With
+hedging disabled the chain is only a failover: the next provider starts when the previous one fails.
+
+Hedging is off by default. Budgets need ledger history from earlier runs of the same language. A run
+that starts without it (e.g. a fresh CI checkout, where logs/ is not kept) gives every provider
+default_budget_s, so the next provider in the chain would start far too often.
+
+Settings (tts_settings.hedging):
+    enabled (false), budget_multiplier (1.5), min_budget_s (10), default_budget_s (60), history_runs (20),
+    duration_budget_providers (["dd_tts"])
+"""
+
+import asyncio
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import instrumentation
+
+DEFAULTS = {
+    "enabled": False,
+    "budget_multiplier": 1.5,
+    "min_budget_s": 10.0,
+    "default_budget_s": 60.0,
+    "history_runs": 20,
+    "duration_budget_providers": ["dd_tts"],
+}
+
+# synthesize(provider, output_filename) -> generate_audio_digest-style stats
+Synthesize = Callable[[str, str], Awaitable[dict]]
+
+
+def resolve_settings(voice_config: dict) -> dict:
+    """DEFAULTS < tts_settings.hedging."""
+    settings = dict(DEFAULTS)
+    settings.update(voice_config.get("tts_settings", {}).get("hedging", {}) or {})
+    return settings
+
+
+def first_audio_samples(
+    records: Iterable[dict], provider: str, language: Optional[str] = None, use_duration: bool = False
+) -> List[float]:
+    """
+    One sample per run, oldest first: the earliest time to first audio among the provider's successful
+    TTS calls in that run, or the shortest call when none of them recorded a first byte (or use_duration).
+    """
+    runs: Dict[str, List[dict]] = {}
+    for r in records:
+        if r.get("stage") != "tts" or r.get("provider") != provider or not r.get("ok", True):
+            continue
+        if (r.get("detail") or {}).get("cached"):
+            continue  # served from the segment cache: says nothing about the provider's latency
+        if language and r.get("language") != language:
+            continue
+        runs.setdefault(r.get("run_id") or "", []).append(r)
+    samples = []
+    for items in runs.values():
+        ttfb = [] if use_duration else [
+            float(r["time_to_first_byte_s"]) for r in items if r.get("time_to_first_byte_s") is not None
+        ]
+        samples.append(min(ttfb) if ttfb else min(float(r.get("duration_s") or 0.0) for r in items))
+    return samples
+
+
+def latency_budget(
+    provider: str,
+    settings: dict,
+    language: Optional[str] = None,
+    records: Optional[Sequence[dict]] = None,
+) -> Tuple[float, Optional[float]]:
+    """(budget_s, p95_s) for provider; p95_s is None when the ledger has no history for it."""
+    history = int(settings.get("history_runs", DEFAULTS["history_runs"]))
+    if records is None:
+        files = instrumentation.ledger_files()
+        if language:
+            # run_<stamp>_<language>_<run_id>.jsonl
+            files = [p for p in files if p.name.rsplit("_", 1)[0].endswith(f"_{language}")]
+        records = instrumentation.load_records(files[-history:])
+    use_duration = provider in (settings.get("duration_budget_providers") or [])
+    samples = first_audio_samples(records, provider, language, use_duration)[-history:]
+    if not samples:
+        return float(settings.get("default_budget_s", DEFAULTS["default_budget_s"])), None
+    p95 = instrumentation.percentile(samples, 95)
+    budget = max(float(settings.get("min_budget_s", 0.0)), p95 * float(settings.get("budget_multiplier", 1.0)))
+    return budget, p95
+
+
+def attempt_path(output_filename: str, provider: str, directory: str) -> str:
+    """news_digest_ai_<date>.mp3 -> <directory>/news_digest_ai_<date>.<provider>.part.mp3."""
+    base, ext = os.path.splitext(os.path.basename(output_filename))
+    return os.path.join(directory, f"{base}.{provider}.part{ext or '.mp3'}")
+
+
+def _move_into_place(src: str, dst: str) -> None:
+    """Atomic rename; across filesystems, copy next to dst first and rename there."""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        tmp = f"{dst}.tmp{os.getpid()}"
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+
+
+@dataclass
+class Attempt:
+    """One provider's try at the episode."""
+
+    provider: str
+    filename: str
+    budget_s: Optional[float]
+    started_s: float
+    first_audio_s: Optional[float] = None
+    outcome: str = "running"
+    first_audio: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    def as_dict(self) -> dict:
+        return {
+            "provider": self.provider,
+            "started_s": round(self.started_s, 3),
+            "budget_s": round(self.budget_s, 3) if self.budget_s is not None else None,
+            "first_audio_s": round(self.first_audio_s, 3) if self.first_audio_s is not None else None,
+            "outcome": self.outcome,
+        }
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+async def generate_hedged(
+    chain: Sequence[str],
+    synthesize: Synthesize,
+    output_filename: str,
+    voice_config: dict,
+    language: Optional[str] = None,
+    records: Optional[Sequence[dict]] = None,
+) -> dict:
+    """
+    Render output_filename with the first provider in chain to finish, hedging slow ones as described
+    above. Returns the winner's stats plus tts_provider (the winner) and tts_attempts (one entry per
+    provider started: start time, budget, time to first audio and outcome). Raises the last error when
+    every provider fails.
+    """
+    if not chain:
+        raise ValueError("Empty TTS provider chain")
+    if len(chain) == 1:
+        stats = await synthesize(chain[0], output_filename)
+        return dict(stats, tts_provider=chain[0], tts_attempts=[])
+
+    settings = resolve_settings(voice_config)
+    workdir = tempfile.mkdtemp(prefix="audionews_hedge_")
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    pending = list(chain)
+    attempts: List[Attempt] = []
+    running: Dict[asyncio.Future, Attempt] = {}
+    last_error: Optional[BaseException] = None
+
+    async def run(attempt: Attempt) -> dict:
+        def heard(record) -> None:
+            # May be called from a worker thread (Pocket runs in asyncio.to_thread)
+            loop.call_soon_threadsafe(mark, attempt)
+
+        with instrumentation.first_byte_listener(heard):
+            return await synthesize(attempt.provider, attempt.filename)
+
+    def mark(attempt: Attempt) -> None:
+        if not attempt.first_audio.is_set():
+            attempt.first_audio_s = loop.time() - attempt.started_s - t0
+            attempt.first_audio.set()
+
+    def start_next() -> None:
+        provider = pending.pop(0)
+        budget = None
+        if settings.get("enabled", True) and pending:
+            budget, p95 = latency_budget(provider, settings, language, records)
+            source = f"p95 {p95:.1f}s" if p95 is not None else "no history"
+            print(f"   ⏱️ {provider}: hedging after {budget:.1f}s without audio ({source})")
+        attempt = Attempt(provider, attempt_path(output_filename, provider, workdir), budget, loop.time() - t0)
+        attempts.append(attempt)
+        running[asyncio.ensure_future(run(attempt))] = attempt
+
+    start_next()
+    try:
+        while running:
+            newest = attempts[-1]
+            timeout = None
+            if pending and newest.budget_s is not None and not newest.first_audio.is_set():
+                timeout = max(0.0, t0 + newest.started_s + newest.budget_s - loop.time())
+            done, _ = await asyncio.wait(list(running), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                if not newest.first_audio.is_set():
+                    newest.outcome = "hedged"
+                    print(f"   🐢 {newest.provider}: no audio after {newest.budget_s:.1f}s; starting {pending[0]} alongside")
+                    start_next()
+                continue
+            for task in done:
+                attempt = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    attempt.outcome = "won"
+                    for other in running.values():
+                        other.outcome = "cancelled"
+                    _move_into_place(attempt.filename, output_filename)
+                    stats = dict(task.result(), filename=output_filename)
+                    stats["tts_provider"] = attempt.provider
+                    stats["tts_attempts"] = [a.as_dict() for a in attempts]
+                    if len(attempts) > 1:
+                        print(f"   🏁 {attempt.provider} finished first ({len(attempts)} providers tried)")
+                    return stats
+                last_error = error
+                attempt.outcome = f"failed: {type(error).__name__}"
+                _remove(attempt.filename)
+                print(f"   ❌ {attempt.provider} failed: {error}")
+                if attempt is attempts[-1] and pending:
+                    print(f"   ↪️ Failing over to {pending[0]}")
+                    start_next()
+        raise last_error
+    finally:
+        for task, attempt in running.items():
+            task.cancel()
+            if attempt.outcome in ("running", "hedged"):
+                attempt.outcome = "cancelled"
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        for attempt in attempts:
+            if attempt.outcome != "won":
+                _remove(attempt.filename)
+        shutil.rmtree(workdir, ignore_errors=True)
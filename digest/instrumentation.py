@@ -0,0 +1,270 @@
+"""
+Per-run instrumentation ledger: latency, bytes, tokens/characters, retries and cost of every external call.
+
+Each pipeline run appends one JSON line per call (source fetch, Claude analysis/synthesis, TTS request)
+to its own ledger file. scripts/ledger_report.py aggregates the files by stage, language and day.
+"""
+
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Project root: parent of digest package
+_DEFAULT_LEDGER_DIR = Path(__file__).resolve().parent.parent / "logs" / "ledger"
+LEDGER_DIR_ENV = "AUDIONEWS_LEDGER_DIR"
+LEDGER_DISABLE_ENV = "AUDIONEWS_LEDGER_DISABLED"
+
+_active_ledger = None
+_active_lock = threading.Lock()
+
+# Called with the record when a call marks its first byte (digest/hedging.py watches TTS attempts this way).
+# Context-local, so it follows asyncio tasks and asyncio.to_thread into the calls made on an attempt's behalf.
+_first_byte_listener: contextvars.ContextVar = contextvars.ContextVar("first_byte_listener", default=None)
+
+
+@dataclass
+class CallRecord:
+    """One external call. Callers fill in the counters they know; the rest stay at zero/None."""
+
+    stage: str
+    provider: str
+    language: Optional[str] = None
+    run_id: Optional[str] = None
+    started_at: Optional[str] = None
+    ended_at: Optional[str] = None
+    duration_s: float = 0.0
+    time_to_first_byte_s: Optional[float] = None
+    ok: bool = True
+    error: Optional[str] = None
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    characters: int = 0
+    cost_usd: Optional[float] = None
+    detail: Dict[str, Any] = field(default_factory=dict)
+    _t0: float = field(default=0.0, repr=False)
+
+    def mark_first_byte(self) -> None:
+        """Record time to first byte/audio for streaming calls (first call wins)."""
+        if self.time_to_first_byte_s is None:
+            self.time_to_first_byte_s = round(time.perf_counter() - self._t0, 4)
+            listener = _first_byte_listener.get()
+            if listener is not None:
+                listener(self)
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        data.pop("_t0", None)
+        return data
+
+
+class Ledger:
+    """Append-only JSONL ledger for one run. Thread-safe; each record is flushed as written."""
+
+    def __init__(self, path: Optional[Path], run_id: str, language: Optional[str] = None):
+        self.path = Path(path) if path else None
+        self.run_id = run_id
+        self.language = language
+        self._lock = threading.Lock()
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def write(self, record: CallRecord) -> None:
+        if not self.path:
+            return
+        line = json.dumps(record.to_json(), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    @contextmanager
+    def track(self, stage: str, provider: str, *, language: Optional[str] = None, **detail) -> Iterator[CallRecord]:
+        """Time one external call. Exceptions are recorded on the ledger and re-raised."""
+        record = CallRecord(
+            stage=stage,
+            provider=provider,
+            language=language or self.language,
+            run_id=self.run_id,
+            started_at=_now_iso(),
+            detail=dict(detail),
+        )
+        record._t0 = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.ok = False
+            record.error = f"{type(e).__name__}: {e}"[:500]
+            raise
+        finally:
+            record.duration_s = round(time.perf_counter() - record._t0, 4)
+            record.ended_at = _now_iso()
+            self.write(record)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+
+
+def ledger_dir() -> Path:
+    """Directory holding ledger files (AUDIONEWS_LEDGER_DIR or logs/ledger in the project root)."""
+    env = (os.environ.get(LEDGER_DIR_ENV) or "").strip()
+    return Path(env) if env else _DEFAULT_LEDGER_DIR
+
+
+def start_run(language: Optional[str] = None, directory: Optional[Path] = None) -> Ledger:
+    """Open a fresh ledger file for this run and make it the active ledger."""
+    global _active_ledger
+    run_id = uuid.uuid4().hex[:12]
+    path = None
+    if not os.environ.get(LEDGER_DISABLE_ENV):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        name = f"run_{stamp}_{language or 'all'}_{run_id}.jsonl"
+        path = Path(directory or ledger_dir()) / name
+    ledger = Ledger(path, run_id, language)
+    with _active_lock:
+        _active_ledger = ledger
+    return ledger
+
+
+def end_run() -> None:
+    """Detach the active ledger; later calls are timed but not written."""
+    global _active_ledger
+    with _active_lock:
+        _active_ledger = None
+
+
+def get_ledger() -> Ledger:
+    """Return the active ledger; calls made before start_run() are timed but not written anywhere."""
+    global _active_ledger
+    with _active_lock:
+        if _active_ledger is None:
+            _active_ledger = Ledger(None, "none")
+        return _active_ledger
+
+
+def track(stage: str, provider: str, *, language: Optional[str] = None, **detail):
+    """Shortcut for get_ledger().track(...)."""
+    return get_ledger().track(stage, provider, language=language, **detail)
+
+
+@contextmanager
+def first_byte_listener(callback) -> Iterator[None]:
+    """Call callback(record) when a call tracked in this context (or tasks started from it) gets its first byte."""
+    token = _first_byte_listener.set(callback)
+    try:
+        yield
+    finally:
+        _first_byte_listener.reset(token)
+
+
+def record_claude_usage(record: CallRecord, response: Any, model_cfg: dict) -> None:
+    """Copy token usage from an Anthropic Messages response and price it from ai_model pricing."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    record.input_tokens = int(getattr(usage, "input_tokens", 0) or 0)
+    record.output_tokens = int(getattr(usage, "output_tokens", 0) or 0)
+    in_rate = model_cfg.get("input_cost_per_mtok")
+    out_rate = model_cfg.get("output_cost_per_mtok")
+    if in_rate is not None and out_rate is not None:
+        record.cost_usd = round(
+            record.input_tokens * in_rate / 1e6 + record.output_tokens * out_rate / 1e6, 6
+        )
+
+
+def record_tts_characters(record: CallRecord, text: str, settings: Optional[dict] = None) -> None:
+    """Set the character count for a TTS request and price it when the provider has a per-1k rate."""
+    record.characters = len(text)
+    rate = (settings or {}).get("cost_per_1k_chars")
+    if rate is not None:
+        record.cost_usd = round(record.characters * rate / 1000.0, 6)
+
+
+# --- Reading and aggregation (used by scripts/ledger_report.py) ---
+
+
+def load_records(paths: Iterable[Path]) -> List[dict]:
+    """Load ledger records from JSONL files; unreadable lines are skipped."""
+    records = []
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except OSError:
+            continue
+    return records
+
+
+def ledger_files(directory: Optional[Path] = None) -> List[Path]:
+    """All ledger files under directory, oldest first."""
+    d = Path(directory or ledger_dir())
+    if not d.exists():
+        return []
+    return sorted(d.glob("run_*.jsonl"))
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100); 0.0 for an empty sequence."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def aggregate(records: Iterable[dict], keys: Sequence[str] = ("day", "language", "stage")) -> List[dict]:
+    """Group records by keys (any record field, plus 'day' from started_at) and sum/percentile the counters."""
+    groups: Dict[tuple, List[dict]] = {}
+    for r in records:
+        key = tuple(_group_value(r, k) for k in keys)
+        groups.setdefault(key, []).append(r)
+    rows = []
+    for key in sorted(groups, key=lambda k: tuple("" if v is None else str(v) for v in k)):
+        items = groups[key]
+        durations = [float(r.get("duration_s") or 0.0) for r in items]
+        costs = [r["cost_usd"] for r in items if r.get("cost_usd") is not None]
+        row = dict(zip(keys, key))
+        row.update({
+            "calls": len(items),
+            "errors": sum(1 for r in items if not r.get("ok", True)),
+            "retries": sum(int(r.get("retries") or 0) for r in items),
+            "total_s": round(sum(durations), 3),
+            "mean_s": round(sum(durations) / len(durations), 3) if durations else 0.0,
+            "p95_s": round(percentile(durations, 95), 3),
+            "input_tokens": sum(int(r.get("input_tokens") or 0) for r in items),
+            "output_tokens": sum(int(r.get("output_tokens") or 0) for r in items),
+            "characters": sum(int(r.get("characters") or 0) for r in items),
+            "bytes_sent": sum(int(r.get("bytes_sent") or 0) for r in items),
+            "bytes_received": sum(int(r.get("bytes_received") or 0) for r in items),
+            "cost_usd": round(sum(costs), 6) if costs else None,
+        })
+        rows.append(row)
+    return rows
+
+
+def _group_value(record: dict, key: str) -> Any:
+    if key == "day":
+        return (record.get("started_at") or "")[:10] or None
+    return record.get(key)
@@ -0,0 +1,433 @@
+"""
+MPEG audio frame parsing and re-encode-free MP3 joining.
+
+TTS providers return MP3 (or we encode to it); when a digest is synthesized in chunks, the chunks are
+joined by concatenating their audio frames in order. Tags (ID3v2 at the start, ID3v1 at the end) and
+the Xing/Info/VBRI header frame some encoders put first are dropped, since they describe one chunk,
+not the joined file. Frames are copied as-is, so there is no decode/encode cost and no generation loss.
+Mp3Writer streams chunks to disk one at a time and finishes the file with a Xing/Info header that
+describes the whole joined stream, so players show the right duration and can seek in VBR output.
+
+read_info() gives duration, frame count and bitrate of an MP3 file without decoding it: from the
+Xing/Info or VBRI header when there is one (with the LAME encoder delay/padding, so the duration
+matches the decoded length), from the byte count for constant-bitrate streams, else by walking the
+frame headers.
+"""
+
+import os
+import struct
+from array import array
+from dataclasses import dataclass
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple
+
+# Bitrates (kbps) by [MPEG-1?][layer index 1..3]; index 0 is "free", 15 is invalid.
+_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+
+# Sample rates by version bits (0 = MPEG 2.5, 2 = MPEG 2, 3 = MPEG 1).
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+_VERSIONS = {0: "2.5", 2: "2", 3: "1"}
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    """Decoded 4-byte MPEG audio frame header."""
+
+    version: str  # "1", "2" or "2.5"
+    layer: int
+    bitrate_kbps: int
+    sample_rate: int
+    padding: bool
+    channel_mode: int  # 3 = mono
+    samples_per_frame: int
+    frame_length: int
+
+    @property
+    def mono(self) -> bool:
+        return self.channel_mode == 3
+
+    @property
+    def duration_s(self) -> float:
+        return self.samples_per_frame / self.sample_rate
+
+
+def parse_frame_header(data: bytes, offset: int = 0) -> Optional[FrameHeader]:
+    """Decode the frame header at offset, or None if there is no valid header there."""
+    if offset + 4 > len(data) or data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+        return None
+    b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+    version_bits = (b1 >> 3) & 0x03
+    layer = 4 - ((b1 >> 1) & 0x03)
+    bitrate_index = b2 >> 4
+    rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version_bits == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_index]
+    sample_rate = _SAMPLE_RATES[version_bits][rate_index]
+    padding = bool((b2 >> 1) & 0x01)
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        samples = 1152 if (mpeg1 or layer == 2) else 576
+        length = (samples // 8) * bitrate * 1000 // sample_rate + padding
+    return FrameHeader(
+        version=_VERSIONS[version_bits],
+        layer=layer,
+        bitrate_kbps=bitrate,
+        sample_rate=sample_rate,
+        padding=padding,
+        channel_mode=b3 >> 6,
+        samples_per_frame=samples,
+        frame_length=length,
+    )
+
+
+def id3v2_size(data: bytes) -> int:
+    """Length of the ID3v2 tag at the start of data (0 if there is none)."""
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = 0
+    for b in data[6:10]:
+        size = (size << 7) | (b & 0x7F)
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _side_info_length(header: FrameHeader) -> int:
+    if header.version == "1":
+        return 17 if header.mono else 32
+    return 9 if header.mono else 17
+
+
+def is_info_frame(data: bytes, offset: int, header: FrameHeader) -> bool:
+    """True if the frame at offset is a Xing/Info or VBRI header rather than audio."""
+    if header.layer != 3:
+        return False
+    xing = offset + 4 + _side_info_length(header)
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        return True
+    return data[offset + 36:offset + 40] == b"VBRI"
+
+
+def iter_frames(data: bytes) -> Iterator[Tuple[int, FrameHeader]]:
+    """
+    (offset, header) for every audio frame in data. ID3v2/ID3v1 tags and a leading Xing/Info/VBRI
+    frame are skipped; bytes that are not a frame are skipped until the next valid header.
+    """
+    pos = id3v2_size(data)
+    end = len(data)
+    if end - pos >= 128 and data[end - 128:end - 125] == b"TAG":
+        end -= 128
+    first = True
+    while pos + 4 <= end:
+        header = parse_frame_header(data, pos)
+        if header is None or pos + header.frame_length > end:
+            if header is not None:
+                break  # truncated last frame
+            nxt = data.find(b"\xff", pos + 1, end)
+            if nxt < 0:
+                break
+            pos = nxt
+            continue
+        if not (first and is_info_frame(data, pos, header)):
+            yield pos, header
+        first = False
+        pos += header.frame_length
+
+
+def audio_frames(data: bytes) -> bytes:
+    """The audio frames of one MP3, without tags or VBR header frame."""
+    return b"".join(data[pos:pos + h.frame_length] for pos, h in iter_frames(data))
+
+
+def join_mp3(parts: Iterable[bytes]) -> bytes:
+    """Concatenate the audio frames of several MP3s in order (no re-encoding)."""
+    out: List[bytes] = []
+    for part in parts:
+        out.append(audio_frames(part))
+    return b"".join(out)
+
+
+def duration_of(data: bytes) -> float:
+    """Duration in seconds from the frame headers of an MP3 held in memory."""
+    return sum(h.duration_s for _, h in iter_frames(data))
+
+
+# Xing header flags: frame count, byte count, seek table.
+_XING_FLAGS = 0x01 | 0x02 | 0x04
+
+
+def _xing_frame(first: bytes, header: FrameHeader, frames: int, total_bytes: int, toc: bytes, vbr: bool) -> bytes:
+    """
+    Build a Xing ("Xing" for VBR, "Info" for CBR) header frame matching the stream's format. It
+    uses the stream's own bitrate when that frame is large enough, else the smallest one that is;
+    the frame carries no audio. total_bytes counts the audio frames only.
+    """
+    side = _side_info_length(header)
+    needed = 4 + side + 16 + len(toc)
+    b1 = first[1] | 0x01  # no CRC
+    b3 = first[3]
+    own = first[2] >> 4
+    for index in [own] + [i for i in range(1, 15) if i != own]:
+        b2 = (index << 4) | (first[2] & 0x0D)  # same sample rate and private bit, no padding
+        candidate = parse_frame_header(bytes((0xFF, b1, b2, b3)))
+        if candidate is not None and candidate.frame_length >= needed:
+            break
+    else:
+        raise ValueError("No bitrate gives a frame large enough for a Xing header")
+    frame = bytearray(candidate.frame_length)
+    frame[0:4] = bytes((0xFF, b1, b2, b3))
+    pos = 4 + side
+    frame[pos:pos + 4] = b"Xing" if vbr else b"Info"
+    frame[pos + 4:pos + 16] = struct.pack(">III", _XING_FLAGS, frames, total_bytes + len(frame))
+    frame[pos + 16:pos + 16 + len(toc)] = toc
+    return bytes(frame)
+
+
+class Mp3Writer:
+    """
+    Write the audio frames of successive MP3 chunks to one file, then a Xing/Info header on close().
+
+    Only the chunk being appended is held in memory; the header is written into space reserved at the
+    start of the file once the frame count, byte count and seek table are known. Frames go to a
+    temporary file next to path, which is moved into place by close() and removed if writing fails,
+    so path never holds a truncated episode.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._tmp = f"{path}.tmp{os.getpid()}.mp3"
+        self._f: Optional[BinaryIO] = open(self._tmp, "wb")
+        self._first: Optional[bytes] = None
+        self._header: Optional[FrameHeader] = None
+        self._reserved = 0
+        self._offsets = array("I")  # byte offset of each frame, relative to the first audio frame
+        self._bytes = 0
+        self._bitrates = set()
+        self.duration_s = 0.0
+
+    @property
+    def frames(self) -> int:
+        return len(self._offsets)
+
+    def append(self, data: bytes) -> int:
+        """Append one chunk's audio frames; returns how many frames it had."""
+        count = 0
+        for pos, header in iter_frames(data):
+            if self._first is None:
+                self._first = data[pos:pos + 4]
+                self._header = header
+                self._reserved = len(_xing_frame(self._first, header, 0, 0, bytes(100), False))
+                self._f.write(bytes(self._reserved))
+            self._offsets.append(self._bytes)
+            self._bytes += header.frame_length
+            self._bitrates.add(header.bitrate_kbps)
+            self.duration_s += header.duration_s
+            self._f.write(data[pos:pos + header.frame_length])
+            count += 1
+        return count
+
+    def _toc(self) -> bytes:
+        """Seek table: file position (in 1/256ths) at each percent of the frames."""
+        n = len(self._offsets)
+        total = self._reserved + self._bytes
+        return bytes(
+            min(255, (self._reserved + self._offsets[min(n - 1, i * n // 100)]) * 256 // total) for i in range(100)
+        )
+
+    def close(self) -> None:
+        """Write the Xing/Info header and move the file into place. Raises ValueError if no frames were written."""
+        if self._f is None:
+            return
+        f, self._f = self._f, None
+        try:
+            if self._first is None:
+                raise ValueError(f"No MPEG audio frames written to {self.path}")
+            vbr = len(self._bitrates) > 1
+            frame = _xing_frame(self._first, self._header, self.frames, self._bytes, self._toc(), vbr)
+            f.seek(0)
+            f.write(frame)
+            f.close()
+            os.replace(self._tmp, self.path)
+        except BaseException:
+            self.abort(f)
+            raise
+
+    def abort(self, f: Optional[BinaryIO] = None) -> None:
+        """Close and delete the unfinished file; path is left untouched."""
+        f = f or self._f
+        self._f = None
+        if f is not None:
+            f.close()
+        try:
+            os.unlink(self._tmp)
+        except OSError:
+            pass
+
+    def __enter__(self) -> "Mp3Writer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_joined_mp3(path: str, parts: Iterable[bytes]) -> Mp3Writer:
+    """Join MP3 chunks into path (frames copied, one Xing/Info header); returns the closed writer."""
+    with Mp3Writer(path) as writer:
+        for part in parts:
+            writer.append(part)
+    return writer
+
+
+@dataclass(frozen=True)
+class Mp3Info:
+    """What read_info() found out about an MP3 file."""
+
+    duration_s: float
+    frames: int
+    bitrate_kbps: float  # average over the audio frames
+    sample_rate: int
+    channels: int
+    vbr: bool
+    source: str  # "xing", "info", "vbri", "cbr" (from the byte count) or "scan" (every frame header)
+    encoder_delay: int = 0
+    encoder_padding: int = 0
+
+
+# Encoder strings that start the LAME extension after a Xing/Info header (LAME itself, ffmpeg)
+_LAME_TAGS = (b"LAME", b"Lavf", b"Lavc", b"GOGO")
+# Leading frames compared to decide whether a stream without a VBR header is constant-bitrate
+_CBR_PROBE_FRAMES = 16
+
+
+def _first_frame(data: bytes, pos: int = 0) -> Optional[Tuple[int, FrameHeader]]:
+    """First frame header in data whose successor (if within data) is a valid header too."""
+    while pos + 4 <= len(data):
+        header = parse_frame_header(data, pos)
+        if header is not None:
+            nxt = pos + header.frame_length
+            if nxt + 4 > len(data) or parse_frame_header(data, nxt) is not None:
+                return pos, header
+        pos = data.find(b"\xff", pos + 1)
+        if pos < 0:
+            return None
+    return None
+
+
+def _lame_delay_padding(data: bytes, offset: int) -> Tuple[int, int]:
+    if data[offset:offset + 4] not in _LAME_TAGS or len(data) < offset + 24:
+        return 0, 0
+    b = data[offset + 21:offset + 24]
+    return (b[0] << 4) | (b[1] >> 4), ((b[1] & 0x0F) << 8) | b[2]
+
+
+def _info_from_tag(data: bytes, pos: int, header: FrameHeader, audio_bytes: int) -> Optional[Mp3Info]:
+    """Mp3Info from a Xing/Info or VBRI header frame at pos, or None if there is none (or no frame count)."""
+    channels = 1 if header.mono else 2
+    tag = pos + 4 + _side_info_length(header)
+    if data[tag:tag + 4] in (b"Xing", b"Info"):
+        (flags,) = struct.unpack(">I", data[tag + 4:tag + 8])
+        field = tag + 8
+        frames = total = None
+        if flags & 0x01:
+            (frames,) = struct.unpack(">I", data[field:field + 4])
+            field += 4
+        if flags & 0x02:
+            (total,) = struct.unpack(">I", data[field:field + 4])
+            field += 4
+        if flags & 0x04:
+            field += 100
+        if flags & 0x08:
+            field += 4
+        if not frames:
+            return None
+        delay, padding = _lame_delay_padding(data, field)
+        frame_time = frames * header.samples_per_frame / header.sample_rate
+        duration = max(0, frames * header.samples_per_frame - delay - padding) / header.sample_rate
+        audio_bytes = max(0, (total or audio_bytes + header.frame_length) - header.frame_length)
+        source = "xing" if data[tag:tag + 4] == b"Xing" else "info"
+        return Mp3Info(
+            duration, frames, audio_bytes * 8 / frame_time / 1000, header.sample_rate,
+            channels, source == "xing", source, delay, padding,
+        )
+    vbri = pos + 36
+    if data[vbri:vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+        _version, delay, _quality, total, frames = struct.unpack(">HHHII", data[vbri + 4:vbri + 18])
+        if not frames:
+            return None
+        duration = frames * header.samples_per_frame / header.sample_rate
+        audio_bytes = max(0, total - header.frame_length)
+        return Mp3Info(duration, frames, audio_bytes * 8 / duration / 1000, header.sample_rate, channels, True, "vbri", delay)
+    return None
+
+
+def read_info(path: str, head_bytes: int = 1 << 16) -> Optional[Mp3Info]:
+    """
+    Duration, frames and bitrate of the MP3 at path from its headers, or None if it holds no MPEG
+    audio. Only the start (and the ID3v1 tag position at the end) is read, unless the stream has
+    no VBR header and varying bitrates, in which case every frame header is walked.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = id3v2_size(f.read(10))
+        f.seek(start)
+        data = f.read(head_bytes)
+        f.seek(max(0, size - 128))
+        end = size - 128 if f.read(3) == b"TAG" and size - 128 >= start else size
+    found = _first_frame(data)
+    if found is None:
+        return None
+    pos, header = found
+    audio_bytes = end - start - pos
+    info = _info_from_tag(data, pos, header, audio_bytes)
+    if info is not None:
+        return info
+    channels = 1 if header.mono else 2
+    probe = []
+    offset = pos
+    while len(probe) < _CBR_PROBE_FRAMES:
+        h = parse_frame_header(data, offset)
+        if h is None or offset + h.frame_length > len(data):
+            break
+        probe.append(h.bitrate_kbps)
+        offset += h.frame_length
+    if len(set(probe)) == 1 and header.bitrate_kbps:
+        duration = audio_bytes * 8 / (header.bitrate_kbps * 1000)
+        frames = round(duration * header.sample_rate / header.samples_per_frame)
+        return Mp3Info(duration, frames, float(header.bitrate_kbps), header.sample_rate, channels, False, "cbr")
+    with open(path, "rb") as f:
+        whole = f.read()
+    headers = [h for _, h in iter_frames(whole)]
+    if not headers:
+        return None
+    duration = sum(h.duration_s for h in headers)
+    total = sum(h.frame_length for h in headers)
+    return Mp3Info(
+        duration, len(headers), total * 8 / duration / 1000 if duration else 0.0, header.sample_rate,
+        channels, len({h.bitrate_kbps for h in headers}) > 1, "scan",
+    )
+
+
+def read_duration(path: str) -> Optional[float]:
+    """Duration in seconds from read_info(), or None if the file is missing or not MPEG audio."""
+    try:
+        info = read_info(path)
+    except OSError:
+        return None
+    return info.duration_s if info is not None else None
@@ -0,0 +1,102 @@
+"""
+Parallel Pocket TTS chunk generation in a process pool.
+
+TTSModel.generate_audio is not thread-safe and pocket_tts pins torch to one thread, so one process
+only uses one core. The pool starts `workers` processes, each with its own model and voice state
+(the on-disk voice cache makes that cheap after the first run) and `threads_per_worker` torch threads
+so workers × threads does not oversubscribe the CPU. Chunks are handed out one at a time and come
+back in order for the crossfade join.
+"""
+
+import atexit
+import multiprocessing
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Loader: (voice_id, settings) -> (model, voice_state)
+Loader = Callable[[str, dict], tuple]
+
+_model = None
+_voice_state = None
+
+
+def _init_worker(loader: Loader, voice_id: str, settings: dict, threads: int) -> None:
+    global _model, _voice_state
+    _model, _voice_state = loader(voice_id, settings)
+    try:
+        import torch
+    except ImportError:
+        return
+    # After pocket_tts is imported: it sets one thread at import time
+    torch.set_num_threads(max(1, threads))
+
+
+def _generate(text: str):
+    from .audio import to_float32
+
+    return to_float32(_model.generate_audio(_voice_state, text))
+
+
+def _sample_rate(_=None) -> int:
+    return int(_model.sample_rate)
+
+
+def _default_loader(voice_id: str, settings: dict) -> tuple:
+    from .tts import _pocket_tts_model_and_voice
+
+    return _pocket_tts_model_and_voice(voice_id, settings)
+
+
+def resolve_workers(settings: dict) -> Tuple[int, int]:
+    """(workers, threads_per_worker) from pocket_tts settings; workers 0/1 means no pool."""
+    threads = max(1, int(settings.get("threads_per_worker") or 1))
+    workers = settings.get("parallel_workers", 0)
+    if workers == "auto":
+        workers = (os.cpu_count() or 1) // threads
+    return max(0, int(workers or 0)), threads
+
+
+class PocketPool:
+    """Worker processes with a loaded model and voice state each."""
+
+    def __init__(
+        self,
+        voice_id: str,
+        settings: Optional[dict] = None,
+        workers: int = 2,
+        threads_per_worker: int = 1,
+        loader: Loader = _default_loader,
+    ):
+        ctx = multiprocessing.get_context("spawn")  # torch does not survive fork reliably
+        self.workers = workers
+        self._pool = ctx.Pool(
+            workers, initializer=_init_worker, initargs=(loader, voice_id, settings or {}, threads_per_worker)
+        )
+        self.sample_rate = self._pool.apply(_sample_rate)
+
+    def generate(self, chunks: Sequence[str]) -> List:
+        """Audio (float32 arrays) for each chunk, in chunk order."""
+        return list(self._pool.imap(_generate, chunks, chunksize=1))
+
+    def close(self) -> None:
+        self._pool.terminate()
+        self._pool.join()
+
+
+# Pools live for the process (e.g. the warm worker), one per voice and shape
+_pools: Dict[tuple, PocketPool] = {}
+
+
+def get_pool(voice_id: str, settings: dict, workers: int, threads_per_worker: int) -> PocketPool:
+    key = (voice_id, workers, threads_per_worker, settings.get("voice_cache_dir"))
+    pool = _pools.get(key)
+    if pool is None:
+        pool = _pools[key] = PocketPool(voice_id, settings, workers, threads_per_worker)
+    return pool
+
+
+@atexit.register
+def _close_pools() -> None:
+    for pool in _pools.values():
+        pool.close()
+    _pools.clear()
@@ -0,0 +1,127 @@
+"""
+Persistent on-disk cache of Pocket TTS voice states.
+
+get_state_for_audio_prompt() encodes the voice prompt through the model, and every new process pays
+for it again although the voices never change. States are saved as safetensors files keyed by voice
+id, model version and a hash of the prompt, and loaded back through get_state_for_audio_prompt(),
+which memory-maps .safetensors files instead of encoding audio. When the model changes (package
+version, config or custom weights) the key changes; the voice's stale files are removed on the next
+store.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "audionews", "pocket_voices")
+
+
+def model_version(model) -> str:
+    """Identity of the loaded model: pocket-tts version, config origin and whether weights are custom."""
+    try:
+        from importlib.metadata import version
+
+        package = version("pocket-tts")
+    except Exception:
+        package = "unknown"
+    origin = getattr(model, "origin", None)
+    origin = Path(origin).name if origin else "default"
+    custom = bool(getattr(model, "has_custom_weights", False))
+    return f"pocket-tts {package}; config {origin}; custom_weights {custom}"
+
+
+def prompt_hash(voice_id: str) -> str:
+    """SHA-256 of the prompt file when voice_id is a local file, else of the voice name or URL."""
+    h = hashlib.sha256()
+    path = Path(os.path.expanduser(voice_id))
+    if path.is_file():
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    else:
+        h.update(voice_id.encode("utf-8"))
+    return h.hexdigest()
+
+
+def _export_state(state: Any, path: str) -> None:
+    from pocket_tts.models.model_state import export_model_state
+
+    export_model_state(state, path)
+
+
+class VoiceStateCache:
+    """Directory of <voice>-<key>.safetensors files, each with a .json note of what it was built from."""
+
+    def __init__(self, cache_dir: Optional[str] = None, export: Callable[[Any, str], None] = _export_state):
+        self.cache_dir = Path(os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR))
+        self.export = export
+
+    @staticmethod
+    def _slug(voice_id: str) -> str:
+        return re.sub(r"[^A-Za-z0-9_.-]+", "_", Path(voice_id).stem or voice_id)[:40]
+
+    def key(self, voice_id: str, version: str) -> str:
+        return hashlib.sha256(f"{voice_id}\n{version}\n{prompt_hash(voice_id)}".encode("utf-8")).hexdigest()[:20]
+
+    def path_for(self, voice_id: str, version: str) -> Path:
+        return self.cache_dir / f"{self._slug(voice_id)}-{self.key(voice_id, version)}.safetensors"
+
+    def load(self, model, voice_id: str):
+        """Cached voice state for this model, or None on a miss (or an unreadable file, which is dropped)."""
+        path = self.path_for(voice_id, model_version(model))
+        if not path.exists():
+            return None
+        try:
+            return model.get_state_for_audio_prompt(str(path))
+        except Exception:
+            self._remove(path)
+            return None
+
+    def store(self, model, voice_id: str, state) -> Path:
+        """Save a voice state and remove this voice's files for other model versions or prompts."""
+        version = model_version(model)
+        path = self.path_for(voice_id, version)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}.safetensors")
+        try:
+            self.export(state, str(tmp))
+            os.replace(tmp, path)
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+        meta = {"voice": voice_id, "model_version": version, "prompt_sha256": prompt_hash(voice_id)}
+        with open(path.with_suffix(".json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+        for stale in self.cache_dir.glob(f"{self._slug(voice_id)}-*.safetensors"):
+            if stale != path and self._voice_of(stale) == voice_id:
+                self._remove(stale)
+        return path
+
+    def get_or_create(self, model, voice_id: str):
+        """Voice state from the cache, else computed by the model and stored."""
+        state = self.load(model, voice_id)
+        if state is None:
+            state = model.get_state_for_audio_prompt(voice_id)
+            try:
+                self.store(model, voice_id, state)
+            except OSError as e:
+                print(f"   ⚠️ Could not cache Pocket voice state for {voice_id}: {e}")
+        return state
+
+    def _voice_of(self, path: Path) -> Optional[str]:
+        try:
+            with open(path.with_suffix(".json"), "r", encoding="utf-8") as f:
+                return json.load(f).get("voice")
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        for p in (path, path.with_suffix(".json")):
+            try:
+                p.unlink()
+            except OSError:
+                pass
@@ -0,0 +1,172 @@
+"""
+Warm Pocket TTS worker: a long-lived local process that keeps the model and voice states loaded and
+takes synthesis jobs over a Unix socket.
+
+Every CLI run otherwise pays TTSModel.load_model() and get_state_for_audio_prompt() again. With the
+worker running (scripts/pocket_tts_worker.py), tts.generate_audio_digest hands pocket_tts jobs to it,
+so further languages and re-runs skip the model load.
+
+Protocol: one JSON request line per connection, one JSON reply line.
+    {"op": "ping"}                                         -> {"ok": true, "voices": [...], "jobs": n}
+    {"op": "synthesize", "text", "output", "voice", "voice_config"}
+                                                           -> {"ok": true, "seconds": s, "stats"} | {"ok": false, "error"}
+    {"op": "shutdown"}                                     -> {"ok": true}
+The worker writes the MP3 to "output" itself (same machine), so no audio crosses the socket; "stats"
+is what the synthesize function returned (post-processing duration and loudness), if anything.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+SOCKET_ENV = "POCKET_TTS_SOCKET"
+
+# Synthesize function: (text, output_filename, voice_id, voice_config, language) -> stats dict or None
+Synthesize = Callable[[str, str, str, dict, Optional[str]], Optional[dict]]
+
+
+def default_socket_path(voice_config: Optional[dict] = None) -> str:
+    """POCKET_TTS_SOCKET, else tts_settings.pocket_tts.worker_socket, else a per-user path in the temp dir."""
+    path = os.getenv(SOCKET_ENV)
+    if not path and voice_config:
+        path = voice_config.get("tts_settings", {}).get("pocket_tts", {}).get("worker_socket")
+    if not path:
+        uid = os.getuid() if hasattr(os, "getuid") else 0
+        path = os.path.join(tempfile.gettempdir(), f"audionews-pocket-{uid}.sock")
+    return path
+
+
+def _request(socket_path: str, request: dict, timeout: Optional[float]) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as reply:
+            line = reply.readline()
+    if not line:
+        raise ConnectionError("Pocket TTS worker closed the connection without replying")
+    return json.loads(line.decode("utf-8"))
+
+
+def ping(socket_path: str, timeout: float = 1.0) -> Optional[dict]:
+    """Worker status, or None if no worker answers on socket_path."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    try:
+        reply = _request(socket_path, {"op": "ping"}, timeout)
+    except (OSError, ValueError):
+        return None
+    return reply if reply.get("ok") else None
+
+
+def is_running(socket_path: str) -> bool:
+    return ping(socket_path) is not None
+
+
+def synthesize(
+    socket_path: str,
+    text: str,
+    output_filename: str,
+    voice_id: str,
+    voice_config: dict,
+    timeout: Optional[float] = None,
+    language: Optional[str] = None,
+) -> dict:
+    """Have the worker synthesize text to output_filename. Raises RuntimeError if the job fails."""
+    reply = _request(
+        socket_path,
+        {
+            "op": "synthesize",
+            "text": text,
+            "output": os.path.abspath(output_filename),
+            "voice": voice_id,
+            "voice_config": voice_config,
+            "language": language,
+        },
+        timeout,
+    )
+    if not reply.get("ok"):
+        raise RuntimeError(f"Pocket TTS worker failed: {reply.get('error')}")
+    return reply
+
+
+def shutdown(socket_path: str, timeout: float = 5.0) -> None:
+    _request(socket_path, {"op": "shutdown"}, timeout)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line.decode("utf-8"))
+            reply = self.server.dispatch(request)
+        except Exception as e:  # reported to the client, worker keeps serving
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+
+class PocketWorker(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server around a synthesize function; jobs run one at a time."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, synthesize_fn: Optional[Synthesize] = None):
+        if synthesize_fn is None:
+            from .tts import _pocket_tts_generate_sync as synthesize_fn
+        if os.path.exists(socket_path):
+            if is_running(socket_path):
+                raise RuntimeError(f"A Pocket TTS worker is already running on {socket_path}")
+            os.unlink(socket_path)  # stale socket from a crashed worker
+        self.socket_path = socket_path
+        self.synthesize_fn = synthesize_fn
+        self.voices = set()
+        self.jobs = 0
+        self._job_lock = threading.Lock()
+        super().__init__(socket_path, _Handler)
+        os.chmod(socket_path, 0o600)
+
+    def preload(self, voices: Iterable[str], settings: Optional[dict] = None) -> None:
+        """Load the model and the given voice states now instead of on the first job."""
+        from .tts import _pocket_tts_model_and_voice
+
+        for voice in voices:
+            _pocket_tts_model_and_voice(voice, settings)
+            self.voices.add(voice)
+
+    def dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "voices": sorted(self.voices), "jobs": self.jobs}
+        if op == "synthesize":
+            t0 = time.perf_counter()
+            with self._job_lock:
+                stats = self.synthesize_fn(
+                    request["text"], request["output"], request["voice"], request.get("voice_config") or {},
+                    request.get("language"),
+                )
+                self.voices.add(request["voice"])
+                self.jobs += 1
+            return {"ok": True, "seconds": round(time.perf_counter() - t0, 3), "stats": stats}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except OSError:
+            pass
+
+
+def start_worker(socket_path: str, synthesize_fn: Optional[Synthesize] = None) -> PocketWorker:
+    """Start a worker in a background thread (tests, embedding); call .shutdown() and .server_close()."""
+    worker = PocketWorker(socket_path, synthesize_fn)
+    threading.Thread(target=worker.serve_forever, name="pocket-tts-worker", daemon=True).start()
+    return worker
@@ -0,0 +1,326 @@
+"""
+Single-pass post-processing of generated audio: one ffmpeg run with one filter graph (loudness
+normalization, resampling, loudness measurement) and the MP3 encode, fed from memory, a file or a stream.
+
+The stats come from the same run: loudness from loudnorm's JSON report (or an ebur128 measurement
+when loudnorm is off) and duration from ffmpeg's -progress output, so nothing decodes the result
+again to measure it.
+
+Silence compression keeps the 400–1100 ms band semantics of audio.compress_silences. ffmpeg's
+silenceremove has no upper bound (it would also shorten sentence and paragraph gaps), so the band is
+cut in NumPy on the PCM that feeds the same ffmpeg run.
+
+Settings (tts_settings.postprocess, per-call overrides on top):
+    loudnorm (false), target_lufs (-16), true_peak_db (-1.5), lra (11), sample_rate (null = keep),
+    bitrate ("192k"), measure_loudness (true)
+"""
+
+import json
+import os
+import re
+import subprocess
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import audio
+
+DEFAULTS = {
+    "loudnorm": False,
+    "target_lufs": -16.0,
+    "true_peak_db": -1.5,
+    "lra": 11.0,
+    "sample_rate": None,
+    "bitrate": "192k",
+    "measure_loudness": True,
+}
+
+# Silence band: (min_ms, max_ms, target_ms)
+SilenceBand = Tuple[int, int, int]
+
+
+@dataclass
+class PostProcessStats:
+    duration_s: float
+    sample_rate: Optional[int] = None
+    integrated_lufs: Optional[float] = None
+    true_peak_db: Optional[float] = None
+    lra: Optional[float] = None
+    input_integrated_lufs: Optional[float] = None
+    pauses_shortened: int = 0
+    filters: list = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {k: v for k, v in self.__dict__.items() if v is not None}
+
+
+def resolve_settings(voice_config: dict, **overrides) -> dict:
+    """DEFAULTS < tts_settings.postprocess < overrides (None values are ignored)."""
+    settings = dict(DEFAULTS)
+    settings.update(voice_config.get("tts_settings", {}).get("postprocess", {}) or {})
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+    return settings
+
+
+def needs_reencode(settings: dict) -> bool:
+    """Whether the chain changes the audio (as opposed to only measuring it)."""
+    return bool(settings.get("loudnorm") or settings.get("sample_rate"))
+
+
+def filter_graph(settings: dict) -> list:
+    """Filters for -af, in order: loudnorm, aresample, ebur128 (measurement only)."""
+    filters = []
+    if settings.get("loudnorm"):
+        filters.append(
+            f"loudnorm=I={settings['target_lufs']}:TP={settings['true_peak_db']}:LRA={settings['lra']}"
+            ":print_format=json"
+        )
+    if settings.get("sample_rate"):
+        filters.append(f"aresample={int(settings['sample_rate'])}")
+    elif settings.get("loudnorm"):
+        # loudnorm works at 192 kHz internally; bring it back to the input rate
+        filters.append("aresample={input_rate}")
+    if settings.get("measure_loudness", True) and not settings.get("loudnorm"):
+        filters.append("ebur128=peak=true:framelog=quiet")
+    return filters
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_stats(stderr: str, progress: str, stats: PostProcessStats) -> None:
+    times = re.findall(r"^out_time_us=(\d+)", progress, re.M)
+    if times:
+        stats.duration_s = int(times[-1]) / 1e6
+    start = stderr.rfind("[Parsed_loudnorm")
+    if start >= 0:
+        brace = stderr.find("{", start)
+        end = stderr.find("}", brace)
+        if brace >= 0 and end > brace:
+            report = json.loads(stderr[brace:end + 1])
+            stats.integrated_lufs = _float(report.get("output_i"))
+            stats.true_peak_db = _float(report.get("output_tp"))
+            stats.lra = _float(report.get("output_lra"))
+            stats.input_integrated_lufs = _float(report.get("input_i"))
+        return
+    summary = stderr[stderr.rfind("Summary:"):] if "Summary:" in stderr else ""
+    for attr, pattern in (
+        ("integrated_lufs", r"I:\s+(-?[\d.]+) LUFS"),
+        ("lra", r"LRA:\s+(-?[\d.]+) LU"),
+        ("true_peak_db", r"Peak:\s+(-?[\d.]+|-inf) dBFS"),
+    ):
+        m = re.search(pattern, summary)
+        if m:
+            setattr(stats, attr, _float(m.group(1)))
+
+
+def _command(input_args: Sequence[str], settings: dict, input_rate: Optional[int], tmp: str) -> Tuple[list, list]:
+    """(ffmpeg argv, filters) for one post-processing run writing to tmp."""
+    filters = [f.replace("{input_rate}", str(input_rate or 44100)) for f in filter_graph(settings)]
+    cmd = [
+        audio.ffmpeg_path(), "-hide_banner", "-nostats", "-y",
+        *input_args,
+        *(["-af", ",".join(filters)] if filters else []),
+        "-codec:a", "libmp3lame", "-b:a", settings.get("bitrate") or "192k",
+        "-progress", "pipe:1", tmp,
+    ]
+    return cmd, filters
+
+
+def _finish(
+    returncode: int,
+    stdout: bytes,
+    stderr_bytes: bytes,
+    tmp: str,
+    output_filename: str,
+    settings: dict,
+    input_rate: Optional[int],
+    filters: list,
+    stats: PostProcessStats,
+) -> PostProcessStats:
+    stderr = stderr_bytes.decode("utf-8", "replace")
+    if returncode != 0:
+        tail = "\n".join(stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"ffmpeg post-processing failed: {tail}")
+    os.replace(tmp, output_filename)
+    stats.filters = filters
+    stats.sample_rate = int(settings["sample_rate"]) if settings.get("sample_rate") else input_rate
+    _parse_stats(stderr, stdout.decode("utf-8", "replace"), stats)
+    return stats
+
+
+def _tmp_path(output_filename: str) -> str:
+    # Writing over the input (in-place post-processing of a file) goes through a temp file
+    return f"{output_filename}.tmp{os.getpid()}.mp3"
+
+
+def _run(
+    input_args: Sequence[str],
+    input_data: Optional[bytes],
+    output_filename: str,
+    settings: dict,
+    input_rate: Optional[int],
+    stats: PostProcessStats,
+) -> PostProcessStats:
+    tmp = _tmp_path(output_filename)
+    cmd, filters = _command(input_args, settings, input_rate, tmp)
+    try:
+        result = subprocess.run(cmd, input=input_data, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return _finish(
+            result.returncode, result.stdout, result.stderr, tmp, output_filename, settings, input_rate, filters, stats
+        )
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def process_samples(
+    samples: np.ndarray,
+    sample_rate: int,
+    output_filename: str,
+    settings: dict,
+    silence: Optional[SilenceBand] = None,
+) -> PostProcessStats:
+    """Mono float32 samples -> (silence band) -> filter graph -> MP3, in one ffmpeg run."""
+    stats = PostProcessStats(duration_s=len(samples) / sample_rate if sample_rate else 0.0)
+    if silence is not None:
+        min_ms, max_ms, target_ms = silence
+        level = audio.dbfs(samples)
+        thresh = level - 35 if np.isfinite(level) else -35
+        found = audio.detect_silence(samples, sample_rate, min_silence_len=60, silence_thresh=thresh, seek_step=10)
+        stats.pauses_shortened = sum(1 for a, b in found if min_ms <= b - a <= max_ms)
+        samples = audio.compress_silences(samples, sample_rate, found, min_ms, max_ms, target_ms)
+        stats.duration_s = len(samples) / sample_rate
+    data = np.ascontiguousarray(samples, dtype="<f4").tobytes()
+    input_args = ["-f", "f32le", "-ar", str(sample_rate), "-ac", "1", "-i", "pipe:0"]
+    return _run(input_args, data, output_filename, settings, sample_rate, stats)
+
+
+def process_file(
+    input_filename: str,
+    output_filename: str,
+    settings: dict,
+    silence: Optional[SilenceBand] = None,
+) -> PostProcessStats:
+    """
+    Post-process an audio file (output may be the input). Without a silence band ffmpeg reads the
+    file directly; with one, it is decoded once to PCM for the band and then streamed into the run.
+    """
+    if silence is not None:
+        samples, sample_rate = audio.decode_audio(input_filename)
+        return process_samples(samples, sample_rate, output_filename, settings, silence)
+    input_rate = None
+    with open(input_filename, "rb") as f:
+        head = f.read(1 << 16)
+    from . import mp3
+
+    first = next(mp3.iter_frames(head), None)
+    if first:
+        input_rate = first[1].sample_rate
+    return _run(["-i", input_filename], None, output_filename, settings, input_rate, PostProcessStats(0.0))
+
+
+def process_encoded(
+    data: bytes,
+    output_filename: str,
+    settings: dict,
+    input_format: str = "wav",
+    input_rate: Optional[int] = None,
+) -> PostProcessStats:
+    """Encoded audio in memory (e.g. a WAV response body) -> filter graph -> MP3, through stdin."""
+    if input_rate is None and input_format == "wav":
+        input_rate = wav_sample_rate(data)
+    return _run(["-f", input_format, "-i", "pipe:0"], data, output_filename, settings, input_rate, PostProcessStats(0.0))
+
+
+# How far into a streamed WAV to look for its fmt chunk (metadata chunks may come first)
+WAV_HEADER_MAX_BYTES = 64 << 10
+
+
+def wav_sample_rate(header: bytes) -> Optional[int]:
+    """
+    Sample rate from the start of a RIFF/WAVE body: the fmt chunk, found by walking past any chunks
+    before it (LIST, JUNK, ...). None when header is not a WAV or ends before the rate.
+    """
+    if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        return None
+    pos = 12
+    while pos + 8 <= len(header):
+        size = int.from_bytes(header[pos + 4:pos + 8], "little")
+        if header[pos:pos + 4] == b"fmt ":
+            return int.from_bytes(header[pos + 12:pos + 16], "little") if pos + 16 <= len(header) else None
+        pos += 8 + size + (size & 1)  # chunks are padded to an even length
+    return None
+
+
+async def process_stream(
+    chunks: AsyncIterator[bytes],
+    output_filename: str,
+    settings: dict,
+    input_format: str = "wav",
+    input_rate: Optional[int] = None,
+    channels: int = 1,
+) -> PostProcessStats:
+    """
+    Audio arriving in chunks (e.g. an HTTP response body) -> filter graph -> MP3. Each chunk is
+    written to ffmpeg's stdin as it arrives, so encoding overlaps the download and only one chunk
+    is held in memory at a time. Raw PCM formats (e.g. "s16le") need input_rate and channels.
+    """
+    import asyncio
+
+    iterator = chunks.__aiter__()
+    # The WAV header comes first; its sample rate is needed before ffmpeg starts (loudnorm's resample)
+    head = b""
+    while len(head) < 44 or (
+        input_format == "wav" and wav_sample_rate(head) is None and len(head) < WAV_HEADER_MAX_BYTES
+    ):
+        try:
+            head += await iterator.__anext__()
+        except StopAsyncIteration:
+            break
+    input_args = ["-f", input_format]
+    if input_format == "wav":
+        input_rate = wav_sample_rate(head)
+    else:
+        input_args += ["-ar", str(input_rate), "-ac", str(channels)]
+    tmp = _tmp_path(output_filename)
+    cmd, filters = _command([*input_args, "-i", "pipe:0"], settings, input_rate, tmp)
+    proc = await asyncio.create_subprocess_exec(
+        *cmd, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+
+    async def write(data: bytes) -> bool:
+        try:
+            proc.stdin.write(data)
+            await proc.stdin.drain()  # backpressure: wait for ffmpeg before reading more
+            return True
+        except (BrokenPipeError, ConnectionResetError):
+            return False  # ffmpeg exited early; its return code and stderr say why
+
+    async def feed() -> None:
+        try:
+            if await write(head):
+                async for chunk in iterator:
+                    if not await write(chunk):
+                        break
+        finally:
+            if not proc.stdin.is_closing():
+                proc.stdin.close()
+
+    try:
+        _, stdout, stderr = await asyncio.gather(feed(), proc.stdout.read(), proc.stderr.read())
+        await proc.wait()
+        return _finish(proc.returncode, stdout, stderr, tmp, output_filename, settings, input_rate, filters, PostProcessStats(0.0))
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+        raise
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
@@ -0,0 +1,146 @@
+"""
+On-disk cache of synthesized TTS segments, so unchanged text is never synthesized twice.
+
+The greeting, the intro template and the closing sentences come back every day, and editing one
+sentence of a transcript used to mean re-rendering all of it with --use-existing-transcript. With
+tts_settings.segment_cache enabled, providers synthesize the digest one segment at a time (a sentence,
+or a section for chunked DynamicDevices); each segment's audio is stored under a key made of provider,
+voice, the settings that change the audio and a hash of the text, and an episode is assembled from
+cached and newly synthesized segments.
+
+Entries are plain files in one directory. A hit refreshes the file's mtime; when the directory grows
+past max_mb the least recently used entries are removed.
+
+Settings (tts_settings.segment_cache):
+    enabled (false), dir (null = ~/.cache/audionews/tts_segments), max_mb (500)
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "audionews", "tts_segments")
+DEFAULT_MAX_MB = 500
+
+# Bump when the stored audio for the same inputs would differ (e.g. a change in how segments are cut)
+KEY_VERSION = 2
+
+# Segments are sentences: split at spaces after . ! or ? (Edge text keeps words in a sentence together
+# with non-breaking spaces, so this only ever cuts between sentences)
+_SEGMENT_SPLIT_RE = re.compile(r"(?<=[.!?]) +")
+
+
+def split_segments(text: str) -> List[str]:
+    """Sentences of provider text, in order; " ".join() gives the text back up to whitespace."""
+    return [s for s in _SEGMENT_SPLIT_RE.split(text.strip()) if s]
+
+
+def segment_key(provider: str, voice: str, settings: Dict, text: str) -> str:
+    """Cache key: SHA-256 over provider, voice, audio-affecting settings and the segment text."""
+    identity = json.dumps(
+        {"v": KEY_VERSION, "provider": provider, "voice": voice, "settings": settings},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    h = hashlib.sha256(identity.encode("utf-8"))
+    h.update(b"\0")
+    h.update(text.encode("utf-8"))
+    return h.hexdigest()
+
+
+class SegmentCache:
+    """Directory of <key>.<ext> audio files with least-recently-used eviction by total size."""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_MB << 20):
+        self.cache_dir = Path(os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None
+
+    def path_for(self, key: str, ext: str) -> Path:
+        return self.cache_dir / f"{key}.{ext}"
+
+    def get(self, key: str, ext: str) -> Optional[bytes]:
+        """Cached audio for key, or None. A hit marks the entry as recently used."""
+        path = self.path_for(key, ext)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key: str, ext: str, data: bytes) -> None:
+        """Store audio for key (atomically), then evict old entries if over max_bytes."""
+        path = self.path_for(key, ext)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.tmp{os.getpid()}")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"   ⚠️ Could not cache TTS segment: {e}")
+            return
+        if self._size is None:
+            self._size = self._total_size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in max_bytes; returns how many."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if ".tmp" in entry.name:
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self._size = total
+        return removed
+
+    def _total_size(self) -> int:
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            try:
+                total += entry.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def summary(self) -> str:
+        return f"{self.hits} cached, {self.misses} new"
+
+
+def from_config(voice_config: dict) -> Optional[SegmentCache]:
+    """SegmentCache from tts_settings.segment_cache, or None when it is not enabled."""
+    settings = voice_config.get("tts_settings", {}).get("segment_cache", {}) or {}
+    if not settings.get("enabled", False):
+        return None
+    max_mb = settings.get("max_mb", DEFAULT_MAX_MB)
+    return SegmentCache(settings.get("dir"), max_bytes=int(float(max_mb) * (1 << 20)))
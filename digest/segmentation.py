@@ -0,0 +1,356 @@
+"""
+Sentence segmentation, long-sentence breaking and chunking of TTS text into requests.
+
+Long sentences are hard to voice (Edge TTS rushes them, listeners lose the thread), so sentences over
+a word limit are broken into pieces at clause punctuation. One engine handles every language; what
+differs is the BreakPolicy. Each sentence is scanned once and word counts are kept incrementally, so
+breaking is linear in the length of the text.
+"""
+
+import bisect
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class BreakPolicy:
+    """How sentences longer than max_words are broken into pieces."""
+
+    max_words: int = 100
+    # Word budget for one piece.
+    chunk_words: int = 80
+    # Punctuation (followed by whitespace) that divides a long sentence into clauses.
+    clause_marks: str = ";"
+    # True: a clause mark always closes the current piece. False: it stays inside the piece.
+    close_at_clause_marks: bool = True
+    # True: a clause that overflows the budget is split at every comma mark.
+    # False: it starts a new piece.
+    split_oversized: bool = True
+    comma_marks: str = ",;"
+    # Trailing characters dropped from a piece before its closing comma.
+    trim: str = ""
+    # Characters that end a sentence when followed by whitespace.
+    terminators: str = ".!?"
+
+
+# All languages: only very long sentences (over 100 words), broken at semicolons, then commas.
+GENERIC_POLICY = BreakPolicy()
+
+# BellaNews: short pieces (about 25 words) packed greedily between commas and semicolons.
+BELLA_POLICY = BreakPolicy(
+    max_words=40,
+    chunk_words=25,
+    clause_marks=",;",
+    close_at_clause_marks=False,
+    split_oversized=False,
+    trim=";,. ",
+)
+
+BREAK_POLICIES: Dict[str, BreakPolicy] = {
+    "bella": BELLA_POLICY,
+}
+
+
+def get_break_policy(language: str) -> BreakPolicy:
+    """Break policy for a language (GENERIC_POLICY unless the language has its own)."""
+    return BREAK_POLICIES.get(language, GENERIC_POLICY)
+
+
+def _is_mark(text: str, marks: str) -> bool:
+    return len(text) == 1 and text in marks
+
+
+class SentenceBreaker:
+    """Linear-time sentence breaker for one BreakPolicy (see get_breaker)."""
+
+    def __init__(self, policy: BreakPolicy):
+        self.policy = policy
+        self._sentence_re = re.compile(r"[%s]+\s+" % re.escape(policy.terminators))
+        self._clause_re = re.compile(r"([%s])\s+" % re.escape(policy.clause_marks))
+        self._comma_re = re.compile(r"([%s])\s+" % re.escape(policy.comma_marks))
+
+    def break_text(self, text: str) -> str:
+        """
+        Break long sentences. Sentences and their delimiters are re-joined with single spaces
+        (so "end. Next" becomes "end . Next"); later cleanup collapses the spacing.
+        """
+        out: List[str] = []
+        pos = 0
+        for m in self._sentence_re.finditer(text):
+            self._sentence(text[pos:m.start()], out)
+            out.append(m.group())
+            pos = m.end()
+        self._sentence(text[pos:], out)
+        return " ".join(out)
+
+    __call__ = break_text
+
+    def _sentence(self, sentence: str, out: List[str]) -> None:
+        if len(sentence.split()) <= self.policy.max_words:
+            out.append(sentence)
+            return
+        _Pieces(self, out).run(sentence)
+
+    def _split_at_commas(self, clause: str, out: List[str]) -> None:
+        """Every comma-separated part of clause becomes its own piece, keeping its comma."""
+        marks = self.policy.comma_marks
+        pos = 0
+        for m in self._comma_re.finditer(clause):
+            part = clause[pos:m.start()]
+            if not _is_mark(part, marks):
+                part = part.strip()
+                if part:
+                    out.append(part + m.group(1))
+            pos = m.end()
+        part = clause[pos:]
+        if not _is_mark(part, marks):
+            part = part.strip()
+            if part:
+                out.append(part)
+
+
+class _Pieces:
+    """Accumulates clauses of one long sentence into pieces, counting words as it goes."""
+
+    __slots__ = ("breaker", "policy", "out", "items", "words")
+
+    def __init__(self, breaker: SentenceBreaker, out: List[str]):
+        self.breaker = breaker
+        self.policy = breaker.policy
+        self.out = out
+        self.items: List[str] = []
+        self.words = 0
+
+    def run(self, sentence: str) -> None:
+        pos = 0
+        for m in self.breaker._clause_re.finditer(sentence):
+            self.clause(sentence[pos:m.start()])
+            self.mark(m.group(1))
+            pos = m.end()
+        self.clause(sentence[pos:])
+        self.flush("")
+
+    def flush(self, mark: str) -> None:
+        piece = " ".join(self.items).strip().rstrip(self.policy.trim)
+        if piece:
+            self.out.append(piece + mark)
+        self.items = []
+        self.words = 0
+
+    def mark(self, mark: str) -> None:
+        if self.policy.close_at_clause_marks:
+            self.flush(mark)
+        else:
+            self.items.append(mark)
+            self.words += 1
+
+    def clause(self, clause: str) -> None:
+        policy = self.policy
+        if _is_mark(clause, policy.clause_marks):
+            self.mark(clause)
+            return
+        n = len(clause.split())
+        if self.words + n > policy.chunk_words and (policy.split_oversized or self.words):
+            self.flush(",")
+            if policy.split_oversized:
+                self.breaker._split_at_commas(clause, self.out)
+                return
+        self.items.append(clause)
+        self.words += n
+
+
+@lru_cache(maxsize=None)
+def get_breaker(policy: BreakPolicy) -> SentenceBreaker:
+    """Compiled breaker for a policy (built on first use, then shared)."""
+    return SentenceBreaker(policy)
+
+
+def break_long_sentences(text: str, policy: BreakPolicy = GENERIC_POLICY) -> str:
+    """Break sentences longer than policy.max_words into pieces at clause punctuation."""
+    return get_breaker(policy).break_text(text)
+
+
+# --- Chunking text into TTS requests ---
+#
+# Every provider's text goes through one engine. Candidate cut points (the whitespace between two
+# words) are found in one pass and graded: sentence end (or line break), clause mark, comma, plain
+# word gap. The chunk count is the minimum any cut sequence allows under max_chars; the cuts are then
+# placed so chunks come out about equally long, preferring the strongest boundary near each target.
+# Chunks are index ranges into the text until the end, so nothing re-slices the remainder.
+
+# Boundary strengths (a cut forced inside an over-long word is HARD)
+HARD, WORD, COMMA, CLAUSE, SENTENCE = 0, 1, 2, 3, 4
+
+
+@dataclass(frozen=True)
+class ChunkRules:
+    """Where one language's text may be cut between TTS requests."""
+
+    terminators: str = ".!?…"
+    # Closing quotes/brackets allowed between a terminator or mark and the space after it.
+    closers: str = "\"')]»«“”’"
+    clause_marks: str = ";:–—"
+    comma_marks: str = ","
+    # Lower-case words (without their dot) after which a full stop does not end the sentence.
+    abbreviations: FrozenSet[str] = frozenset()
+
+
+CHUNK_RULES: Dict[str, ChunkRules] = {
+    "en": ChunkRules(abbreviations=frozenset(
+        "mr mrs ms dr prof st mt no vs etc e.g i.e approx dept est govt inc ltd corp jan feb mar apr jun jul aug sep sept oct nov dec".split()
+    )),
+    "fr": ChunkRules(abbreviations=frozenset("m mm mme mlle dr pr st ste no n° etc p.ex cf av apr env".split())),
+    "de": ChunkRules(
+        closers="\"')]»«“”’‘",
+        abbreviations=frozenset("dr prof nr st bzw ca d.h z.b u.a usw vgl evtl ggf inkl jh mio mrd".split()),
+    ),
+    "es": ChunkRules(abbreviations=frozenset("sr sra srta dr dra ud uds etc pág núm art aprox".split())),
+    "it": ChunkRules(abbreviations=frozenset("sig sigg dott prof ing avv on n ecc pag art".split())),
+    "nl": ChunkRules(abbreviations=frozenset("dhr mevr dr prof bijv nr ca enz o.a d.w.z m.b.t".split())),
+    "pl": ChunkRules(abbreviations=frozenset("dr prof np tzw m.in ok ul nr godz mln mld tys itd itp".split())),
+}
+
+DEFAULT_CHUNK_RULES = CHUNK_RULES["en"]
+
+
+def get_chunk_rules(language: Optional[str]) -> ChunkRules:
+    """Chunk rules for a language code such as "fr_FR" (English rules for anything unknown)."""
+    return CHUNK_RULES.get((language or "").split("_")[0].lower(), DEFAULT_CHUNK_RULES)
+
+
+class TextChunker:
+    """Index-based chunker for one ChunkRules (see get_chunker)."""
+
+    # Only ASCII whitespace separates words: Edge text glues words with no-break spaces on purpose
+    _gap_re = re.compile(r"[ \t\r\n]+")
+
+    def __init__(self, rules: ChunkRules):
+        self.rules = rules
+
+    def boundaries(self, text: str) -> List[Tuple[int, int, int]]:
+        """(end of the text before, start of the text after, strength) for every word gap, in order."""
+        rules = self.rules
+        cuts = []
+        word_start = 0
+        for m in self._gap_re.finditer(text):
+            end, start = m.start(), m.end()
+            if end == 0 or start == len(text):
+                word_start = start
+                continue
+            i = end - 1
+            while i > word_start and text[i] in rules.closers:
+                i -= 1
+            ch = text[i]
+            if "\n" in m.group():
+                strength = SENTENCE
+            elif ch in rules.terminators:
+                strength = SENTENCE
+                if ch == "." and self._abbreviation(text[word_start:i]):
+                    strength = WORD
+            elif ch in rules.clause_marks:
+                strength = CLAUSE
+            elif ch in rules.comma_marks:
+                strength = COMMA
+            else:
+                strength = WORD
+            cuts.append((end, start, strength))
+            word_start = start
+        return cuts
+
+    def _abbreviation(self, word: str) -> bool:
+        word = word.lower()
+        # Initials ("J. Smith") and listed abbreviations ("Dr. Jones", "z.B. heute")
+        return (len(word) == 1 and word.isalpha()) or word in self.rules.abbreviations
+
+    def chunk(
+        self,
+        text: str,
+        max_chars: int,
+        *,
+        min_boundary: int = WORD,
+        split_long: bool = True,
+        tolerance: float = 0.25,
+    ) -> List[str]:
+        """
+        Cut text into the fewest chunks of at most max_chars characters, about equally long, at
+        boundaries of at least min_boundary strength. A stretch without such a boundary that is
+        longer than max_chars is cut mid-word when split_long, else it becomes one longer chunk.
+        Each cut goes to the strongest boundary within tolerance × chunk length of its balanced
+        position (the nearest boundary when there is none).
+        """
+        first = len(text) - len(text.lstrip())
+        stop = len(text.rstrip())
+        if first >= stop:
+            return []
+        limit = max(1, int(max_chars))
+        if stop - first <= limit:
+            return [text[first:stop]]
+        kept = [(first, first, SENTENCE)]
+        for cut in self.boundaries(text):
+            if cut[2] >= min_boundary:
+                self._add(kept, cut, limit, split_long)
+        self._add(kept, (stop, stop, SENTENCE), limit, split_long)
+        ends = [c[0] for c in kept]
+        starts = [c[1] for c in kept]
+        last = len(kept) - 1
+
+        # Earliest cut from which the rest fits in j chunks, for j = 1, 2, ... (fewest chunks overall)
+        earliest = [last]
+        while earliest[-1] != 0:
+            b = earliest[-1]
+            earliest.append(min(bisect.bisect_left(starts, ends[b] - limit, 0, b), b - 1))
+        earliest.reverse()
+        count = len(earliest) - 1
+
+        chosen = [0]
+        for j in range(1, count):
+            a = chosen[-1]
+            lo = max(earliest[j], a + 1)
+            hi = max(bisect.bisect_right(ends, starts[a] + limit, a + 1, last) - 1, lo)
+            size = (stop - starts[a]) / (count - j + 1)
+            target = starts[a] + size
+            band = tolerance * size
+            best = None
+            best_key = None
+            for c in range(lo, hi + 1):
+                off = abs(ends[c] - target)
+                key = (0, -kept[c][2], off) if off <= band else (1, off, -kept[c][2])
+                if best_key is None or key < best_key:
+                    best, best_key = c, key
+            chosen.append(best)
+        chosen.append(last)
+        return [text[starts[a]:ends[b]] for a, b in zip(chosen, chosen[1:])]
+
+    @staticmethod
+    def _add(kept: list, cut: Tuple[int, int, int], limit: int, split_long: bool) -> None:
+        """Append cut, first forcing evenly spaced HARD cuts into a gap from the previous cut longer than limit."""
+        start = kept[-1][1]
+        gap = cut[0] - start
+        if split_long and gap > limit:
+            pieces = -(-gap // limit)
+            for i in range(1, pieces):
+                pos = start + gap * i // pieces
+                kept.append((pos, pos, HARD))
+        kept.append(cut)
+
+
+@lru_cache(maxsize=None)
+def get_chunker(rules: ChunkRules) -> TextChunker:
+    """Chunker for a set of rules (built on first use, then shared)."""
+    return TextChunker(rules)
+
+
+def chunk_text(
+    text: str,
+    max_chars: int,
+    language: Optional[str] = None,
+    *,
+    min_boundary: int = WORD,
+    split_long: bool = True,
+) -> List[str]:
+    """Fewest balanced chunks of at most max_chars, cut at the language's boundaries (see TextChunker.chunk)."""
+    return get_chunker(get_chunk_rules(language)).chunk(
+        text, max_chars, min_boundary=min_boundary, split_long=split_long
+    )
@@ -1,24 +1,24 @@
 """
-TTS: Edge TTS, Pocket TTS, ElevenLabs. Helpers for transcript parsing and silence compression.
+TTS: Edge TTS, Pocket TTS, ElevenLabs and DynamicDevices, each registered as a provider with its
+capabilities (digest/tts_providers.py). Helpers for transcript parsing and silence compression.
 """
 
 import asyncio
+import contextlib
+import dataclasses
 import os
 import re
-import tempfile
+import socket
 import threading
-from typing import List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 
+import aiohttp  # installed with edge_tts; also used for ElevenLabs and DD TTS
 import edge_tts
 
-# Optional: ElevenLabs uses aiohttp
-try:
-    import aiohttp
-except ImportError:
-    aiohttp = None
+from . import instrumentation, segmentation, tts_providers
 
 # Lazy imports for heavy deps
-_pydub = None
 _pocket_tts_cache = None
 _pocket_tts_lock = None
 
@@ -38,7 +38,10 @@ def parse_existing_transcript(path: str) -> str:
 
 
 def reverse_edge_tts_edits(text: str) -> str:
-    """Undo Edge TTS edits (non-breaking spaces, spaced acronyms) for Pocket/ElevenLabs."""
+    """
+    Undo Edge TTS edits (non-breaking spaces, spaced acronyms) for Pocket/ElevenLabs/DD.
+    Only needed for transcripts saved without a digest document (see digest.document).
+    """
     text = text.replace("\u00A0", " ")
     unabbrev = [
         (r"N\s+A\s+T\s+O\b", "NATO"),
@@ -57,74 +60,172 @@ def reverse_edge_tts_edits(text: str) -> str:
     return text
 
 
-def _compress_short_silences(
-    mp3_path: str,
-    min_ms: int = 400,
-    max_ms: int = 1100,
-    target_ms: int = 90,
-) -> None:
-    """Shorten mid-sentence pauses in 400–1100 ms range to target_ms."""
-    global _pydub
-    if _pydub is None:
+# Edge TTS sends each piece of text in its own SSML request; edge_tts caps pieces at 4096 bytes.
+EDGE_SSML_MAX_BYTES = 4096
+
+
+# The pause closing an SSML fragment (see DigestDocument.ssml_fragments)
+_SSML_BREAK_RE = re.compile(rb"<break [^>]*/>$")
+
+
+def _edge_ssml_texts(fragments: List[str], max_bytes: int = EDGE_SSML_MAX_BYTES) -> List[bytes]:
+    """
+    Pack SSML fragments (DigestDocument.ssml_fragments) into request bodies of at most max_bytes,
+    splitting only between fragments so no sentence or <break/> tag is cut. A single fragment
+    over the limit has its sentence split at spaces by edge_tts itself; its break tag stays whole at
+    the end of the last piece.
+    """
+    from edge_tts.communicate import remove_incompatible_characters, split_text_by_byte_length
+
+    texts: List[bytes] = []
+    current = b""
+    for fragment in fragments:
+        data = remove_incompatible_characters(fragment).encode("utf-8")
+        if current and len(current) + 1 + len(data) <= max_bytes:
+            current += b" " + data
+            continue
+        if current:
+            texts.append(current)
+        if len(data) > max_bytes:
+            match = _SSML_BREAK_RE.search(data)
+            tag = match.group() if match else b""
+            pieces = list(split_text_by_byte_length(data[: len(data) - len(tag)], max_bytes - len(tag)))
+            texts.extend(pieces[:-1])
+            current = pieces[-1] + tag
+        else:
+            current = data
+    if current:
+        texts.append(current)
+    return texts
+
+
+# Process-wide DNS answers for Edge TTS: (host, port, family) -> (expires at, aiohttp resolve results)
+_dns_cache: Dict[tuple, tuple] = {}
+
+
+class _CachedResolver(aiohttp.abc.AbstractResolver):
+    """aiohttp's threaded resolver with answers kept for ttl_s seconds across connectors and runs."""
+
+    def __init__(self, ttl_s: float = 300):
+        self.ttl_s = ttl_s
+        self._resolver = aiohttp.ThreadedResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET):
+        key = (host, port, family)
+        now = time.monotonic()
+        cached = _dns_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        results = await self._resolver.resolve(host, port, family)
+        _dns_cache[key] = (now + self.ttl_s, results)
+        return results
+
+    async def close(self) -> None:
+        await self._resolver.close()
+
+
+class _EdgeConnector(aiohttp.TCPConnector):
+    """
+    Connector shared by the Edge TTS requests of one synthesis. edge_tts opens a ClientSession per
+    text piece (and again after a 403) and each session closes its connector on exit, so closing
+    is deferred to aclose().
+    """
+
+    def close(self, *, abort_ssl: bool = False):
+        return _done()
+
+    async def aclose(self) -> None:
+        await super().close()
+
+
+async def _done() -> None:
+    return None
+
+
+@contextlib.asynccontextmanager
+async def _edge_connector(tts_settings: dict):
+    """
+    Connector for Edge TTS requests: IPv4 only with force_ipv4 (GitHub Actions has no IPv6 route)
+    and cached DNS. Scoped to this synthesis, so concurrent chunks, languages or other aiohttp
+    sessions in the process are unaffected.
+    """
+    family = socket.AF_INET if tts_settings.get("force_ipv4", True) else socket.AF_UNSPEC
+    resolver = _CachedResolver(tts_settings.get("dns_cache_ttl_s", 300))
+    connector = _EdgeConnector(family=family, resolver=resolver)
+    try:
+        yield connector
+    finally:
+        await connector.aclose()
+
+
+def _edge_communicate(
+    text: str,
+    voice_name: str,
+    tts_settings: dict,
+    ssml_texts: Optional[List[bytes]] = None,
+    connector=None,
+):
+    rate = tts_settings.get("rate", "+0%") or "+0%"
+    communicate = edge_tts.Communicate(text, voice_name, rate=rate, connector=connector)
+    if ssml_texts is not None:
+        # No public SSML API: replace the escaped text pieces Communicate would send
+        communicate.texts = iter(ssml_texts)
+    return communicate
+
+
+async def _edge_with_retries(synthesize, tts_settings: dict, call, label: str = "Edge TTS") -> None:
+    """
+    Run synthesize() (one Edge TTS request) with the configured retry policy: network and auth
+    errors are retried with exponential backoff, anything else fails at once.
+    """
+    max_retries = tts_settings["max_retries"]
+    current_delay = tts_settings["initial_retry_delay"]
+    retry_backoff = tts_settings["retry_backoff_multiplier"]
+    for attempt in range(max_retries):
+        call.retries = attempt
         try:
-            from pydub import AudioSegment
-            from pydub.silence import detect_silence
-        except ImportError:
+            if attempt > 0:
+                print(f"   🔄 {label} retry attempt {attempt + 1}/{max_retries}")
+            await synthesize()
             return
-        _pydub = (AudioSegment, detect_silence)
-    AudioSegment, detect_silence = _pydub
-    audio = AudioSegment.from_mp3(mp3_path)
-    thresh = (audio.dBFS - 35) if audio.dBFS else -35
-    silences = detect_silence(audio, min_silence_len=60, silence_thresh=thresh, seek_step=10)
-    out = AudioSegment.empty()
-    last_end = 0
-    for start_ms, end_ms in silences:
-        duration = end_ms - start_ms
-        out += audio[last_end:start_ms]
-        if min_ms <= duration <= max_ms:
-            out += AudioSegment.silent(duration=target_ms)
-        else:
-            out += audio[start_ms:end_ms]
-        last_end = end_ms
-    out += audio[last_end:]
-    out.export(mp3_path, format="mp3", bitrate="192k")
+        except Exception as e:
+            err = str(e)
+            print(f"   ⚠️ {label} attempt {attempt + 1} failed: {err}")
+            is_net = "Network is unreachable" in err or "Cannot connect" in err or "Connection refused" in err or "Temporary failure" in err
+            is_auth = "401" in err or "authentication" in err.lower() or "handshake" in err.lower()
+            if (is_net or is_auth) and attempt < max_retries - 1:
+                print(f"   ⏳ Waiting {current_delay}s...")
+                await asyncio.sleep(current_delay)
+                current_delay = min(current_delay * retry_backoff, 30)
+                continue
+            if attempt == max_retries - 1:
+                raise RuntimeError(f"{label} failed after {max_retries} attempts: {err}") from e
+            raise RuntimeError(f"{label} failed: {err}") from e
 
 
-def _pocket_tts_chunk_text(text: str, max_chars: int = 120) -> List[str]:
-    """Split text for Pocket TTS streaming limit."""
-    text = text.strip()
-    if not text:
-        return []
-    if len(text) <= max_chars:
-        return [text]
-    chunks = []
-    while text:
-        if len(text) <= max_chars:
-            chunks.append(text.strip())
-            break
-        break_at = max_chars
-        for sep in (". ", "; ", ", ", " "):
-            idx = text.rfind(sep, 0, max_chars + 1)
-            if idx > 0:
-                break_at = idx + len(sep)
-                break
-        chunks.append(text[:break_at].strip())
-        text = text[break_at:].lstrip()
-    return [c for c in chunks if c]
+def _edge_text_chunks(text: str, max_chars: int = 1500, language: Optional[str] = None) -> List[str]:
+    """
+    Whole sentences in balanced chunks of at most about max_chars (a longer sentence is its own chunk).
+    Words inside an Edge TTS sentence are joined by non-breaking spaces, so only sentence gaps split.
+    """
+    return segmentation.chunk_text(
+        text, max_chars, language, min_boundary=segmentation.SENTENCE, split_long=False
+    )
 
 
-def _pocket_tts_generate_sync(
-    digest_text: str,
-    output_filename: str,
-    voice_id: str,
-    voice_config: dict,
-) -> None:
-    """Synchronous Pocket TTS generation (run in thread)."""
+def _pocket_tts_chunk_text(text: str, max_chars: int = 120, language: Optional[str] = None) -> List[str]:
+    """Balanced chunks under the Pocket TTS streaming limit, cut at the strongest nearby boundary."""
+    return segmentation.chunk_text(text, max_chars, language)
+
+
+def _pocket_tts_model_and_voice(voice_id: str, settings: Optional[dict] = None):
+    """
+    Loaded Pocket TTS model and voice state, cached for the life of the process. Voice states are
+    also kept on disk across processes (tts_settings.pocket_tts.voice_cache, see pocket_voice_cache).
+    """
     global _pocket_tts_cache, _pocket_tts_lock
     try:
         from pocket_tts import TTSModel
-        import scipy.io.wavfile
-        from pydub import AudioSegment
     except ImportError as e:
         raise ImportError(
             "Pocket TTS dependencies not installed. Install with: pip install -r requirements-tts-pocket.txt"
@@ -137,187 +238,567 @@ def _pocket_tts_generate_sync(
             _pocket_tts_cache["model"] = TTSModel.load_model()
         model = _pocket_tts_cache["model"]
         if voice_id not in _pocket_tts_cache["voices"]:
-            _pocket_tts_cache["voices"][voice_id] = model.get_state_for_audio_prompt(voice_id)
-        voice_state = _pocket_tts_cache["voices"][voice_id]
-    settings = voice_config.get("tts_settings", {}).get("pocket_tts", {})
-    bitrate = settings.get("bitrate", "256k")
-    crossfade_ms = settings.get("crossfade_ms", 50)
-    normalize = settings.get("normalize", True)
-    chunks = _pocket_tts_chunk_text(digest_text)
-    if not chunks:
-        raise ValueError("Digest text is empty after chunking")
-    wav_paths = []
-    try:
-        for i, chunk in enumerate(chunks):
-            audio_tensor = model.generate_audio(voice_state, chunk)
-            fd, wav_path = tempfile.mkstemp(suffix=f"_pocket_{i}.wav")
-            os.close(fd)
-            scipy.io.wavfile.write(wav_path, model.sample_rate, audio_tensor.numpy())
-            wav_paths.append(wav_path)
-        combined = AudioSegment.empty()
-        for i, wav_path in enumerate(wav_paths):
-            seg = AudioSegment.from_wav(wav_path)
-            if i == 0:
-                combined = seg
+            settings = settings or {}
+            if settings.get("voice_cache", True):
+                from .pocket_voice_cache import VoiceStateCache
+
+                cache = VoiceStateCache(settings.get("voice_cache_dir"))
+                state = cache.get_or_create(model, voice_id)
             else:
-                combined = combined.append(seg, crossfade=crossfade_ms)
-        if normalize:
-            combined = combined.normalize()
-        combined.export(output_filename, format="mp3", bitrate=bitrate)
-    finally:
-        for p in wav_paths:
-            try:
-                os.unlink(p)
-            except OSError:
-                pass
+                state = model.get_state_for_audio_prompt(voice_id)
+            _pocket_tts_cache["voices"][voice_id] = state
+        return model, _pocket_tts_cache["voices"][voice_id]
+
+
+def _pocket_segment_settings(voice_id: str) -> dict:
+    """What besides the text decides a Pocket chunk's audio: package version and voice prompt."""
+    from .pocket_voice_cache import prompt_hash
+
+    try:
+        from importlib.metadata import version
+
+        package = version("pocket-tts")
+    except Exception:
+        package = "unknown"
+    return {"package": package, "prompt": prompt_hash(voice_id)}
+
+
+def _pack_pocket_segment(samples, sample_rate: int) -> bytes:
+    """Cached Pocket chunk: 4-byte little-endian sample rate, then float32 samples."""
+    import numpy as np
+
+    return int(sample_rate).to_bytes(4, "little") + np.ascontiguousarray(samples, dtype="<f4").tobytes()
+
 
+def _unpack_pocket_segment(data: bytes):
+    import numpy as np
 
-async def _generate_audio_elevenlabs(
+    return int.from_bytes(data[:4], "little"), np.frombuffer(data, dtype="<f4", offset=4).copy()
+
+
+def _pocket_tts_generate_sync(
     digest_text: str,
     output_filename: str,
     voice_id: str,
     voice_config: dict,
-) -> None:
-    """Generate audio via ElevenLabs API with chunking."""
-    api_key = os.getenv("ELEVENLABS_API_KEY")
-    if not api_key or not api_key.strip():
-        raise ValueError(
-            "ELEVENLABS_API_KEY environment variable is not set. "
-            "Set it with: export ELEVENLABS_API_KEY=your_api_key"
-        )
-    if not aiohttp:
-        raise ImportError("aiohttp is required for ElevenLabs TTS")
-    settings = voice_config.get("tts_settings", {}).get("elevenlabs", {})
-    model_id = settings.get("model_id", "eleven_multilingual_v2")
-    output_format = settings.get("output_format", "mp3_44100_128")
-    chunk_size = settings.get("chunk_size", 4500)
-    url = f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}"
-    headers = {
-        "xi-api-key": api_key,
-        "Content-Type": "application/json",
-        "Accept": "audio/mpeg",
-    }
-    text = digest_text.strip()
-    chunks = []
-    while text:
-        if len(text) <= chunk_size:
-            chunks.append(text)
-            break
-        break_at = text.rfind(" ", 0, chunk_size + 1)
-        if break_at <= 0:
-            break_at = chunk_size
-        chunks.append(text[:break_at].strip())
-        text = text[break_at:].lstrip()
+    language: Optional[str] = None,
+) -> dict:
+    """
+    Synchronous Pocket TTS generation (run in thread, or in the warm worker process). Chunks are cut
+    with language's chunk rules. With tts_settings.pocket_tts.parallel_workers, chunks are generated
+    across a process pool; with tts_settings.segment_cache, chunks are cut per sentence and only
+    uncached ones are generated. Returns the post-processing stats (duration, loudness).
+    """
+    from . import audio, pocket_pool, postprocess, segment_cache
+
+    settings = voice_config.get("tts_settings", {}).get("pocket_tts", {})
+    bitrate = settings.get("bitrate", "256k")
+    crossfade_ms = settings.get("crossfade_ms", 50)
+    normalize = settings.get("normalize", True)
+    cache = segment_cache.from_config(voice_config)
+    if cache is not None:
+        # Chunk boundaries only depend on the sentence, so an edit elsewhere keeps them (and the keys)
+        chunks = [
+            c for sentence in segment_cache.split_segments(digest_text)
+            for c in _pocket_tts_chunk_text(sentence, language=language)
+        ]
+    else:
+        chunk_chars = POCKET_TTS.plan(len(digest_text), settings).chunk_chars
+        chunks = _pocket_tts_chunk_text(digest_text, chunk_chars, language)
     if not chunks:
-        raise ValueError("Digest text is empty")
-    async with aiohttp.ClientSession() as session:
-        if len(chunks) == 1:
-            payload = {"text": chunks[0], "model_id": model_id, "output_format": output_format}
+        raise ValueError("Digest text is empty after chunking")
+    pieces: list = [None] * len(chunks)
+    sample_rate = None
+    keys: list = []
+    if cache is not None:
+        key_settings = _pocket_segment_settings(voice_id)
+        keys = [segment_cache.segment_key("pocket_tts", voice_id, key_settings, c) for c in chunks]
+        for i, key in enumerate(keys):
+            data = cache.get(key, "f32")
+            if data is not None:
+                sample_rate, pieces[i] = _unpack_pocket_segment(data)
+    missing = [i for i, piece in enumerate(pieces) if piece is None]
+    workers, threads = pocket_pool.resolve_workers(settings)
+    # Chunk audio stays in memory; one crossfaded buffer, one MP3 encode through a pipe
+    if workers > 1 and len(missing) > 1:
+        print(f"   🧵 Pocket TTS: {len(missing)} chunks across {workers} workers × {threads} threads")
+        pool = pocket_pool.get_pool(voice_id, settings, workers, threads)
+        generated = pool.generate([chunks[i] for i in missing])
+        sample_rate = pool.sample_rate
+    elif missing:
+        model, voice_state = _pocket_tts_model_and_voice(voice_id, settings)
+        generated = [audio.to_float32(model.generate_audio(voice_state, chunks[i])) for i in missing]
+        sample_rate = model.sample_rate
+    else:
+        generated = []
+    for i, piece in zip(missing, generated):
+        pieces[i] = piece
+        if cache is not None:
+            cache.put(keys[i], "f32", _pack_pocket_segment(piece, sample_rate))
+    if cache is not None:
+        print(f"   💾 Segment cache: {cache.summary()}")
+    samples = audio.crossfade_concat(pieces, crossfade=int(sample_rate * crossfade_ms / 1000))
+    del pieces
+    if normalize:
+        audio.normalize_peak(samples)
+    post = postprocess.resolve_settings(voice_config, bitrate=bitrate)
+    return postprocess.process_samples(samples, sample_rate, output_filename, post).as_dict()
+
+
+async def _elevenlabs_post(session, url: str, payload: dict, headers: dict, settings: dict, call) -> bytes:
+    """
+    POST one ElevenLabs request. Connection errors, timeouts, 429 and 5xx are retried with
+    exponential backoff; other HTTP errors fail at once.
+    """
+    max_retries = settings.get("max_retries", 3)
+    delay = settings.get("initial_retry_delay", 2)
+    backoff = settings.get("retry_backoff_multiplier", 2)
+    for attempt in range(max_retries):
+        call.retries = attempt
+        try:
             async with session.post(url, json=payload, headers=headers) as resp:
                 resp.raise_for_status()
-                with open(output_filename, "wb") as f:
-                    f.write(await resp.read())
-            return
-        mp3_paths = []
-        try:
-            for i, chunk in enumerate(chunks):
-                payload = {"text": chunk, "model_id": model_id, "output_format": output_format}
-                async with session.post(url, json=payload, headers=headers) as resp:
-                    resp.raise_for_status()
-                    fd, path = tempfile.mkstemp(suffix=f"_el_{i}.mp3")
-                    os.close(fd)
-                    with open(path, "wb") as f:
-                        f.write(await resp.read())
-                    mp3_paths.append(path)
-            from pydub import AudioSegment
-            combined = AudioSegment.empty()
-            for path in mp3_paths:
-                combined += AudioSegment.from_mp3(path)
-            combined.export(output_filename, format="mp3", bitrate="128k")
-        finally:
-            for path in mp3_paths:
-                try:
-                    os.unlink(path)
-                except OSError:
-                    pass
+                return await resp.read()
+        except aiohttp.ClientResponseError as e:
+            if e.status != 429 and e.status < 500:
+                raise
+            err = e
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            err = e
+        if attempt == max_retries - 1:
+            raise RuntimeError(f"ElevenLabs failed after {max_retries} attempts: {err}") from err
+        print(f"   ⚠️ ElevenLabs chunk {call.detail.get('chunk', 0) + 1} attempt {attempt + 1} failed: {err}; retrying in {delay}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * backoff, 30)
+    raise RuntimeError("ElevenLabs: max_retries must be at least 1")
 
 
-async def _generate_audio_dd(
-    digest_text: str,
-    output_filename: str,
-    voice_config: dict,
-    language: Optional[str] = None,
-) -> None:
-    """Generate audio via the self-hosted DynamicDevices Qwen3-TTS service.
+def _elevenlabs_chunks(text: str, chunk_size: int, language: Optional[str] = None) -> List[str]:
+    """Fewest balanced pieces of at most chunk_size characters, cut at sentence, clause or word boundaries."""
+    return segmentation.chunk_text(text, chunk_size, language)
 
-    Endpoint + bearer token come from env (DD_TTS_URL, DD_TTS_TOKEN). The service
-    synthesises the whole digest (paragraph-splitting internally) and returns WAV,
-    which we transcode to MP3 with pydub.
+
+async def _dd_request_audio(session, base_url: str, payload: dict, headers: dict) -> str:
+    """POST one /tts job; returns the audio path to GET. A 401 fails with a hint about the token."""
+    async with session.post(f"{base_url}/tts", json=payload, headers=headers) as resp:
+        if resp.status == 401:
+            raise RuntimeError("DD TTS auth failed (401) - check DD_TTS_TOKEN")
+        resp.raise_for_status()
+        meta = await resp.json()
+    style = payload.get("style")
+    got_style = meta.get("style")
+    if got_style and got_style != style:
+        # Boundary guard: the service silently falls back to 'neutral' when a
+        # requested reference is missing. Surface a mismatch loudly rather than
+        # shipping the wrong voice unnoticed.
+        print(f"   ⚠️ DD TTS returned style '{got_style}' (requested '{style}')")
+    name = meta.get("name")
+    audio_url = meta.get("url") or (f"/audio/{name}" if name else None)
+    if not audio_url:
+        raise RuntimeError(f"DD TTS response missing audio reference: {meta}")
+    return audio_url
+
+
+async def _dd_chunk_wav(session, base_url: str, payload: dict, headers: dict, settings: dict, call) -> bytes:
+    """
+    Synthesize and download one chunk. Connection errors, timeouts, 429 and 5xx are retried with
+    exponential backoff (the job is submitted again); other errors fail at once.
     """
+    max_retries = settings.get("max_retries", 3)
+    delay = settings.get("initial_retry_delay", 2)
+    backoff = settings.get("retry_backoff_multiplier", 2)
+    for attempt in range(max_retries):
+        call.retries = attempt
+        try:
+            audio_url = await _dd_request_audio(session, base_url, payload, headers)
+            async with session.get(f"{base_url}{audio_url}", headers=headers) as aresp:
+                aresp.raise_for_status()
+                data = await aresp.read()
+            call.mark_first_byte()
+            return data
+        except aiohttp.ClientResponseError as e:
+            if e.status != 429 and e.status < 500:
+                raise
+            err = e
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            err = e
+        if attempt == max_retries - 1:
+            raise RuntimeError(f"DD TTS failed after {max_retries} attempts: {err}") from err
+        print(f"   ⚠️ DD TTS chunk {call.detail.get('chunk', 0) + 1} attempt {attempt + 1} failed: {err}; retrying in {delay}s")
+        await asyncio.sleep(delay)
+        delay = min(delay * backoff, 30)
+    raise RuntimeError("DD TTS: max_retries must be at least 1")
+
+
+def _dd_chunks(digest_text: str, document, chunk_chars: int, language: Optional[str] = None) -> List[str]:
+    """Digest sections (one request each) when the document is available, else sentence-packed chunks."""
+    if document is not None:
+        chunks = [t.strip() for t in document.render_sections("dd_tts")]
+    else:
+        chunks = _edge_text_chunks(digest_text, chunk_chars, language)  # whole sentences, any provider's text
+    return [c for c in chunks if c]
+
+
+def _dd_endpoint() -> Tuple[str, dict]:
+    """Base URL (DD_TTS_URL) and request headers (bearer DD_TTS_TOKEN, when set)."""
     base_url = (os.getenv("DD_TTS_URL") or "").strip().rstrip("/")
     if not base_url:
         raise ValueError(
             "DD_TTS_URL environment variable is not set. "
             "Set it to the TTS endpoint, e.g. https://tts.dynamicdevices.co.uk"
         )
-    if not aiohttp:
-        raise ImportError("aiohttp is required for DynamicDevices TTS")
     token = (os.getenv("DD_TTS_TOKEN") or "").strip()
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return base_url, headers
+
+
+def _dd_payload(voice_config: dict, language: Optional[str]) -> dict:
+    """Request fields every /tts job of a digest shares: style (per voice), seed, speed, paragraph_pause."""
     settings = voice_config.get("tts_settings", {}).get("dd_tts", {})
     voice_cfg = voice_config.get("voices", {}).get(language or "", {})
-    style = voice_cfg.get("dd_style") or settings.get("style", "neutral")
-    seed = settings.get("seed", 2)
+    payload = {"style": voice_cfg.get("dd_style") or settings.get("style", "neutral"), "seed": settings.get("seed", 2)}
     speed = settings.get("speed")  # None -> service uses per-style default
+    if speed is not None:
+        payload["speed"] = speed
     paragraph_pause = settings.get("paragraph_pause")  # None -> service default
-    timeout_s = settings.get("request_timeout_s", 600)
+    if paragraph_pause is not None:
+        payload["paragraph_pause"] = paragraph_pause
+    return payload
 
-    headers = {"Content-Type": "application/json"}
-    if token:
-        headers["Authorization"] = f"Bearer {token}"
 
+async def _generate_audio_dd(
+    digest_text: str,
+    output_filename: str,
+    voice_config: dict,
+    language: Optional[str] = None,
+) -> dict:
+    """Generate audio via the self-hosted DynamicDevices Qwen3-TTS service in one request.
+
+    Endpoint + bearer token come from env (DD_TTS_URL, DD_TTS_TOKEN). The service
+    synthesises the whole digest (paragraph-splitting internally) and returns WAV,
+    which is streamed into the ffmpeg post-processing run as it downloads, so the
+    MP3 is encoded while the body arrives and the WAV is never held in memory.
+    Returns the post-processing stats.
+    """
+    base_url, headers = _dd_endpoint()
+    settings = voice_config.get("tts_settings", {}).get("dd_tts", {})
     text = digest_text.strip()
     if not text:
         raise ValueError("Digest text is empty")
-    payload = {"text": text, "style": style, "seed": seed}
-    if speed is not None:
-        payload["speed"] = speed
-    if paragraph_pause is not None:
-        payload["paragraph_pause"] = paragraph_pause
+    payload = dict(_dd_payload(voice_config, language), text=text)
 
-    timeout = aiohttp.ClientTimeout(total=timeout_s)
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.post(f"{base_url}/tts", json=payload, headers=headers) as resp:
-            if resp.status == 401:
-                raise RuntimeError("DD TTS auth failed (401) - check DD_TTS_TOKEN")
-            resp.raise_for_status()
-            meta = await resp.json()
-        got_style = meta.get("style")
-        if got_style and got_style != style:
-            # Boundary guard: the service silently falls back to 'neutral' when a
-            # requested reference is missing. Surface a mismatch loudly rather than
-            # shipping the wrong voice unnoticed.
-            print(f"   ⚠️ DD TTS returned style '{got_style}' (requested '{style}')")
-        name = meta.get("name")
-        audio_url = meta.get("url") or (f"/audio/{name}" if name else None)
-        if not audio_url:
-            raise RuntimeError(f"DD TTS response missing audio reference: {meta}")
-        async with session.get(f"{base_url}{audio_url}", headers=headers) as aresp:
-            aresp.raise_for_status()
-            wav_bytes = await aresp.read()
-
-    fd, wav_path = tempfile.mkstemp(suffix="_dd.wav")
-    os.close(fd)
-    try:
-        with open(wav_path, "wb") as f:
-            f.write(wav_bytes)
-        from pydub import AudioSegment
-        audio = AudioSegment.from_wav(wav_path)
-        audio.export(output_filename, format="mp3", bitrate="192k")
-    finally:
-        try:
-            os.unlink(wav_path)
-        except OSError:
-            pass
+    from . import postprocess
+
+    post = postprocess.resolve_settings(voice_config, bitrate=settings.get("bitrate"))
+    timeout = aiohttp.ClientTimeout(total=settings.get("request_timeout_s", 600))
+    stream_chunk = int(settings.get("stream_chunk_kb", 64)) * 1024
+    with instrumentation.track("tts", "dd_tts", language=language, style=payload["style"]) as call:
+        instrumentation.record_tts_characters(call, text, settings)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            audio_url = await _dd_request_audio(session, base_url, payload, headers)
+            # WAV body straight into the single ffmpeg post-processing run, chunk by chunk
+            async with session.get(f"{base_url}{audio_url}", headers=headers) as aresp:
+                aresp.raise_for_status()
+
+                async def body():
+                    async for chunk in aresp.content.iter_chunked(stream_chunk):
+                        call.mark_first_byte()
+                        call.bytes_received += len(chunk)
+                        yield chunk
+
+                stats = await postprocess.process_stream(body(), output_filename, post, input_format="wav")
+    return stats.as_dict()
+
+
+# Gap between chunks when dd_tts.paragraph_pause is null (the service's own default is not exposed)
+DD_DEFAULT_PARAGRAPH_PAUSE_S = 0.6
+
+
+class EdgeTTS(tts_providers.TTSProvider):
+    """Edge TTS: one streamed request (the library splits long text), or sentence chunks in parallel."""
+
+    name = "edge_tts"
+    label = "Edge TTS"
+    CAPABILITIES = tts_providers.Capabilities(
+        max_chars=EDGE_SSML_MAX_BYTES, max_concurrency=4, output_format="mp3", sample_rate=24000
+    )
+
+    def chunks(self, job: tts_providers.TTSJob, settings: dict) -> List[str]:
+        """Whole sentences: words inside an Edge TTS sentence are joined by non-breaking spaces."""
+        return _edge_text_chunks(job.text, self.plan(len(job.text), settings).chunk_chars, job.language)
+
+    def piece_text(self, piece) -> str:
+        # SSML pieces are the <speak> bodies as bytes
+        return piece.decode("utf-8") if isinstance(piece, bytes) else piece
+
+    def cache_key(self, job: tts_providers.TTSJob, settings: dict, piece) -> str:
+        from . import segment_cache
+
+        key_settings = {"rate": settings.get("rate", "+0%") or "+0%", "ssml": isinstance(piece, bytes)}
+        return segment_cache.segment_key(self.name, job.voice_name, key_settings, self.piece_text(piece))
+
+    def connect(self, job: tts_providers.TTSJob, settings: dict):
+        return _edge_connector(settings)
+
+    async def synthesize_chunk(self, job: tts_providers.TTSJob, pieces, index: int, connector, call) -> bytes:
+        """One text (or SSML body) piece, streamed, with its own retries."""
+        settings = self.settings(job.voice_config)
+        piece = pieces[index]
+        ssml = isinstance(piece, bytes)
+        parts: List[bytes] = []
+
+        async def synthesize() -> None:
+            parts.clear()
+            communicate = _edge_communicate(
+                self.piece_text(piece), job.voice_name, settings, [piece] if ssml else None, connector=connector
+            )
+            async for chunk in communicate.stream():
+                if chunk.get("type") == "audio":
+                    call.mark_first_byte()
+                    parts.append(chunk["data"])
+
+        await _edge_with_retries(synthesize, settings, call, label=f"Edge TTS chunk {index + 1}/{len(pieces)}")
+        return b"".join(parts)
+
+    async def synthesize(self, job: tts_providers.TTSJob) -> Optional[dict]:
+        """
+        With tts_settings.edge_tts.chunked or a segment cache, pieces go through the shared scheduler;
+        otherwise one streamed request. With tts_settings.edge_tts.ssml_mode, the digest document
+        (DigestDocument) is read as SSML with explicit breaks instead of job.text.
+        """
+        from . import postprocess, segment_cache
+
+        digest_text, output_filename, voice_name, language = job.text, job.output_filename, job.voice_name, job.language
+        tts_settings = self.settings(job.voice_config)
+        ssml_fragments = None
+        if tts_settings.get("ssml_mode", False):
+            if job.document is not None:
+                ssml_fragments = job.document.ssml_fragments(
+                    sentence_break_ms=tts_settings.get("ssml_sentence_break_ms", 250),
+                    section_break_ms=tts_settings.get("ssml_section_break_ms", 800),
+                )
+            else:
+                print("   ⚠️ SSML mode needs a digest document; using plain text")
+
+        cache = segment_cache.from_config(job.voice_config)
+        async with self.connect(job, tts_settings) as connector:
+            if cache is not None or tts_settings.get("chunked", False):
+                if cache is not None:
+                    # One segment per sentence (SSML: per fragment), each cached on its own
+                    if ssml_fragments is not None:
+                        pieces = [t for fragment in ssml_fragments for t in _edge_ssml_texts([fragment])]
+                    else:
+                        pieces = segment_cache.split_segments(digest_text)
+                elif ssml_fragments is not None:
+                    chunk_chars = self.plan(len(digest_text), tts_settings).chunk_chars
+                    pieces = _edge_ssml_texts(ssml_fragments, max_bytes=min(chunk_chars, EDGE_SSML_MAX_BYTES))
+                else:
+                    pieces = self.chunks(job, tts_settings)
+                await self.render(job, pieces, tts_settings, connector, cache=cache)
+                print(f"   ✅ Edge TTS audio generated successfully ({len(pieces)} chunks joined)")
+            else:
+                ssml_texts = None
+                if ssml_fragments is not None:
+                    ssml_texts = _edge_ssml_texts(ssml_fragments)
+                    print(f"   🧩 SSML mode: {len(ssml_texts)} request(s) with explicit breaks")
+                with instrumentation.track("tts", "edge_tts", language=language, voice=voice_name) as call:
+                    if ssml_texts is not None:
+                        instrumentation.record_tts_characters(call, b" ".join(ssml_texts).decode("utf-8"), tts_settings)
+                    else:
+                        instrumentation.record_tts_characters(call, digest_text, tts_settings)
+
+                    async def synthesize() -> None:
+                        communicate = _edge_communicate(digest_text, voice_name, tts_settings, ssml_texts, connector)
+                        with open(output_filename, "wb") as f:
+                            async for chunk in communicate.stream():
+                                if chunk.get("type") == "audio":
+                                    call.mark_first_byte()
+                                    f.write(chunk["data"])
+
+                    await _edge_with_retries(synthesize, tts_settings, call)
+                    call.bytes_received = os.path.getsize(output_filename)
+                print("   ✅ Edge TTS audio generated successfully")
+
+        # With SSML the pauses are already explicit; compression is opt-in via ssml_compress_silences
+        compress_key = "ssml_compress_silences" if ssml_fragments is not None else "compress_silences"
+        silence = None
+        if tts_settings.get(compress_key, False):
+            silence = (
+                tts_settings.get("short_silence_min_ms", 400),
+                tts_settings.get("short_silence_max_ms", 1100),
+                tts_settings.get("target_silence_ms", 90),
+            )
+        post = postprocess.resolve_settings(job.voice_config)
+        if silence is None and not postprocess.needs_reencode(post):
+            return None
+        post_stats = postprocess.process_file(output_filename, output_filename, post, silence=silence).as_dict()
+        if silence is not None:
+            print(f"   ✅ Short silences compressed ({post_stats['pauses_shortened']} pauses)")
+        return post_stats
+
+
+class PocketTTS(tts_providers.TTSProvider):
+    """Local Pocket TTS: a warm worker when one is running, else in a thread (optionally a process pool)."""
+
+    name = "pocket_tts"
+    label = "Pocket TTS"
+    CAPABILITIES = tts_providers.Capabilities(
+        max_chars=120, max_concurrency=1, output_format="f32le", sample_rate=24000, min_chars=60
+    )
+
+    def capabilities(self, settings: dict) -> tts_providers.Capabilities:
+        from . import pocket_pool
+
+        workers, _ = pocket_pool.resolve_workers(settings)
+        return dataclasses.replace(self.CAPABILITIES, max_concurrency=max(1, workers))
+
+    async def synthesize(self, job: tts_providers.TTSJob) -> Optional[dict]:
+        voice_config, language = job.voice_config, job.language
+        voice_id = job.pocket_voice or voice_config.get("voices", {}).get(language, {}).get("pocket_voice") or "alba"
+        pocket_settings = self.settings(voice_config)
+        socket_path = None
+        if pocket_settings.get("use_worker", True):
+            from . import pocket_worker
+
+            socket_path = pocket_worker.default_socket_path(voice_config)
+            if not pocket_worker.is_running(socket_path):
+                socket_path = None
+        with instrumentation.track(
+            "tts", "pocket_tts", language=language, voice=voice_id, worker=socket_path is not None
+        ) as call:
+            call.characters = len(job.text)
+            if socket_path is not None:
+                print(f"   🔥 Using warm Pocket TTS worker ({socket_path})")
+
+                def work():
+                    reply = pocket_worker.synthesize(
+                        socket_path, job.text, job.output_filename, voice_id, voice_config, language=language
+                    )
+                    return reply.get("stats")
+            else:
+
+                def work():
+                    return _pocket_tts_generate_sync(job.text, job.output_filename, voice_id, voice_config, language)
+
+            if hasattr(asyncio, "to_thread"):
+                post_stats = await asyncio.to_thread(work)
+            else:
+                loop = asyncio.get_event_loop()
+                post_stats = await loop.run_in_executor(None, work)
+            call.bytes_received = os.path.getsize(job.output_filename)
+        print("   ✅ Pocket TTS audio generated successfully")
+        return post_stats
+
+
+class ElevenLabsTTS(tts_providers.TTSProvider):
+    """ElevenLabs: chunks requested concurrently, each conditioned on its neighbours' text."""
+
+    name = "elevenlabs"
+    label = "ElevenLabs TTS"
+    chunk_key = "chunk_size"
+    CAPABILITIES = tts_providers.Capabilities(max_chars=4500, max_concurrency=3, output_format="mp3", sample_rate=44100)
+
+    def capabilities(self, settings: dict) -> tts_providers.Capabilities:
+        # output_format is codec_rate[_bitrate], e.g. mp3_44100_128 or pcm_22050
+        parts = (settings.get("output_format") or "mp3_44100_128").split("_")
+        rate = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+        return dataclasses.replace(self.CAPABILITIES, output_format=parts[0], sample_rate=rate)
+
+    def voice_id(self, job: tts_providers.TTSJob, settings: dict) -> str:
+        return job.elevenlabs_voice_id or settings.get("voice_id") or "EXAVITQu4vr4xnSDxMaL"
+
+    def chunk_detail(self, job: tts_providers.TTSJob, settings: dict) -> dict:
+        return {"voice": self.voice_id(job, settings)}
+
+    @contextlib.asynccontextmanager
+    async def connect(self, job: tts_providers.TTSJob, settings: dict):
+        api_key = os.getenv("ELEVENLABS_API_KEY")
+        if not api_key or not api_key.strip():
+            raise ValueError(
+                "ELEVENLABS_API_KEY environment variable is not set. "
+                "Set it with: export ELEVENLABS_API_KEY=your_api_key"
+            )
+        async with aiohttp.ClientSession(headers={"xi-api-key": api_key}) as session:
+            yield session
+
+    async def synthesize_chunk(self, job: tts_providers.TTSJob, pieces, index: int, session, call) -> bytes:
+        """One chunk, with the previous/next chunk's text for continuous prosody across chunk edges."""
+        settings = self.settings(job.voice_config)
+        base_url = (os.getenv("ELEVENLABS_BASE_URL") or "https://api.elevenlabs.io").rstrip("/")
+        url = f"{base_url}/v1/text-to-speech/{self.voice_id(job, settings)}"
+        headers = {"Content-Type": "application/json", "Accept": "audio/mpeg"}
+        payload = {
+            "text": pieces[index],
+            "model_id": settings.get("model_id", "eleven_multilingual_v2"),
+            "output_format": settings.get("output_format", "mp3_44100_128"),
+        }
+        if index > 0:
+            payload["previous_text"] = pieces[index - 1]
+        if index + 1 < len(pieces):
+            payload["next_text"] = pieces[index + 1]
+        return await _elevenlabs_post(session, url, payload, headers, settings, call)
+
+
+class DynamicDevicesTTS(tts_providers.TTSProvider):
+    """Self-hosted DynamicDevices Qwen3-TTS: one streamed WAV request, or section chunks in parallel."""
+
+    name = "dd_tts"
+    label = "DynamicDevices Qwen3-TTS (self-hosted)"
+    CAPABILITIES = tts_providers.Capabilities(max_chars=None, max_concurrency=3, output_format="wav")
+
+    def chunks(self, job: tts_providers.TTSJob, settings: dict) -> List[str]:
+        text = job.text.strip()
+        return _dd_chunks(text, job.document, self.plan(len(text), settings).chunk_chars, job.language)
+
+    def chunk_detail(self, job: tts_providers.TTSJob, settings: dict) -> dict:
+        return {"style": _dd_payload(job.voice_config, job.language)["style"]}
+
+    def cache_key(self, job: tts_providers.TTSJob, settings: dict, piece) -> str:
+        from . import segment_cache
+
+        payload = _dd_payload(job.voice_config, job.language)
+        key_settings = {k: payload.get(k) for k in ("seed", "speed", "paragraph_pause")}
+        key_settings["url"] = _dd_endpoint()[0]
+        return segment_cache.segment_key(self.name, payload["style"], key_settings, piece)
+
+    def connect(self, job: tts_providers.TTSJob, settings: dict):
+        return aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=settings.get("request_timeout_s", 600)))
+
+    async def synthesize_chunk(self, job: tts_providers.TTSJob, pieces, index: int, session, call) -> bytes:
+        """One /tts job with the digest's style, seed and speed; a failed chunk is retried on its own."""
+        base_url, headers = _dd_endpoint()
+        payload = dict(_dd_payload(job.voice_config, job.language), text=pieces[index])
+        return await _dd_chunk_wav(session, base_url, payload, headers, self.settings(job.voice_config), call)
+
+    async def synthesize(self, job: tts_providers.TTSJob) -> Optional[dict]:
+        """
+        With tts_settings.dd_tts.chunked, the digest's sections (or sentence-packed chunks) go through
+        the shared scheduler, joined with paragraph_pause seconds of silence; otherwise one request.
+        """
+        from . import segment_cache
+
+        settings = self.settings(job.voice_config)
+        pieces = self.chunks(job, settings) if settings.get("chunked", False) else []
+        if len(pieces) > 1:
+            _dd_endpoint()  # fail on a missing URL before any request
+            pause_s = _dd_payload(job.voice_config, job.language).get("paragraph_pause")
+            pause_s = DD_DEFAULT_PARAGRAPH_PAUSE_S if pause_s is None else float(pause_s)
+            async with self.connect(job, settings) as session:
+                post_stats = await self.render(
+                    job, pieces, settings, session, cache=segment_cache.from_config(job.voice_config), gap_s=pause_s
+                )
+        else:
+            post_stats = await _generate_audio_dd(job.text, job.output_filename, job.voice_config, job.language)
+        print("   ✅ DynamicDevices Qwen3-TTS audio generated successfully")
+        return post_stats
+
+
+EDGE_TTS = tts_providers.register(EdgeTTS())
+POCKET_TTS = tts_providers.register(PocketTTS())
+ELEVENLABS = tts_providers.register(ElevenLabsTTS())
+DD_TTS = tts_providers.register(DynamicDevicesTTS())
 
 
 async def generate_audio_digest(
@@ -330,100 +811,53 @@ async def generate_audio_digest(
     voice_config: dict,
     elevenlabs_voice_id: Optional[str] = None,
     pocket_voice: Optional[str] = None,
+    document=None,
 ) -> dict:
     """
-    Generate audio file from digest text. Dispatches to Edge TTS, Pocket TTS, or ElevenLabs.
-    Returns dict with filename, duration, words, wps, size_kb.
+    Generate audio file from digest text with the registered provider named tts_provider
+    (digest/tts_providers.py). Returns dict with filename, duration, words, wps, size_kb.
     """
+    provider = tts_providers.get(tts_provider)
     print(f"\n🎤 Generating AI-enhanced audio: {output_filename} (provider: {tts_provider})")
-    if tts_provider == "elevenlabs":
-        print("   🔊 Using ElevenLabs TTS (voice_id from config)")
-    elif tts_provider == "dd_tts":
-        print("   🔊 Using DynamicDevices Qwen3-TTS (self-hosted)")
-    elif tts_provider == "edge_tts":
-        print("   🔊 Using Edge TTS")
+    print(f"   🔊 Using {provider.label}")
     os.makedirs(os.path.dirname(output_filename), exist_ok=True)
+    job = tts_providers.TTSJob(
+        digest_text,
+        output_filename,
+        voice_name,
+        language,
+        voice_config,
+        elevenlabs_voice_id=elevenlabs_voice_id,
+        pocket_voice=pocket_voice,
+        document=document,
+    )
+    # Stats from the post-processing run (duration, loudness); None when the file was not re-encoded
+    post_stats = await provider.synthesize(job)
 
-    if tts_provider == "pocket_tts":
-        voice_id = pocket_voice or voice_config.get("voices", {}).get(language, {}).get("pocket_voice") or "alba"
-        if hasattr(asyncio, "to_thread"):
-            await asyncio.to_thread(
-                _pocket_tts_generate_sync, digest_text, output_filename, voice_id, voice_config
-            )
-        else:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: _pocket_tts_generate_sync(digest_text, output_filename, voice_id, voice_config),
-            )
-        print("   ✅ Pocket TTS audio generated successfully")
-    elif tts_provider == "elevenlabs":
-        vid = elevenlabs_voice_id or voice_config.get("tts_settings", {}).get("elevenlabs", {}).get("voice_id") or "EXAVITQu4vr4xnSDxMaL"
-        await _generate_audio_elevenlabs(digest_text, output_filename, vid, voice_config)
-        print("   ✅ ElevenLabs audio generated successfully")
-    elif tts_provider == "dd_tts":
-        await _generate_audio_dd(digest_text, output_filename, voice_config, language)
-        print("   ✅ DynamicDevices Qwen3-TTS audio generated successfully")
-    else:
-        # Edge TTS
-        tts_settings = voice_config["tts_settings"]["edge_tts"]
-        max_retries = tts_settings["max_retries"]
-        retry_delay = tts_settings["initial_retry_delay"]
-        retry_backoff = tts_settings["retry_backoff_multiplier"]
-        force_ipv4 = tts_settings.get("force_ipv4", True)
-        import socket
-        original_getaddrinfo = socket.getaddrinfo
-
-        def getaddrinfo_ipv4_only(*args, **kwargs):
-            results = original_getaddrinfo(*args, **kwargs)
-            return [r for r in results if r[0] == socket.AF_INET]
-
-        current_delay = retry_delay
-        for attempt in range(max_retries):
-            try:
-                if attempt > 0:
-                    print(f"   🔄 Retry attempt {attempt + 1}/{max_retries}")
-                if force_ipv4:
-                    socket.getaddrinfo = getaddrinfo_ipv4_only
-                try:
-                    rate = tts_settings.get("rate", "+0%") or "+0%"
-                    communicate = edge_tts.Communicate(digest_text, voice_name, rate=rate)
-                    with open(output_filename, "wb") as f:
-                        async for chunk in communicate.stream():
-                            if chunk.get("type") == "audio":
-                                f.write(chunk["data"])
-                finally:
-                    if force_ipv4:
-                        socket.getaddrinfo = original_getaddrinfo
-                print("   ✅ Edge TTS audio generated successfully")
-                break
-            except Exception as e:
-                err = str(e)
-                print(f"   ⚠️ Edge TTS attempt {attempt + 1} failed: {err}")
-                is_net = "Network is unreachable" in err or "Cannot connect" in err or "Connection refused" in err or "Temporary failure" in err
-                is_auth = "401" in err or "authentication" in err.lower() or "handshake" in err.lower()
-                if (is_net or is_auth) and attempt < max_retries - 1:
-                    print(f"   ⏳ Waiting {current_delay}s...")
-                    await asyncio.sleep(current_delay)
-                    current_delay = min(current_delay * retry_backoff, 30)
-                    continue
-                if attempt == max_retries - 1:
-                    raise RuntimeError(f"Edge TTS failed after {max_retries} attempts: {err}") from e
-                raise RuntimeError(f"Edge TTS failed: {err}") from e
-
-        if tts_settings.get("compress_silences", False):
-            _compress_short_silences(
-                output_filename,
-                min_ms=tts_settings.get("short_silence_min_ms", 400),
-                max_ms=tts_settings.get("short_silence_max_ms", 1100),
-                target_ms=tts_settings.get("target_silence_ms", 90),
-            )
-            print("   ✅ Short silences compressed")
+    if post_stats and post_stats.get("duration_s"):
+        duration_s = post_stats["duration_s"]
+        word_count = len(digest_text.split())
+        wps = word_count / duration_s if duration_s > 0 else 0
+        size_kb = os.path.getsize(output_filename) / 1024
+        loudness = post_stats.get("integrated_lufs")
+        level = f", {loudness:.1f} LUFS" if loudness is not None else ""
+        print(f"   ✅ AI Audio created: {duration_s:.1f}s, {word_count} words, {wps:.2f} WPS, {size_kb:.0f}KB{level}")
+        return {
+            "filename": output_filename,
+            "duration": duration_s,
+            "words": word_count,
+            "wps": wps,
+            "size_kb": size_kb,
+            "postprocess": post_stats,
+        }
 
     try:
-        from pydub import AudioSegment
-        audio = AudioSegment.from_mp3(output_filename)
-        duration_s = len(audio) / 1000.0
+        from . import mp3
+
+        info = mp3.read_info(output_filename)  # frame headers / Xing tag, no decode
+        if info is None:
+            raise ValueError("no MPEG audio frames")
+        duration_s = info.duration_s
         word_count = len(digest_text.split())
         wps = word_count / duration_s if duration_s > 0 else 0
         size_kb = os.path.getsize(output_filename) / 1024
@@ -0,0 +1,286 @@
+"""
+TTS provider registry and request scheduling.
+
+Each backend is a TTSProvider registered under its tts_provider name. It declares its Capabilities
+(the longest text one request may carry, how many requests it takes at once safely, the audio format
+and sample rate it returns) and implements synthesize_chunk(): the audio for one piece of text.
+generate_audio_digest looks the provider up instead of branching on its name, and the shared scheduler
+does the rest: plan() turns the capabilities and the digest length into a chunk size and a
+parallelism, chunks() cuts the text with segmentation.chunk_text, and render() requests the pieces at
+most concurrency() at a time (from the segment cache when one is given) and assembles them in order by
+output_format. A new provider is scheduled like the others without chunking, concurrency or assembly
+of its own; a provider with a mode the scheduler does not cover (one streamed request, a local model)
+overrides synthesize() and calls render() for its chunked mode.
+
+plan() splits the text into as few requests as max_chars allows, and into more when that keeps every
+concurrent slot busy (never below min_chars per request, where the per-request overhead starts to
+dominate). tts_settings.<provider> can still pin the chunk size (chunk_chars, or the provider's own
+key) and max_concurrency.
+"""
+
+import asyncio
+import contextlib
+import math
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional, Sequence
+
+from . import instrumentation, segmentation
+
+DEFAULT_MIN_CHARS = 300
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """What one provider accepts and returns."""
+
+    max_chars: Optional[int]  # per request; None: one request takes any length
+    max_concurrency: int = 1  # requests in flight that the service tolerates
+    output_format: str = "mp3"  # of each chunk: "mp3", "wav", or raw mono PCM ("pcm": 16-bit, "f32le")
+    sample_rate: Optional[int] = None  # Hz; needed for raw PCM (MP3 and WAV carry their own)
+    min_chars: int = DEFAULT_MIN_CHARS  # smallest request worth splitting off for parallelism
+
+
+@dataclass(frozen=True)
+class Plan:
+    """How to cut one digest: chunk size in characters, chunks in flight, expected chunk count."""
+
+    chunk_chars: int
+    concurrency: int
+    chunks: int
+
+
+def concurrency(capabilities: Capabilities, settings: Optional[dict] = None) -> int:
+    """Requests in flight: tts_settings max_concurrency when set, else the provider's own."""
+    return max(1, int((settings or {}).get("max_concurrency") or capabilities.max_concurrency))
+
+
+def plan(capabilities: Capabilities, text_chars: int, settings: Optional[dict] = None, chunk_key: str = "chunk_chars") -> Plan:
+    """Chunk size and parallelism for text_chars characters of text (settings may pin either)."""
+    settings = settings or {}
+    slots = concurrency(capabilities, settings)
+    text_chars = max(1, text_chars)
+    pinned = settings.get(chunk_key)
+    if pinned:
+        chunk_chars = int(pinned)
+    else:
+        needed = math.ceil(text_chars / capabilities.max_chars) if capabilities.max_chars else 1
+        # More chunks than needed only to fill the concurrent slots, each still at least min_chars
+        busy = min(slots, text_chars // max(1, capabilities.min_chars))
+        chunk_chars = math.ceil(text_chars / max(needed, busy, 1))
+        if capabilities.max_chars:
+            chunk_chars = min(chunk_chars, capabilities.max_chars)
+    chunks = math.ceil(text_chars / chunk_chars)
+    return Plan(chunk_chars=chunk_chars, concurrency=min(slots, chunks), chunks=chunks)
+
+
+@dataclass
+class TTSJob:
+    """One digest to synthesize: the provider's text, where to write it and the voice choices."""
+
+    text: str
+    output_filename: str
+    voice_name: str
+    language: str
+    voice_config: dict
+    elevenlabs_voice_id: Optional[str] = None
+    pocket_voice: Optional[str] = None
+    document: object = None  # DigestDocument, when available
+
+
+class TTSProvider:
+    """Base class: set name, label and CAPABILITIES, implement synthesize_chunk()."""
+
+    name = ""
+    label = ""
+    CAPABILITIES = Capabilities(max_chars=None)
+    # Settings key that pins the chunk size for this provider
+    chunk_key = "chunk_chars"
+
+    def settings(self, voice_config: dict) -> dict:
+        return voice_config.get("tts_settings", {}).get(self.name, {}) or {}
+
+    def capabilities(self, settings: dict) -> Capabilities:
+        """Capabilities under these settings (override when they depend on e.g. the output format)."""
+        return self.CAPABILITIES
+
+    def concurrency(self, settings: dict) -> int:
+        return concurrency(self.capabilities(settings), settings)
+
+    def plan(self, text_chars: int, settings: dict) -> Plan:
+        return plan(self.capabilities(settings), text_chars, settings, self.chunk_key)
+
+    def chunks(self, job: TTSJob, settings: dict) -> List:
+        """Pieces of job.text, one request each: the plan's chunk size, cut by the job's language rules."""
+        text = job.text.strip()
+        return segmentation.chunk_text(text, self.plan(len(text), settings).chunk_chars, job.language)
+
+    def piece_text(self, piece) -> str:
+        """The text of one piece (for character counts and cache keys)."""
+        return piece
+
+    def chunk_detail(self, job: TTSJob, settings: dict) -> dict:
+        """Ledger detail of every chunk request."""
+        return {"voice": job.voice_name}
+
+    def cache_key(self, job: TTSJob, settings: dict, piece) -> str:
+        """Segment cache key of one piece: override to add the settings that change its audio."""
+        from . import segment_cache
+
+        return segment_cache.segment_key(self.name, job.voice_name, {}, self.piece_text(piece))
+
+    def connect(self, job: TTSJob, settings: dict):
+        """Async context manager for what a job's requests share (e.g. an HTTP session); None by default."""
+        return contextlib.nullcontext()
+
+    async def synthesize_chunk(self, job: TTSJob, pieces: Sequence, index: int, connection, call) -> bytes:
+        """
+        Audio of pieces[index] in the provider's output_format (the neighbours are there for context).
+        call is the chunk's ledger record, for its first byte and retries.
+        """
+        raise NotImplementedError
+
+    async def synthesize(self, job: TTSJob) -> Optional[dict]:
+        """Write job.output_filename; returns post-processing stats, or None when it was not re-encoded."""
+        from . import postprocess
+
+        settings = self.settings(job.voice_config)
+        pieces = self.chunks(job, settings)
+        if not pieces:
+            raise ValueError("Digest text is empty")
+        async with self.connect(job, settings) as connection:
+            stats = await self.render(job, pieces, settings, connection)
+        print(f"   ✅ {self.label} audio generated successfully")
+        post = postprocess.resolve_settings(job.voice_config)
+        if stats is None and postprocess.needs_reencode(post):
+            return postprocess.process_file(job.output_filename, job.output_filename, post).as_dict()
+        return stats
+
+    async def render(
+        self, job: TTSJob, pieces: Sequence, settings: dict, connection=None, *, cache=None, gap_s: float = 0.0
+    ) -> Optional[dict]:
+        """
+        Request pieces at most concurrency() at a time (each from cache, when given and it has it) and
+        assemble them in order into job.output_filename as they complete. MP3 frames are joined
+        without re-encoding (returns None); WAV and raw PCM go through one post-processing run with
+        gap_s seconds of silence between pieces (returns its stats).
+        """
+        caps = self.capabilities(settings)
+        limit = min(self.concurrency(settings), len(pieces))
+        semaphore = asyncio.Semaphore(limit)
+        total = len(pieces)
+        detail = self.chunk_detail(job, settings)
+        if total > 1:
+            print(f"   🧩 {self.label}: {total} chunk(s), up to {limit} at a time")
+
+        async def fetch(index: int) -> bytes:
+            text = self.piece_text(pieces[index])
+            key = None
+            if cache is not None:
+                key = self.cache_key(job, settings, pieces[index])
+                data = cache.get(key, caps.output_format)
+                if data is not None:
+                    # There at once: counts as first audio (for the ledger and for hedging)
+                    with instrumentation.track(
+                        "tts", self.name, language=job.language, cached=True, chunk=index, chunks=total, **detail
+                    ) as call:
+                        call.mark_first_byte()
+                        call.bytes_received = len(data)
+                    return data
+            async with semaphore:
+                with instrumentation.track(
+                    "tts", self.name, language=job.language, chunk=index, chunks=total, **detail
+                ) as call:
+                    instrumentation.record_tts_characters(call, text, settings)
+                    data = await self.synthesize_chunk(job, pieces, index, connection, call)
+                    call.bytes_received = len(data)
+            if key is not None:
+                cache.put(key, caps.output_format, data)
+            return data
+
+        tasks = [asyncio.ensure_future(fetch(i)) for i in range(total)]
+
+        async def in_order() -> AsyncIterator[bytes]:
+            # Each chunk is released once it is handed on
+            for i in range(total):
+                data = await tasks[i]
+                tasks[i] = None
+                yield data
+
+        try:
+            stats = await self._assemble(caps, in_order(), job, settings, gap_s)
+        finally:
+            pending = [t for t in tasks if t is not None]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if cache is not None:
+            print(f"   💾 Segment cache: {cache.summary()}")
+        return stats
+
+    async def _assemble(
+        self, caps: Capabilities, chunks: AsyncIterator[bytes], job: TTSJob, settings: dict, gap_s: float
+    ) -> Optional[dict]:
+        from . import audio, mp3, postprocess
+
+        fmt = caps.output_format
+        if fmt == "mp3":
+            with mp3.Mp3Writer(job.output_filename) as writer:
+                async for data in chunks:
+                    writer.append(data)
+            return None
+
+        post = postprocess.resolve_settings(job.voice_config, bitrate=settings.get("bitrate"))
+        if fmt == "wav":
+            # The first chunk's format sets the stream's; ffmpeg starts once it is here
+            params, first = audio.read_wav(await chunks.__anext__())
+            sample_rate, channels, width = params
+            if width != 2:
+                raise RuntimeError(f"{self.label} returned {8 * width}-bit audio; 16-bit PCM expected")
+            input_format = "s16le"
+        elif fmt in ("pcm", "f32le"):
+            if not caps.sample_rate:
+                raise ValueError(f"{self.label}: raw {fmt} audio needs a sample rate")
+            params, first = None, await chunks.__anext__()
+            sample_rate, channels, width = caps.sample_rate, 1, 2 if fmt == "pcm" else 4
+            input_format = "s16le" if fmt == "pcm" else "f32le"
+        else:
+            raise ValueError(f"{self.label}: cannot assemble {fmt} audio")
+        gap = b"\0" * (int(round(gap_s * sample_rate)) * channels * width)
+
+        async def pcm() -> AsyncIterator[bytes]:
+            yield first
+            index = 1
+            async for data in chunks:
+                index += 1
+                if params is not None:
+                    chunk_params, data = audio.read_wav(data)
+                    if chunk_params != params:
+                        raise RuntimeError(f"{self.label} chunk {index} format {chunk_params} differs from {params}")
+                if gap:
+                    yield gap
+                yield data
+
+        stats = await postprocess.process_stream(
+            pcm(), job.output_filename, post, input_format=input_format, input_rate=sample_rate, channels=channels
+        )
+        return stats.as_dict()
+
+
+_registry: Dict[str, TTSProvider] = {}
+
+
+def register(provider: TTSProvider) -> TTSProvider:
+    """Add (or replace) a provider under provider.name."""
+    _registry[provider.name] = provider
+    return provider
+
+
+def get(name: str) -> TTSProvider:
+    try:
+        return _registry[name]
+    except KeyError:
+        raise ValueError(f"Unknown TTS provider '{name}' (registered: {', '.join(names())})") from None
+
+
+def names() -> List[str]:
+    return list(_registry)
@@ -22,12 +22,14 @@ import argparse
 from pathlib import Path
 from typing import List, Tuple, Optional
 
-try:
-    from pydub import AudioSegment
-    from pydub.silence import detect_silence
-except ImportError:
-    print("Error: pydub is required. Install with: pip install pydub")
-    sys.exit(1)
+import numpy as np
+
+# Ensure project root is on path for "digest" package
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from digest.audio import dbfs, decode_audio, detect_silence
 
 
 # Minimum pause duration to report (ms). Shorter gaps are normal speech.
@@ -66,13 +68,19 @@ def load_transcript(path: Path) -> str:
     return re.sub(r"\s+", " ", body)
 
 
-def detect_pauses(audio_path: Path, min_pause_ms: int = MIN_PAUSE_MS) -> List[Tuple[int, int]]:
-    """Return list of (start_ms, end_ms) for each silence segment."""
-    audio = AudioSegment.from_mp3(str(audio_path))
+def detect_pauses(
+    audio_path: Path,
+    min_pause_ms: int = MIN_PAUSE_MS,
+    decoded: Optional[Tuple[np.ndarray, int]] = None,
+) -> List[Tuple[int, int]]:
+    """Return list of (start_ms, end_ms) for each silence segment. decoded: (samples, rate) if already loaded."""
+    samples, sample_rate = decoded if decoded is not None else decode_audio(str(audio_path))
     # Use dBFS relative to segment so different volumes still work
-    thresh = audio.dBFS + SILENCE_THRESH_DB if audio.dBFS else SILENCE_THRESH_DB
+    level = dbfs(samples)
+    thresh = level + SILENCE_THRESH_DB if np.isfinite(level) else SILENCE_THRESH_DB
     silence_ranges = detect_silence(
-        audio,
+        samples,
+        sample_rate,
         min_silence_len=MIN_SILENCE_LEN_MS,
         silence_thresh=thresh,
         seek_step=10,
@@ -147,9 +155,9 @@ def run_analysis(
             transcript_path = inferred
             transcript = load_transcript(transcript_path)
 
-    audio = AudioSegment.from_mp3(str(audio_path))
-    duration_ms = len(audio)
-    pauses = detect_pauses(audio_path, min_pause_ms=min_pause_ms)
+    samples, sample_rate = decode_audio(str(audio_path))
+    duration_ms = round(len(samples) * 1000 / sample_rate)
+    pauses = detect_pauses(audio_path, min_pause_ms=min_pause_ms, decoded=(samples, sample_rate))
 
     # Total speech time = audio duration minus all pause time (silence doesn't advance transcript)
     total_pause_ms = sum(end_ms - start_ms for start_ms, end_ms in pauses)
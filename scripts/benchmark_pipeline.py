@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark against the local stand-in services (no real API, no network).
+
+Starts scripts/stub_anthropic_server.py in-process, points the orchestrator's sources, Anthropic
+client and DD TTS endpoint at it, runs GitHubAINewsDigest.generate_daily_ai_digest() a few times
+and reports wall time, per-stage external-call time from the call ledger, and the remaining
+pipeline overhead (wall time minus time spent waiting on external calls).
+
+Usage:
+    python scripts/benchmark_pipeline.py
+    python scripts/benchmark_pipeline.py --language bella --runs 5 --profile realistic
+    python scripts/benchmark_pipeline.py --transport client     # in-process stub client, no HTTP
+    python scripts/benchmark_pipeline.py --tts-provider edge_tts  # real Edge TTS (needs network)
+
+DD TTS output is transcoded to MP3 with ffmpeg, so ffmpeg must be installed.
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ensure project root is on path for "digest" package
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from digest import instrumentation
+import stub_anthropic_server as stub
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "news"
+
+
+async def run_once(args, server, base_dir: Path) -> dict:
+    """One orchestrator run against the stand-in; returns wall time and ledger records."""
+    from github_ai_news_digest import GitHubAINewsDigest
+
+    os.environ["AUDIONEWS_OUTPUT_BASE"] = str(base_dir)
+    ledger_path_dir = base_dir / "ledger"
+    os.environ[instrumentation.LEDGER_DIR_ENV] = str(ledger_path_dir)
+    generator = GitHubAINewsDigest(
+        language=args.language,
+        tts_provider_override=args.tts_provider,
+        force_regenerate=True,
+    )
+    generator.sources = {name: f"{server.base_url}/news/{_slug(name)}" for name in generator.sources}
+    if args.transport == "client":
+        generator.anthropic_client = stub.StubAnthropicClient(args.profile)
+    t0 = time.perf_counter()
+    result = await generator.generate_daily_ai_digest()
+    wall = time.perf_counter() - t0
+    if not result:
+        raise RuntimeError("Pipeline returned no result")
+    records = instrumentation.load_records(instrumentation.ledger_files(ledger_path_dir))
+    instrumentation.end_run()
+    return {"wall_s": wall, "records": records, "result": result}
+
+
+def summarize(runs: list) -> None:
+    walls = [r["wall_s"] for r in runs]
+    stage_totals = {}
+    for r in runs:
+        for rec in r["records"]:
+            stage_totals.setdefault(rec["stage"], []).append(rec.get("duration_s") or 0.0)
+    external = [sum(rec.get("duration_s") or 0.0 for rec in r["records"]) for r in runs]
+    overhead = [w - e for w, e in zip(walls, external)]
+    n = len(runs)
+    print("\n" + "=" * 60)
+    print(f"📊 PIPELINE BENCHMARK ({n} run{'s' if n != 1 else ''})")
+    print("=" * 60)
+    print(f"Wall time:        mean {statistics.mean(walls):.3f}s  min {min(walls):.3f}s  max {max(walls):.3f}s")
+    for stage, durations in sorted(stage_totals.items()):
+        per_run = sum(durations) / n
+        print(f"  {stage:<14} {per_run:8.3f}s/run  ({len(durations) // n} calls/run)")
+    print(f"External calls:   mean {statistics.mean(external):.3f}s")
+    print(f"Pipeline overhead: mean {statistics.mean(overhead):.3f}s  min {min(overhead):.3f}s")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the digest pipeline against local stand-in services")
+    parser.add_argument("--language", "-l", default="en_GB")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--profile", choices=sorted(stub.PROFILES), default="instant")
+    parser.add_argument(
+        "--transport",
+        choices=["http", "client"],
+        default="http",
+        help="http: anthropic SDK against the stand-in server; client: in-process stub client",
+    )
+    parser.add_argument(
+        "--tts-provider",
+        choices=["dd_tts", "edge_tts", "pocket_tts", "elevenlabs"],
+        default="dd_tts",
+        help="TTS provider (dd_tts uses the stand-in's /tts endpoint)",
+    )
+    parser.add_argument("--keep-output", action="store_true", help="Keep the temp output directories")
+    args = parser.parse_args()
+
+    server = stub.start_server(args.profile)
+    os.environ["ANTHROPIC_API_KEY"] = os.environ.get("ANTHROPIC_API_KEY") or "stub-key"
+    os.environ["ANTHROPIC_BASE_URL"] = server.base_url
+    os.environ["AUDIONEWS_FETCH_DELAY_S"] = "0"
+    if args.tts_provider == "dd_tts":
+        os.environ["DD_TTS_URL"] = server.base_url
+    print(f"🧪 Stand-in services: {server.base_url} (profile: {args.profile}, transport: {args.transport})")
+
+    runs = []
+    try:
+        for i in range(args.runs):
+            print(f"\n▶️  Run {i + 1}/{args.runs}")
+            if args.keep_output:
+                base = Path(tempfile.mkdtemp(prefix="audionews_bench_"))
+                runs.append(await run_once(args, server, base))
+                print(f"   📁 Output kept: {base}")
+            else:
+                with tempfile.TemporaryDirectory(prefix="audionews_bench_") as tmp:
+                    runs.append(await run_once(args, server, Path(tmp)))
+    finally:
+        server.shutdown()
+        server.server_close()
+    summarize(runs)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
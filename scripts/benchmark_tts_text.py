@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+TTS text benchmark and golden snapshots over the archived transcripts (docs/*/news_digest_ai_*.txt).
+
+Times the text stages of the TTS path per language and reports throughput in characters per second:
+    normalize        digest_synthesis._normalize_for_tts (on the transcript with Edge edits reversed)
+    reverse_edits    tts.reverse_edge_tts_edits (on the transcript as saved)
+    pocket_chunks    tts._pocket_tts_chunk_text (120-character requests, word boundaries)
+    eleven_chunks    tts._elevenlabs_chunks (4500-character requests)
+    edge_chunks      tts._edge_text_chunks (1500-character requests, whole sentences)
+    break_generic    segmentation.break_long_sentences with GENERIC_POLICY
+    break_bella      segmentation.break_long_sentences with BELLA_POLICY
+
+Snapshots store a SHA-256 of every stage's output per transcript, so an optimized replacement can be
+checked byte-for-byte against current behaviour (tests/test_tts_golden.py runs the check). Stages
+with a frozen copy of the original implementation (tests/legacy_tts_text.py: normalize and both
+breakers) are snapshotted from that copy, so the fixture pins the original output rather than the
+rewrite's; the other stages are snapshotted from the current code.
+
+With --joined, each language's transcripts are timed as one long text, which shows how a stage scales
+with input length (a stage that re-slices its remaining input slows down per character there).
+
+Usage:
+    python scripts/benchmark_tts_text.py
+    python scripts/benchmark_tts_text.py --language bella --repeat 5
+    python scripts/benchmark_tts_text.py --joined --repeat 1
+    python scripts/benchmark_tts_text.py --check             # compare outputs with the snapshot
+    python scripts/benchmark_tts_text.py --write-snapshot    # after an intended output change
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Ensure project root is on path for "digest" package
+_ROOT = Path(__file__).resolve().parent.parent
+for _path in (_ROOT, _ROOT / "tests"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from digest import tts
+from digest.digest_synthesis import _normalize_for_tts
+from digest.segmentation import BELLA_POLICY, GENERIC_POLICY, break_long_sentences
+from legacy_tts_text import legacy_bella_sentence_breaking, legacy_break_long_sentences, legacy_normalize_for_tts
+
+SNAPSHOT_PATH = _ROOT / "tests" / "fixtures" / "tts_text_golden.json"
+
+
+class Transcript:
+    """One archived transcript: saved text and the same text with Edge TTS edits reversed."""
+
+    def __init__(self, key: str, language: str, text: str):
+        self.key = key
+        self.language = language
+        self.text = text
+        self.plain = tts.reverse_edge_tts_edits(text)
+
+    @classmethod
+    def from_path(cls, path: Path) -> "Transcript":
+        return cls(path.relative_to(_ROOT).as_posix(), path.parent.name, tts.parse_existing_transcript(str(path)))
+
+    @classmethod
+    def joined(cls, items: List["Transcript"]) -> "Transcript":
+        """All of one language's transcripts as a single text."""
+        return cls(f"docs/{items[0].language}/*", items[0].language, "\n\n".join(t.text for t in items))
+
+
+def _as_text(value) -> str:
+    return value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+
+
+# Stage name -> (function of transcript, input used for the character count)
+STAGES: Dict[str, Tuple[Callable[[Transcript], object], Callable[[Transcript], str]]] = {
+    "normalize": (lambda t: _normalize_for_tts(t.plain, t.language), lambda t: t.plain),
+    "reverse_edits": (lambda t: tts.reverse_edge_tts_edits(t.text), lambda t: t.text),
+    "pocket_chunks": (lambda t: tts._pocket_tts_chunk_text(t.plain, 120, t.language), lambda t: t.plain),
+    "eleven_chunks": (lambda t: tts._elevenlabs_chunks(t.plain, 4500, t.language), lambda t: t.plain),
+    "edge_chunks": (lambda t: tts._edge_text_chunks(t.text, 1500, t.language), lambda t: t.text),
+    "break_generic": (lambda t: break_long_sentences(t.plain, GENERIC_POLICY), lambda t: t.plain),
+    "break_bella": (lambda t: break_long_sentences(t.plain, BELLA_POLICY), lambda t: t.plain),
+}
+
+
+# Stage name -> the original implementation, for the snapshot
+BASELINE: Dict[str, Callable[[Transcript], object]] = {
+    "normalize": lambda t: legacy_normalize_for_tts(t.plain, t.language),
+    "break_generic": lambda t: legacy_break_long_sentences(t.plain, max_words=100, comma_break=80, sub_break=50),
+    "break_bella": lambda t: legacy_bella_sentence_breaking(t.plain),
+}
+
+
+def load_corpus(language: Optional[str] = None) -> List[Transcript]:
+    """All archived transcripts (optionally one language), sorted by path."""
+    pattern = f"docs/{language or '*'}/news_digest_ai_*.txt"
+    return [Transcript.from_path(p) for p in sorted(_ROOT.glob(pattern))]
+
+
+def output_hashes(transcript: Transcript, baseline: bool = False) -> Dict[str, str]:
+    """SHA-256 of each stage's output for one transcript (baseline: from the original implementations)."""
+    hashes = {}
+    for name, (fn, _) in STAGES.items():
+        if baseline:
+            fn = BASELINE.get(name, fn)
+        hashes[name] = hashlib.sha256(_as_text(fn(transcript)).encode("utf-8")).hexdigest()
+    return hashes
+
+
+def build_snapshot(corpus: List[Transcript]) -> dict:
+    return {
+        "stages": list(STAGES),
+        "baseline_stages": list(BASELINE),
+        "transcripts": {t.key: output_hashes(t, baseline=True) for t in corpus},
+    }
+
+
+def load_snapshot(path: Path = SNAPSHOT_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_snapshot(corpus: List[Transcript], snapshot: dict) -> Tuple[int, List[str]]:
+    """Return (transcripts checked, 'path: stage' mismatches). Transcripts newer than the snapshot are skipped."""
+    expected = snapshot.get("transcripts", {})
+    checked = 0
+    mismatches = []
+    for t in corpus:
+        want = expected.get(t.key)
+        if want is None:
+            continue
+        checked += 1
+        got = output_hashes(t)
+        mismatches.extend(f"{t.key}: {stage}" for stage, digest in want.items() if got.get(stage) != digest)
+    return checked, mismatches
+
+
+def benchmark(corpus: List[Transcript], repeat: int = 3, joined: bool = False) -> List[dict]:
+    """Best-of-repeat time per language and stage, with characters per second (joined: one text per language)."""
+    by_language: Dict[str, List[Transcript]] = {}
+    for t in corpus:
+        by_language.setdefault(t.language, []).append(t)
+    if joined:
+        by_language = {language: [Transcript.joined(items)] for language, items in by_language.items()}
+    rows = []
+    for language in sorted(by_language):
+        items = by_language[language]
+        for name, (fn, source) in STAGES.items():
+            chars = sum(len(source(t)) for t in items)
+            best = float("inf")
+            for _ in range(max(1, repeat)):
+                t0 = time.perf_counter()
+                for t in items:
+                    fn(t)
+                best = min(best, time.perf_counter() - t0)
+            rows.append({
+                "language": language,
+                "stage": name,
+                "transcripts": len(items),
+                "chars": chars,
+                "seconds": round(best, 4),
+                "chars_per_s": round(chars / best) if best > 0 else None,
+            })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark TTS text stages on the archived transcripts")
+    parser.add_argument("--language", "-l", default=None, help="Only this language directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--joined", action="store_true", help="Time each language's transcripts as one text")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--check", action="store_true", help="Compare outputs with the golden snapshot")
+    parser.add_argument("--write-snapshot", action="store_true", help="Rewrite the golden snapshot from current outputs")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.language)
+    if not corpus:
+        print("No archived transcripts found")
+        sys.exit(1)
+
+    if args.write_snapshot:
+        if args.language:
+            print("--write-snapshot covers the whole corpus; drop --language")
+            sys.exit(1)
+        SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(SNAPSHOT_PATH, "w", encoding="utf-8") as f:
+            json.dump(build_snapshot(corpus), f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"📸 Snapshot written: {SNAPSHOT_PATH} ({len(corpus)} transcripts)")
+        return
+
+    if args.check:
+        checked, mismatches = compare_snapshot(corpus, load_snapshot())
+        for line in mismatches:
+            print(f"   ❌ {line}")
+        print(f"{'✅' if not mismatches else '❌'} {checked} transcripts checked, {len(mismatches)} mismatches")
+        sys.exit(1 if mismatches else 0)
+
+    rows = benchmark(corpus, args.repeat, args.joined)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(f"⏱️  {len(corpus)} transcripts{' (joined per language)' if args.joined else ''}, best of {args.repeat}\n")
+    print(f"{'language':<12}{'stage':<16}{'files':>6}{'chars':>11}{'seconds':>10}{'chars/s':>14}")
+    for r in rows:
+        print(
+            f"{r['language']:<12}{r['stage']:<16}{r['transcripts']:>6}{r['chars']:>11}"
+            f"{r['seconds']:>10.4f}{(r['chars_per_s'] or 0):>14,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
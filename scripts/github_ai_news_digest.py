@@ -23,10 +23,15 @@ from digest.config_loader import (
     LANGUAGE_CONFIGS,
 )
 from digest.models import NewsStory
+from digest.document import SECTION_THEME, DigestDocument, document_path, load_for_transcript
+from digest import episode_meta
 from digest import fetch as fetch_module
 from digest import ai_analysis
 from digest import digest_synthesis
+from digest import hedging
 from digest import tts as tts_module
+from digest import tts_providers
+from digest import instrumentation
 
 try:
     import anthropic
@@ -37,6 +42,10 @@ except ImportError:
     print("❌ ERROR: Anthropic library not installed. Run: pip install anthropic")
 
 
+# Registered by digest.tts (edge_tts, pocket_tts, elevenlabs, dd_tts)
+TTS_PROVIDERS = tuple(tts_providers.names())
+
+
 class GitHubAINewsDigest:
     """Orchestrates fetch -> AI analysis -> digest synthesis -> TTS -> file output."""
 
@@ -52,14 +61,23 @@ class GitHubAINewsDigest:
         self.sources = self.config["sources"]
         self.use_existing_transcript = use_existing_transcript
         self.force_regenerate = force_regenerate
+        # Politeness delay between source fetches (benchmarks against local stand-ins set 0)
+        self.fetch_delay_s = float(os.environ.get("AUDIONEWS_FETCH_DELAY_S", "1") or 0)
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         }
         self.voice_name = self.config["voice"]
         voice_cfg = VOICE_CONFIG.get("voices", {}).get(language, {})
         self.tts_provider = (tts_provider_override or voice_cfg.get("tts_provider") or "edge_tts").lower()
-        if self.tts_provider not in ("edge_tts", "pocket_tts", "elevenlabs", "dd_tts"):
+        if self.tts_provider not in TTS_PROVIDERS:
             self.tts_provider = "edge_tts"
+        # Providers tried in order, hedged when slow (digest/hedging.py); an override pins one provider
+        self.tts_chain = [self.tts_provider]
+        if not tts_provider_override:
+            for provider in voice_cfg.get("tts_chain") or []:
+                provider = provider.lower()
+                if provider in TTS_PROVIDERS and provider not in self.tts_chain:
+                    self.tts_chain.append(provider)
         self.pocket_voice = voice_cfg.get("pocket_voice") or VOICE_CONFIG.get("tts_settings", {}).get("pocket_tts", {}).get("voice") or "alba"
         self.elevenlabs_voice_id = (
             voice_cfg.get("elevenlabs_voice_id")
@@ -78,6 +96,9 @@ class GitHubAINewsDigest:
         print(f"   - ANTHROPIC_AVAILABLE (library): {ANTHROPIC_AVAILABLE}")
         print(f"   - ANTHROPIC_API_KEY (env): {'✅ Present (length: ' + str(len(anthropic_key)) + ')' if anthropic_key else '❌ Missing'}")
         print(f"   - Language: {self.language}")
+        base_url = os.getenv("ANTHROPIC_BASE_URL")
+        if base_url:
+            print(f"   - ANTHROPIC_BASE_URL (env): {base_url}")
         if anthropic_key and ANTHROPIC_AVAILABLE:
             self.anthropic_client = anthropic.Anthropic(api_key=anthropic_key)
             self.ai_enabled = True
@@ -87,11 +108,87 @@ class GitHubAINewsDigest:
             print(msg)
             raise RuntimeError("AI Analysis requires valid ANTHROPIC_API_KEY. Cannot continue without it.")
 
+    def _voice_label(self) -> str:
+        if self.tts_provider == "pocket_tts":
+            return self.pocket_voice
+        if self.tts_provider == "elevenlabs":
+            return self.elevenlabs_voice_id
+        return self.voice_name
+
+    def _provider_text(self, provider: str, document: Optional[DigestDocument], transcript_text: str) -> str:
+        """Digest text as provider should read it: its rendering of the document, else the transcript."""
+        if document is not None:
+            return document.render(provider)
+        # Transcripts saved before digest documents existed: undo Edge edits for other providers
+        if provider in ("pocket_tts", "elevenlabs", "dd_tts"):
+            return tts_module.reverse_edge_tts_edits(transcript_text)
+        return transcript_text
+
+    async def _generate_audio(
+        self, audio_filename: str, document: Optional[DigestDocument], transcript_text: str
+    ) -> dict:
+        """Run the provider chain; self.tts_provider becomes the provider whose audio was kept."""
+        if len(self.tts_chain) > 1:
+            print(f"🔗 TTS chain: {' -> '.join(self.tts_chain)}")
+
+        def synthesize(provider: str, filename: str):
+            return tts_module.generate_audio_digest(
+                self._provider_text(provider, document, transcript_text),
+                filename,
+                tts_provider=provider,
+                voice_name=self.voice_name,
+                language=self.language,
+                voice_config=VOICE_CONFIG,
+                elevenlabs_voice_id=self.elevenlabs_voice_id,
+                pocket_voice=self.pocket_voice,
+                document=document,
+            )
+
+        audio_stats = await hedging.generate_hedged(
+            self.tts_chain, synthesize, audio_filename, VOICE_CONFIG, self.language
+        )
+        self.tts_provider = audio_stats["tts_provider"]
+        return audio_stats
+
+    def _write_episode_meta(
+        self,
+        audio_filename: str,
+        text_filename: str,
+        audio_stats: dict,
+        document: Optional[DigestDocument],
+        story_count: Optional[int],
+        timings: dict,
+    ) -> None:
+        """Sidecar next to the MP3 for the RSS and website scripts (digest/episode_meta.py)."""
+        themes = [s.title for s in document.sections if s.kind == SECTION_THEME and s.title] if document else []
+        try:
+            meta = episode_meta.write_for_episode(
+                audio_filename,
+                text_filename,
+                self.language,
+                audio_stats,
+                tts_provider=self.tts_provider,
+                voice=self._voice_label(),
+                tts_attempts=audio_stats.get("tts_attempts"),
+                themes=themes,
+                story_count=story_count,
+                timings_s=timings,
+                episode_date=date.today().isoformat(),
+            )
+            print(f"🗂️ Episode metadata: {episode_meta.meta_path(audio_filename)} ({meta.duration_s:.1f}s, {meta.theme_count} themes)")
+        except OSError as e:
+            print(f"   ⚠️ Could not write episode metadata: {e}")
+
     async def generate_daily_ai_digest(self) -> Optional[dict]:
         """Main entry: generate or reuse today's digest and audio."""
         print("🤖 GITHUB AI-ENHANCED NEWS DIGEST")
         print("🎯 Intelligent analysis for visually impaired users")
         print("=" * 60)
+        run_start = time.perf_counter()
+        timings = {}
+        ledger = instrumentation.start_run(self.language)
+        if ledger.enabled:
+            print(f"📒 Call ledger: {ledger.path}")
         today_str = date.today().strftime("%Y_%m_%d")
         base = os.environ.get("AUDIONEWS_OUTPUT_BASE", "").strip()
         if base:
@@ -110,20 +207,26 @@ class GitHubAINewsDigest:
                     "Generate a full digest first (with ANTHROPIC_API_KEY) or use an existing transcript file."
                 )
             print(f"\n📄 Using existing transcript (no API): {text_filename}")
-            digest_text = tts_module.parse_existing_transcript(text_filename)
-            if self.tts_provider in ("pocket_tts", "elevenlabs", "dd_tts"):
-                digest_text = tts_module.reverse_edge_tts_edits(digest_text)
-                print(f"   📝 Using unedited text for {self.tts_provider} (Edge TTS edits reversed)")
+            doc_filename = document_path(text_filename)
+            transcript_text = tts_module.parse_existing_transcript(text_filename)
+            document = load_for_transcript(text_filename, transcript_text)
+            if document is not None:
+                print(f"   📝 Rendering provider text from {doc_filename}")
+            else:
+                if os.path.exists(doc_filename):
+                    print(f"   ⚠️ Transcript edited since {doc_filename} was saved; voicing the transcript instead")
+                if self.tts_provider in ("pocket_tts", "elevenlabs", "dd_tts"):
+                    print(f"   📝 Using unedited text for {self.tts_provider} (Edge TTS edits reversed)")
             os.makedirs(os.path.dirname(audio_filename), exist_ok=True)
-            audio_stats = await tts_module.generate_audio_digest(
-                digest_text,
-                audio_filename,
-                tts_provider=self.tts_provider,
-                voice_name=self.voice_name,
-                language=self.language,
-                voice_config=VOICE_CONFIG,
-                elevenlabs_voice_id=self.elevenlabs_voice_id,
-                pocket_voice=self.pocket_voice,
+            phase_start = time.perf_counter()
+            audio_stats = await self._generate_audio(audio_filename, document, transcript_text)
+            timings["tts"] = time.perf_counter() - phase_start
+            timings["total"] = time.perf_counter() - run_start
+            # Story count is only known at generation time: keep it from an earlier sidecar
+            previous = episode_meta.EpisodeMeta.load(episode_meta.meta_path(audio_filename))
+            self._write_episode_meta(
+                audio_filename, text_filename, audio_stats, document,
+                previous.story_count if previous else None, timings,
             )
             print(f"\n🤖 AUDIO FROM EXISTING TRANSCRIPT")
             print("=" * 35)
@@ -161,31 +264,40 @@ class GitHubAINewsDigest:
                     "size_kb": size_kb,
                 }
 
+        phase_start = time.perf_counter()
         all_stories = []
         for source_name, url in self.sources.items():
             stories = fetch_module.fetch_headlines_from_source(
                 self.language, source_name, url, self.headers
             )
             all_stories.extend(stories)
-            time.sleep(1)
+            if self.fetch_delay_s > 0:
+                time.sleep(self.fetch_delay_s)
         if not all_stories:
             print("❌ No stories found")
             return None
         print(f"\n📊 Total stories collected: {len(all_stories)}")
+        timings["fetch"] = time.perf_counter() - phase_start
 
+        phase_start = time.perf_counter()
         themes = ai_analysis.ai_analyze_stories(
             self.anthropic_client,
             self.language,
             all_stories,
             AI_PROMPTS_CONFIG,
         )
-        digest_text = await digest_synthesis.create_ai_enhanced_digest(
+        timings["analysis"] = time.perf_counter() - phase_start
+        phase_start = time.perf_counter()
+        document = await digest_synthesis.build_digest_document(
             self.anthropic_client,
             self.language,
             self.config,
             themes,
             AI_PROMPTS_CONFIG,
         )
+        timings["synthesis"] = time.perf_counter() - phase_start
+        # The transcript keeps the Edge TTS rendering (as published); audio uses the provider's own
+        transcript_text = document.render("edge_tts")
 
         os.makedirs(os.path.dirname(text_filename), exist_ok=True)
         with open(text_filename, "w", encoding="utf-8") as f:
@@ -195,19 +307,15 @@ class GitHubAINewsDigest:
             f.write(f"AI Analysis: {'ENABLED' if self.ai_enabled else 'DISABLED'}\n")
             f.write("Type: AI-synthesized content for accessibility\n")
             f.write("=" * 40 + "\n\n")
-            f.write(digest_text)
+            f.write(transcript_text)
         print(f"\n📄 AI digest text saved: {text_filename}")
+        document.save(document_path(text_filename))
 
-        audio_stats = await tts_module.generate_audio_digest(
-            digest_text,
-            audio_filename,
-            tts_provider=self.tts_provider,
-            voice_name=self.voice_name,
-            language=self.language,
-            voice_config=VOICE_CONFIG,
-            elevenlabs_voice_id=self.elevenlabs_voice_id,
-            pocket_voice=self.pocket_voice,
-        )
+        phase_start = time.perf_counter()
+        audio_stats = await self._generate_audio(audio_filename, document, transcript_text)
+        timings["tts"] = time.perf_counter() - phase_start
+        timings["total"] = time.perf_counter() - run_start
+        self._write_episode_meta(audio_filename, text_filename, audio_stats, document, len(all_stories), timings)
 
         print(f"\n🤖 AI-ENHANCED DIGEST COMPLETE")
         print("=" * 35)
@@ -239,9 +347,9 @@ async def main() -> None:
     )
     parser.add_argument(
         "--tts-provider",
-        choices=["edge_tts", "pocket_tts", "elevenlabs", "dd_tts"],
+        choices=TTS_PROVIDERS,
         default=None,
-        help="TTS provider override (default: use per-language config)",
+        help="TTS provider override, without the per-language chain (default: use per-language config)",
     )
     parser.add_argument(
         "--use-existing-transcript",
@@ -267,7 +375,7 @@ async def main() -> None:
         use_existing_transcript=args.use_existing_transcript,
         force_regenerate=args.force_regenerate,
     )
-    print(f"🔊 TTS provider: {digest_generator.tts_provider}")
+    print(f"🔊 TTS provider: {' -> '.join(digest_generator.tts_chain)}")
     if digest_generator.force_regenerate:
         print("🔄 Force regenerate: ON (will regenerate even if today's content exists)")
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Call ledger report – aggregate per-run instrumentation ledgers by stage, language and day.
+
+Every digest run writes one JSONL ledger (see digest/instrumentation.py) recording each external
+call: source fetches, Claude analysis/synthesis and TTS requests, with latency, bytes, tokens or
+characters, retries and cost. This script sums them up.
+
+Usage:
+    python scripts/ledger_report.py
+    python scripts/ledger_report.py --by stage,provider
+    python scripts/ledger_report.py --since 2026-10-01 --language en_GB
+    python scripts/ledger_report.py --json
+    python scripts/ledger_report.py path/to/run_*.jsonl
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Ensure project root is on path for "digest" package
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from digest import instrumentation
+
+COLUMNS = [
+    ("calls", "calls"),
+    ("errors", "err"),
+    ("retries", "retry"),
+    ("total_s", "total s"),
+    ("mean_s", "mean s"),
+    ("p95_s", "p95 s"),
+    ("input_tokens", "in tok"),
+    ("output_tokens", "out tok"),
+    ("characters", "chars"),
+    ("bytes_received", "bytes in"),
+    ("cost_usd", "cost $"),
+]
+
+
+def format_table(rows: list, keys: list) -> str:
+    """Render aggregated rows as a fixed-width text table."""
+    headers = list(keys) + [label for _, label in COLUMNS]
+    body = []
+    for row in rows:
+        cells = [str(row.get(k) if row.get(k) is not None else "-") for k in keys]
+        for field, _ in COLUMNS:
+            value = row.get(field)
+            if value is None:
+                cells.append("-")
+            elif field == "cost_usd":
+                cells.append(f"{value:.4f}")
+            else:
+                cells.append(str(value))
+        body.append(cells)
+    widths = [len(h) for h in headers]
+    for cells in body:
+        widths = [max(w, len(c)) for w, c in zip(widths, cells)]
+    lines = ["  ".join(h.ljust(w) for h, w in zip(headers, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    for cells in body:
+        lines.append("  ".join(c.ljust(w) for c, w in zip(cells, widths)))
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Aggregate digest call ledgers by stage, language and day.")
+    parser.add_argument("files", nargs="*", type=Path, help="Ledger files (default: all in the ledger directory)")
+    parser.add_argument("--dir", type=Path, default=None, help="Ledger directory (default: AUDIONEWS_LEDGER_DIR or logs/ledger)")
+    parser.add_argument("--by", default="day,language,stage", help="Comma-separated grouping keys (default: day,language,stage)")
+    parser.add_argument("--since", default=None, help="Only include calls on or after this day (YYYY-MM-DD)")
+    parser.add_argument("--language", "-l", default=None, help="Only include this language")
+    parser.add_argument("--json", action="store_true", help="Print JSON instead of a table")
+    args = parser.parse_args()
+
+    paths = args.files or instrumentation.ledger_files(args.dir)
+    if not paths:
+        print(f"No ledger files found in {args.dir or instrumentation.ledger_dir()}")
+        sys.exit(1)
+    records = instrumentation.load_records(paths)
+    if args.since:
+        records = [r for r in records if (r.get("started_at") or "")[:10] >= args.since]
+    if args.language:
+        records = [r for r in records if r.get("language") == args.language]
+    keys = [k.strip() for k in args.by.split(",") if k.strip()]
+    rows = instrumentation.aggregate(records, keys)
+
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+    print(f"📒 {len(records)} calls from {len(paths)} ledger file(s)\n")
+    if rows:
+        print(format_table(rows, keys))
+        total_cost = sum(r["cost_usd"] for r in rows if r.get("cost_usd") is not None)
+        print(f"\n💰 Total cost: ${total_cost:.4f}")
+
+
+if __name__ == "__main__":
+    main()
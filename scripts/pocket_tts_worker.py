@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Warm Pocket TTS worker – keeps the model and voice states loaded between digest runs.
+
+While it runs, `github_ai_news_digest.py --tts-provider pocket_tts` sends its synthesis jobs here over a
+Unix socket instead of loading the model itself (see digest/pocket_worker.py).
+
+Usage:
+    python scripts/pocket_tts_worker.py                      # preload voices used in voice_config.json
+    python scripts/pocket_tts_worker.py --preload alba,marius
+    python scripts/pocket_tts_worker.py --status
+    python scripts/pocket_tts_worker.py --stop
+Socket: $POCKET_TTS_SOCKET, tts_settings.pocket_tts.worker_socket, or a per-user path in the temp dir.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure project root is on path for "digest" package
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from digest import pocket_worker
+from digest.config_loader import VOICE_CONFIG
+
+
+def configured_voices() -> list:
+    """Pocket voices named in voice_config.json (default voice first)."""
+    voices = [VOICE_CONFIG.get("tts_settings", {}).get("pocket_tts", {}).get("voice") or "alba"]
+    for entry in VOICE_CONFIG.get("voices", {}).values():
+        voice = entry.get("pocket_voice")
+        if voice and voice not in voices:
+            voices.append(voice)
+    return voices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Long-lived Pocket TTS worker (Unix socket)")
+    parser.add_argument("--socket", default=None, help="Socket path (default: see module docstring)")
+    parser.add_argument("--preload", default=None, help="Comma-separated voices to load at start")
+    parser.add_argument("--status", action="store_true", help="Report whether a worker is running")
+    parser.add_argument("--stop", action="store_true", help="Ask a running worker to exit")
+    args = parser.parse_args()
+
+    socket_path = args.socket or pocket_worker.default_socket_path(VOICE_CONFIG)
+
+    if args.status or args.stop:
+        status = pocket_worker.ping(socket_path)
+        if status is None:
+            print(f"⚪ No Pocket TTS worker on {socket_path}")
+            sys.exit(1)
+        if args.stop:
+            pocket_worker.shutdown(socket_path)
+            print(f"🛑 Pocket TTS worker (pid {status['pid']}) stopping")
+        else:
+            print(f"🟢 Pocket TTS worker pid {status['pid']} on {socket_path}: "
+                  f"voices {', '.join(status['voices']) or '-'}, {status['jobs']} jobs")
+        return
+
+    worker = pocket_worker.PocketWorker(socket_path)
+    voices = [v.strip() for v in args.preload.split(",") if v.strip()] if args.preload else configured_voices()
+    t0 = time.perf_counter()
+    print(f"⏳ Loading Pocket TTS model and voices: {', '.join(voices)}")
+    worker.preload(voices, VOICE_CONFIG.get("tts_settings", {}).get("pocket_tts", {}))
+    print(f"✅ Loaded in {time.perf_counter() - t0:.1f}s")
+    print(f"🎧 Pocket TTS worker listening on {socket_path} (Ctrl+C to stop)")
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.server_close()
+        print("👋 Pocket TTS worker stopped")
+
+
+if __name__ == "__main__":
+    main()
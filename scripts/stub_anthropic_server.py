@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Anthropic Messages API (plus news pages and DD TTS) for offline end-to-end runs.
+
+Speaks enough of POST /v1/messages – plain JSON and `stream: true` server-sent events – for the
+anthropic SDK, with configurable latency and token-rate profiles. Responses are deterministic and
+built from the prompt: analysis prompts get a JSON categorisation of the numbered headlines,
+synthesis prompts get a short summary assembled from the "- headline" lines.
+
+It also serves:
+    GET  /news/<slug>    HTML page of headlines so digest.fetch works offline
+    POST /tts            DD TTS job (returns {"name", "style"}; failures can be injected per text) ...
+    GET  /audio/<name>   ... and its silent WAV, sized from the word count
+    POST /v1/text-to-speech/<voice_id>   ElevenLabs-style silent MP3 (ELEVENLABS_BASE_URL=<base url>)
+
+Usage:
+    python scripts/stub_anthropic_server.py --port 8765 --profile realistic
+    ANTHROPIC_API_KEY=stub ANTHROPIC_BASE_URL=http://127.0.0.1:8765 \\
+        python scripts/github_ai_news_digest.py --language en_GB
+
+For in-process runs without HTTP, StubAnthropicClient exposes the same responses through a
+`client.messages.create(...)` interface.
+"""
+
+import argparse
+import io
+import json
+import re
+import threading
+import time
+import uuid
+import wave
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+# Latency profiles: time to first token, output token rate (0 = unlimited) and DD TTS
+# compute seconds per second of audio.
+PROFILES = {
+    "instant": {"latency_s": 0.0, "tokens_per_s": 0, "tts_realtime_factor": 0.0},
+    "fast": {"latency_s": 0.2, "tokens_per_s": 200, "tts_realtime_factor": 0.02},
+    "realistic": {"latency_s": 0.8, "tokens_per_s": 60, "tts_realtime_factor": 0.1},
+    "slow": {"latency_s": 2.5, "tokens_per_s": 20, "tts_realtime_factor": 0.3},
+}
+
+THEME_KEYWORDS = {
+    "politics": ["government", "minister", "parliament", "election", "policy", "mp", "labour", "vote"],
+    "economy": ["economy", "inflation", "bank", "interest", "market", "business", "prices", "budget"],
+    "health": ["health", "nhs", "hospital", "doctor", "patients", "vaccine"],
+    "international": ["ukraine", "russia", "china", "europe", "war", "summit", "talks"],
+    "climate": ["climate", "flood", "energy", "carbon", "storm", "wind"],
+    "technology": ["technology", "ai", "digital", "cyber", "app", "chip"],
+}
+FALLBACK_THEMES = ["politics", "economy", "international"]
+
+HEADLINES = [
+    "Government unveils plan to cut hospital waiting lists by spring",
+    "Bank of England holds interest rates as inflation edges lower",
+    "Ministers face vote on new housing policy in parliament this week",
+    "Ukraine and Europe leaders meet for fresh round of peace talks",
+    "Storm brings flood warnings to coastal towns across the south west",
+    "Tech firms pledge new safeguards for AI tools used in schools",
+    "Energy prices expected to fall as wholesale market steadies",
+    "NHS trusts report record demand at emergency departments",
+    "Chancellor signals budget changes to support small business",
+    "Police launch investigation after cyber attack on local council",
+    "Election campaign enters final week with polls narrowing",
+    "China trade figures raise concerns for global economy outlook",
+    "Wind farm approval marks milestone for carbon reduction targets",
+    "Doctors warn of winter pressure as vaccine uptake stalls",
+    "New digital ID scheme draws criticism from privacy campaigners",
+    "Retail sales rebound as shoppers return to high streets",
+    "Russia sanctions tightened after summit of European ministers",
+    "Rail strike talks resume as unions weigh latest pay offer",
+    "Scientists report record ocean temperatures for third year",
+    "Start-up chip maker secures major investment from global funds",
+    "Councils warn of funding gap in social care next year",
+    "Housing market cools as mortgage approvals drop again",
+    "Patients in rural areas face longer journeys for hospital care",
+    "Parliament debates new rules on online safety for children",
+]
+
+
+def profile_settings(name: str, **overrides) -> dict:
+    """Return a copy of a named profile with any non-None overrides applied."""
+    if name not in PROFILES:
+        raise ValueError(f"Unknown profile '{name}' (choose from {', '.join(PROFILES)})")
+    settings = dict(PROFILES[name])
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+    return settings
+
+
+def count_tokens(text: str) -> int:
+    """Rough token estimate (4 characters per token), never zero."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def _prompt_text(body: dict) -> str:
+    parts = []
+    system = body.get("system")
+    if isinstance(system, str):
+        parts.append(system)
+    for message in body.get("messages") or []:
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(b.get("text", "") for b in content if isinstance(b, dict))
+    return "\n".join(parts)
+
+
+def _theme_for(title: str, index: int) -> str:
+    lowered = title.lower()
+    for theme, keywords in THEME_KEYWORDS.items():
+        if any(re.search(rf"\b{re.escape(k)}\b", lowered) for k in keywords):
+            return theme
+    return FALLBACK_THEMES[index % len(FALLBACK_THEMES)]
+
+
+def analysis_reply(numbered: List[Tuple[int, str]]) -> str:
+    """Deterministic categorisation JSON in the shape ai_analysis.ai_analyze_stories expects."""
+    themes: Dict[str, list] = {}
+    for index, title in numbered:
+        theme = _theme_for(title, index)
+        bucket = themes.setdefault(theme, [])
+        if len(bucket) < 3:
+            bucket.append({"index": index, "significance": 10 - (index % 7)})
+    return json.dumps(themes)
+
+
+def synthesis_reply(prompt: str, headlines: List[str]) -> str:
+    """Deterministic summary text built from the prompt's headlines."""
+    m = re.search(r"\babout ([\w\-]+)", prompt)
+    theme = m.group(1) if m else "today's"
+    sentences = []
+    for h in headlines[:3]:
+        h = h.strip().rstrip(".")
+        if h:
+            sentences.append(h[0].lower() + h[1:])
+    if not sentences:
+        return f"In {theme} news, there were no major developments today."
+    text = f"In {theme} news, {sentences[0]}."
+    for s in sentences[1:]:
+        text += f" Meanwhile, {s}."
+    return text
+
+
+def reply_for(body: dict) -> str:
+    """Build the assistant text for a Messages API request body."""
+    prompt = _prompt_text(body)
+    numbered = [
+        (int(n), title)
+        for n, title in re.findall(r"^\s*(\d+)\. (.+?) \(Source: [^)]*\)\s*$", prompt, re.MULTILINE)
+    ]
+    if numbered:
+        return analysis_reply(numbered)
+    # Headlines are the first block of "- " lines; the requirements list follows later
+    m = re.search(r"^(?:- .+\n?)+", prompt, re.MULTILINE)
+    headlines = [line[2:] for line in m.group(0).splitlines()] if m else []
+    return synthesis_reply(prompt, headlines)
+
+
+def message_payload(body: dict, text: str) -> dict:
+    return {
+        "id": f"msg_stub_{uuid.uuid4().hex[:16]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "stub-model"),
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {
+            "input_tokens": count_tokens(_prompt_text(body)),
+            "output_tokens": count_tokens(text),
+        },
+    }
+
+
+def _text_pieces(text: str, size: int = 16) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+def headlines_page(slug: str, count: int = 12) -> str:
+    """HTML page with `count` headlines, rotated per source so sources differ."""
+    offset = zlib.crc32(slug.encode("utf-8")) % len(HEADLINES)
+    items = []
+    for i in range(count):
+        title = HEADLINES[(offset + i) % len(HEADLINES)]
+        items.append(f'<article><h2><a href="/story/{slug}/{i}">{title}</a></h2></article>')
+    return "<html><body>" + "\n".join(items) + "</body></html>"
+
+
+def silent_wav(seconds: float, sample_rate: int = 24000) -> bytes:
+    """Mono 16-bit PCM WAV of silence."""
+    frames = max(1, int(seconds * sample_rate))
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(b"\x00\x00" * frames)
+    return buf.getvalue()
+
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, mono (ElevenLabs mp3_44100_128); all-zero side info decodes to silence.
+_SILENT_MP3_FRAME = b"\xff\xfb\x90\xc4" + b"\x00" * 413
+
+
+def silent_mp3(seconds: float) -> bytes:
+    """Silent MP3 (with an empty ID3v2 tag, like a real API response) of about the given length."""
+    frames = max(1, int(seconds * 44100 / 1152))
+    return b"ID3\x04\x00\x00\x00\x00\x00\x00" + _SILENT_MP3_FRAME * frames
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "AudioNewsStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            return json.loads(raw.decode("utf-8") or "{}")
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return {}
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: dict) -> None:
+        self._send(status, json.dumps(data).encode("utf-8"), "application/json")
+
+    def do_GET(self):  # noqa: N802 - http.server naming
+        if self.path.startswith("/news/"):
+            slug = self.path[len("/news/"):].strip("/") or "news"
+            self._send(200, headlines_page(slug).encode("utf-8"), "text/html; charset=utf-8")
+        elif self.path.startswith("/audio/"):
+            name = self.path[len("/audio/"):]
+            seconds = self.server.tts_jobs.get(name)
+            if seconds is None:
+                self._send_json(404, {"error": f"unknown audio {name}"})
+                return
+            self._send(200, silent_wav(seconds), "audio/wav")
+        elif self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        body = self._read_json()
+        if self.path.rstrip("/") == "/v1/messages":
+            self._messages(body)
+        elif self.path.rstrip("/") == "/tts":
+            self._dd_tts(body)
+        elif self.path.startswith("/v1/text-to-speech/"):
+            self._elevenlabs(body)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _dd_tts(self, body: dict) -> None:
+        server = self.server
+        text = body.get("text") or ""
+        with server.lock:
+            server.dd_requests.append(body)
+            statuses = server.fail_texts.get(text)
+            status = statuses.pop(0) if statuses else None
+            server.dd_active += 1
+            server.dd_peak = max(server.dd_peak, server.dd_active)
+        seconds = len(text.split()) / 2.5
+        try:
+            if not status:
+                time.sleep(seconds * server.settings["tts_realtime_factor"])
+        finally:
+            # Done before replying, so a client's next request never overlaps this one here
+            with server.lock:
+                server.dd_active -= 1
+        if status:
+            self._send_json(status, {"detail": "injected failure"})
+            return
+        name = f"{uuid.uuid4().hex[:12]}.wav"
+        server.tts_jobs[name] = seconds
+        self._send_json(200, {"name": name, "style": body.get("style", "neutral")})
+
+    def _elevenlabs(self, body: dict) -> None:
+        server = self.server
+        text = body.get("text") or ""
+        with server.lock:
+            server.elevenlabs_requests.append(body)
+            statuses = server.fail_texts.get(text)
+            status = statuses.pop(0) if statuses else None
+        if status:
+            self._send_json(status, {"detail": "injected failure"})
+            return
+        seconds = len(text.split()) / 2.5
+        time.sleep(seconds * server.settings["tts_realtime_factor"])
+        self._send(200, silent_mp3(seconds), "audio/mpeg")
+
+    def _messages(self, body: dict) -> None:
+        settings = self.server.settings
+        text = reply_for(body)
+        payload = message_payload(body, text)
+        time.sleep(settings["latency_s"])
+        rate = settings["tokens_per_s"]
+        if not body.get("stream"):
+            if rate:
+                time.sleep(payload["usage"]["output_tokens"] / rate)
+            self._send_json(200, payload)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        start = dict(payload, content=[], stop_reason=None)
+        start["usage"] = {"input_tokens": payload["usage"]["input_tokens"], "output_tokens": 1}
+        self._event("message_start", {"type": "message_start", "message": start})
+        self._event("content_block_start", {
+            "type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""},
+        })
+        for piece in _text_pieces(text):
+            if rate:
+                time.sleep(count_tokens(piece) / rate)
+            self._event("content_block_delta", {
+                "type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": piece},
+            })
+        self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self._event("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+            "usage": {"output_tokens": payload["usage"]["output_tokens"]},
+        })
+        self._event("message_stop", {"type": "message_stop"})
+
+    def _event(self, name: str, data: dict) -> None:
+        self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, settings: dict, verbose: bool = False):
+        super().__init__(address, _Handler)
+        self.settings = settings
+        self.verbose = verbose
+        self.tts_jobs: Dict[str, float] = {}
+        # ElevenLabs and DD /tts request bodies in arrival order, and text -> error statuses to answer
+        # first (either service); dd_peak is the most /tts jobs in progress at once
+        self.elevenlabs_requests: List[dict] = []
+        self.dd_requests: List[dict] = []
+        self.fail_texts: Dict[str, List[int]] = {}
+        self.dd_active = 0
+        self.dd_peak = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(
+    profile: str = "instant",
+    host: str = "127.0.0.1",
+    port: int = 0,
+    verbose: bool = False,
+    **overrides,
+) -> StubServer:
+    """Start the stand-in in a background thread; call .shutdown() when done."""
+    server = StubServer((host, port), profile_settings(profile, **overrides), verbose=verbose)
+    thread = threading.Thread(target=server.serve_forever, name="stub-anthropic", daemon=True)
+    thread.start()
+    return server
+
+
+class _StubMessages:
+    def __init__(self, settings: dict):
+        self._settings = settings
+
+    def create(self, **kwargs):
+        text = reply_for(kwargs)
+        payload = message_payload(kwargs, text)
+        delay = self._settings["latency_s"]
+        if self._settings["tokens_per_s"]:
+            delay += payload["usage"]["output_tokens"] / self._settings["tokens_per_s"]
+        time.sleep(delay)
+        return SimpleNamespace(
+            id=payload["id"],
+            model=payload["model"],
+            content=[SimpleNamespace(type="text", text=text)],
+            stop_reason=payload["stop_reason"],
+            usage=SimpleNamespace(**payload["usage"]),
+        )
+
+
+class StubAnthropicClient:
+    """In-process stand-in for anthropic.Anthropic: same replies and timing profile, no HTTP."""
+
+    def __init__(self, profile: str = "instant", **overrides):
+        self.messages = _StubMessages(profile_settings(profile, **overrides))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in Anthropic Messages API / news / DD TTS server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="realistic")
+    parser.add_argument("--latency", type=float, default=None, help="Override time to first token (s)")
+    parser.add_argument("--tokens-per-s", type=float, default=None, help="Override output token rate (0 = unlimited)")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    settings = profile_settings(args.profile, latency_s=args.latency, tokens_per_s=args.tokens_per_s)
+    server = StubServer((args.host, args.port), settings, verbose=args.verbose)
+    print(f"🧪 Stub Anthropic server on {server.base_url} (profile: {args.profile}, {settings})")
+    print(f"   export ANTHROPIC_API_KEY=stub ANTHROPIC_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
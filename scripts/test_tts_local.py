@@ -29,6 +29,11 @@ from pathlib import Path
 from typing import Optional
 import json
 
+# Ensure project root is on path for "digest" package
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
 # Load voice configuration
 def load_config_file(filename: str) -> dict:
     """Load configuration from JSON file"""
@@ -144,27 +149,9 @@ def normalize_text_for_tts(text: str, language: str = 'en_GB') -> str:
 
 def compress_short_silences(mp3_path: Path, min_ms: int = 400, max_ms: int = 1100, target_ms: int = 90) -> None:
     """Shorten only wrong mid-sentence pauses (400-1100ms); leaves brief and long sentence gaps alone."""
-    try:
-        from pydub import AudioSegment
-        from pydub.silence import detect_silence
-    except ImportError:
-        print("   ⚠️ pydub required for --compress-silences")
-        return
-    audio = AudioSegment.from_mp3(str(mp3_path))
-    thresh = (audio.dBFS - 35) if audio.dBFS else -35
-    silences = detect_silence(audio, min_silence_len=60, silence_thresh=thresh, seek_step=10)
-    out = AudioSegment.empty()
-    last_end = 0
-    for start_ms, end_ms in silences:
-        duration = end_ms - start_ms
-        out += audio[last_end:start_ms]
-        if min_ms <= duration <= max_ms:
-            out += AudioSegment.silent(duration=target_ms)
-        else:
-            out += audio[start_ms:end_ms]
-        last_end = end_ms
-    out += audio[last_end:]
-    out.export(str(mp3_path), format="mp3", bitrate="192k")
+    from digest.audio import compress_short_silences_file
+
+    compress_short_silences_file(str(mp3_path), min_ms=min_ms, max_ms=max_ms, target_ms=target_ms)
 
 
 async def generate_audio(text: str, voice_name: str, output_path: Path, rate: str = "+0%"):
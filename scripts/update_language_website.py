@@ -8,9 +8,19 @@ import os
 import re
 import json
 import argparse
+import sys
 from datetime import date
 from pathlib import Path
 
+# Ensure project root is on path for "digest" package
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from digest.mp3 import read_duration
+from digest import episode_meta
+
+
 def format_date_localized(date_obj, language):
     """Format date with localized month names"""
     # Month names by language
@@ -135,13 +145,17 @@ def update_language_page(language='en_GB'):
     with open(text_file, 'r', encoding='utf-8') as f:
         digest_text = f.read()
     
-    # Get audio file stats
-    audio_size = os.path.getsize(audio_file)
+    # Audio stats from the generator's sidecar, else from the file
+    meta = episode_meta.load_for_audio(audio_file)
+    audio_size = meta.size_bytes if meta else os.path.getsize(audio_file)
     audio_size_mb = audio_size / (1024 * 1024)
     
-    # Calculate duration (rough estimate: 1MB ≈ 1 minute for speech)
-    duration_minutes = int(audio_size_mb)
-    duration_seconds = int((audio_size_mb - duration_minutes) * 60)
+    # Duration from the MP3 headers; rough estimate (1MB ≈ 1 minute for speech) if unreadable
+    duration_s = meta.duration_s if meta and meta.duration_s > 0 else read_duration(audio_file)
+    if duration_s is None:
+        duration_s = audio_size_mb * 60
+    duration_minutes = int(duration_s // 60)
+    duration_seconds = int(duration_s % 60)
     duration_formatted = f"{duration_minutes}min {duration_seconds}sec"
     
     # Update title with today's date (localized)
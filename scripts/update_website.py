@@ -1,11 +1,21 @@
 import os
 import re
+import sys
 import json
 from datetime import datetime, date, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional
 import glob
 
+# Ensure project root is on path for "digest" package
+_ROOT = Path(__file__).resolve().parent.parent
+if str(_ROOT) not in sys.path:
+    sys.path.insert(0, str(_ROOT))
+
+from digest.mp3 import read_duration
+from digest import episode_meta
+
+
 def load_latest_digest_data() -> Dict:
     """Load the latest digest data from generated files"""
     today_str = date.today().strftime("%Y_%m_%d")
@@ -38,13 +48,13 @@ def load_latest_digest_data() -> Dict:
     # Load audio stats
     audio_file_path = Path(f"docs/audio/news_digest_ai_{today_str}.mp3")
     duration_s = 0
-    if audio_file_path.exists():
-        try:
-            from pydub import AudioSegment
-            audio = AudioSegment.from_mp3(audio_file_path)
-            duration_s = len(audio) / 1000.0
-        except Exception as e:
-            print(f"   ⚠️ Could not get audio duration with pydub: {e}")
+    meta = episode_meta.load_for_audio(str(audio_file_path)) if audio_file_path.exists() else None
+    if meta and meta.duration_s > 0:
+        duration_s = meta.duration_s
+    elif audio_file_path.exists():
+        duration_s = read_duration(str(audio_file_path))
+        if duration_s is None:
+            print(f"   ⚠️ Could not read audio duration from {audio_file_path}")
             # Fallback estimation
             word_count = len(main_digest_content.split())
             duration_s = word_count / 2.0  # Estimate 2 words per second
@@ -59,7 +69,7 @@ def load_latest_digest_data() -> Dict:
     else:
         duration_formatted = f"{seconds}sec"
 
-    word_count = len(main_digest_content.split())
+    word_count = meta.words if meta and meta.words else len(main_digest_content.split())
 
     return {
         "date_formatted": date.today().strftime("%B %d, %Y"),
@@ -0,0 +1,175 @@
+"""
+Frozen copy of the original TTS text normalizer and sentence breakers.
+
+Reference implementation for the equivalence tests: digest_synthesis must produce byte-identical
+output for the same input. Do not edit.
+"""
+
+import re
+
+def legacy_normalize_for_tts(digest: str, language: str) -> str:
+    """Apply TTS-oriented normalization: dashes, transitions, quotes, sentence breaking, abbreviations, spacing."""
+    digest = re.sub(r"—", ", ", digest)
+    digest = re.sub(r"–", ", ", digest)
+
+    if language == "bella":
+        digest = re.sub(
+            r"\.\s+(Turning to|On the|Meanwhile|For banking|For those|From a|Looking at|Here's|Heres)\b",
+            r"; \1", digest, flags=re.IGNORECASE
+        )
+        digest = re.sub(
+            r"\.\s+(The|This|These|When|Understanding|From a banking|For your)\b",
+            r", \1", digest, flags=re.IGNORECASE
+        )
+    elif language == "en_GB":
+        digest = re.sub(
+            r"\.\s+In (politics|economy|health|international|climate|technology|crime) news\b",
+            r"; in \1 news", digest, flags=re.IGNORECASE
+        )
+        digest = re.sub(r"\.\s+(Meanwhile|Additionally|Furthermore|However)\b", r"; \1", digest, flags=re.IGNORECASE)
+    elif language == "pl_PL":
+        digest = re.sub(
+            r"\.\s+W wiadomościach (polityka|ekonomia|zdrowie|międzynarodowe|klimat|technologia|przestępczość) dzisiaj\b",
+            r"; w wiadomościach \1 dzisiaj", digest, flags=re.IGNORECASE
+        )
+        digest = re.sub(r"\.\s+(Tymczasem|Dodatkowo|Ponadto|Jednakże)\b", r"; \1", digest, flags=re.IGNORECASE)
+
+    digest = re.sub(r'["\']', "", digest)
+
+    if language == "bella":
+        digest = legacy_bella_sentence_breaking(digest)
+        digest = re.sub(r",\s*;\s*", ", ", digest)
+        digest = re.sub(r";\s*\.\s*", ". ", digest)
+        digest = re.sub(r";\s*,\s*", "; ", digest)
+        digest = re.sub(r";\s*;\s*", "; ", digest)
+        digest = re.sub(r"\.\s*;\s*", ". ", digest)
+        digest = re.sub(r"([,;])\s*;\s+", r"\1 ", digest)
+
+    # Non-breaking spaces within sentences (Edge TTS)
+    _delim = re.compile(r"([.!?]+\s+)")
+    parts = _delim.split(digest)
+    for i, part in enumerate(parts):
+        if not re.match(r"^[.!?]+\s*$", (part.strip() or " ")):
+            parts[i] = part.replace(" ", "\u00A0")
+    digest = "".join(parts)
+
+    abbreviations = [
+        (r"\bNATO\b", "N\u00A0A\u00A0T\u00A0O"),
+        (r"\bNHS\b", "N\u00A0H\u00A0S"),
+        (r"\bBBC\b", "B\u00A0B\u00A0C"),
+        (r"\bEU\b", "E\u00A0U"),
+        (r"\bUK\b", "U\u00A0K"),
+        (r"\bUS\b", "U\u00A0S"),
+        (r"\bMP\b", "M\u00A0P"),
+        (r"\bMPs\b", "M\u00A0P\u00A0s"),
+        (r"\bCEO\b", "C\u00A0E\u00A0O"),
+        (r"\bGDP\b", "G\u00A0D\u00A0P"),
+    ]
+    for pat, repl in abbreviations:
+        digest = re.sub(pat, repl, digest)
+    digest = re.sub(r"\bUkraines\b", "Ukraine's", digest, flags=re.IGNORECASE)
+    digest = re.sub(r"\bHeres\b", "Here's", digest, flags=re.IGNORECASE)
+
+    if language != "bella":
+        digest = legacy_break_long_sentences(digest, max_words=100, comma_break=80, sub_break=50)
+
+    digest = re.sub(r"[ \t]+", " ", digest)
+    digest = re.sub(r", ,", ",", digest)
+    digest = re.sub(r",,", ",", digest)
+    digest = re.sub(r";\s*,", ";", digest)
+    digest = re.sub(r" ,", ",", digest)
+    digest = re.sub(r"\.([^\s])", r". \1", digest)
+    digest = re.sub(r",([^\s])", r", \1", digest)
+    digest = re.sub(r";([^\s])", r"; \1", digest)
+    return digest
+
+
+def legacy_bella_sentence_breaking(digest: str) -> str:
+    """Break long Bella sentences (over 40 words) at natural points."""
+    sentences = re.split(r"([.!?]+\s+)", digest)
+    new_sentences = []
+    for sentence in sentences:
+        if not sentence.strip() or len(sentence.strip()) <= 2:
+            new_sentences.append(sentence)
+            continue
+        words = sentence.split()
+        if len(words) <= 40:
+            new_sentences.append(sentence)
+            continue
+        parts = re.split(r"([.!?]+\s+)", sentence)
+        for sent_part in parts:
+            if not sent_part.strip():
+                continue
+            sent_words = sent_part.split()
+            if len(sent_words) <= 30:
+                new_sentences.append(sent_part)
+                continue
+            segs = re.split(r"([,;])\s+", sent_part)
+            current = ""
+            for part in segs:
+                if part in (";", ","):
+                    current += part + " "
+                else:
+                    test = current + part
+                    test_words = test.split()
+                    if len(test_words) > 25 and current.strip():
+                        cleaned = current.strip().rstrip(";,. ")
+                        if cleaned and not cleaned.endswith((";", ",")):
+                            new_sentences.append(cleaned + ",")
+                        current = part + " "
+                    else:
+                        current = test + " "
+            if current.strip():
+                cleaned = current.strip().rstrip(";,. ")
+                if cleaned:
+                    new_sentences.append(cleaned)
+    return " ".join(new_sentences)
+
+
+def legacy_break_long_sentences(digest: str, max_words: int = 100, comma_break: int = 80, sub_break: int = 50) -> str:
+    """Break extremely long sentences (e.g. >100 words) at semicolons then commas."""
+    sentences = re.split(r"([.!?]+\s+)", digest)
+    new_sentences = []
+    for sentence in sentences:
+        if not sentence.strip() or len(sentence.strip()) <= 2:
+            new_sentences.append(sentence)
+            continue
+        words = sentence.split()
+        if len(words) <= max_words:
+            new_sentences.append(sentence)
+            continue
+        parts = re.split(r"([;])\s+", sentence)
+        current = ""
+        for part in parts:
+            if part == ";":
+                if current.strip():
+                    new_sentences.append(current.strip() + ";")
+                current = ""
+            else:
+                test = current + part
+                test_words = test.split()
+                if len(test_words) > comma_break:
+                    if current.strip():
+                        new_sentences.append(current.strip() + ",")
+                    sub_parts = re.split(r"([,;])\s+", part)
+                    sub_current = ""
+                    for sub_part in sub_parts:
+                        if sub_part in (",", ";"):
+                            if sub_current.strip():
+                                new_sentences.append(sub_current.strip() + sub_part)
+                            sub_current = ""
+                        else:
+                            sub_test = sub_current + sub_part
+                            if len(sub_test.split()) > sub_break and sub_current.strip():
+                                new_sentences.append(sub_current.strip() + ",")
+                                sub_current = sub_part + " "
+                            else:
+                                sub_current = sub_test + " "
+                    if sub_current.strip():
+                        new_sentences.append(sub_current.strip())
+                    current = ""
+                else:
+                    current = test + " "
+        if current.strip():
+            new_sentences.append(current.strip())
+    return " ".join(new_sentences) if new_sentences else digest
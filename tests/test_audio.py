@@ -0,0 +1,160 @@
+"""
+Tests for the in-memory NumPy audio helpers (crossfade join, normalization, silence detection and
+compression, ffmpeg pipe encode/decode).
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from digest import audio, mp3
+
+try:
+    from pydub import AudioSegment
+    from pydub.silence import detect_silence as pydub_detect_silence
+except ImportError:
+    AudioSegment = None
+
+RATE = 24000
+
+
+def tone(seconds: float, freq: float, amp: float = 0.5) -> np.ndarray:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amp * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+class TestCrossfadeConcat(unittest.TestCase):
+    def test_no_crossfade_is_concatenation(self):
+        chunks = [tone(0.1, 220), tone(0.2, 330), tone(0.05, 440)]
+        np.testing.assert_array_equal(audio.crossfade_concat(chunks), np.concatenate(chunks))
+
+    def test_overlap_length_and_blend(self):
+        a = np.ones(100, dtype=np.float32)
+        b = np.zeros(50, dtype=np.float32)
+        out = audio.crossfade_concat([a, b, a], crossfade=10)
+        self.assertEqual(len(out), 100 + 50 + 100 - 20)
+        # a fades out into b: 1, 0.9, ... 0.1
+        np.testing.assert_allclose(out[90:100], np.linspace(1, 0, 10, endpoint=False), atol=1e-6)
+        # b fades into a: 0, 0.1, ... 0.9
+        np.testing.assert_allclose(out[130:140], np.linspace(0, 1, 10, endpoint=False), atol=1e-6)
+
+    def test_overlap_clamped_to_short_chunk(self):
+        out = audio.crossfade_concat([np.ones(100), np.ones(5), np.ones(100)], crossfade=20)
+        self.assertEqual(len(out), 205 - 10)
+
+    def test_empty(self):
+        self.assertEqual(len(audio.crossfade_concat([])), 0)
+
+    @unittest.skipIf(AudioSegment is None, "pydub not installed")
+    def test_matches_pydub_append(self):
+        chunks = [tone(0.3, 220), tone(0.4, 330, 0.3), tone(0.3, 550, 0.6)]
+        crossfade_ms = 50
+
+        def segment(x):
+            pcm = np.round(x * 32767).astype("<i2").tobytes()
+            return AudioSegment(data=pcm, sample_width=2, frame_rate=RATE, channels=1)
+
+        combined = segment(chunks[0])
+        for c in chunks[1:]:
+            combined = combined.append(segment(c), crossfade=crossfade_ms)
+        expected = np.frombuffer(combined.raw_data, dtype="<i2").astype(np.float32) / 32767
+        got = audio.crossfade_concat(chunks, crossfade=RATE * crossfade_ms // 1000)
+        self.assertEqual(len(got), len(expected))
+        self.assertLess(float(np.max(np.abs(got - expected))), 0.01)
+
+
+class TestNormalizeAndEncode(unittest.TestCase):
+    def test_normalize_peak(self):
+        x = tone(0.1, 440, 0.25)
+        audio.normalize_peak(x)
+        self.assertAlmostEqual(float(np.max(np.abs(x))), 10 ** (-0.1 / 20), places=5)
+        silent = np.zeros(10, dtype=np.float32)
+        audio.normalize_peak(silent)
+        self.assertFalse(silent.any())
+
+    @unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+    def test_encode_mp3_through_pipe(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "tone.mp3")
+            audio.encode_mp3(tone(2.0, 440), RATE, out, bitrate="64k")
+            with open(out, "rb") as f:
+                data = f.read()
+        self.assertAlmostEqual(mp3.duration_of(data), 2.0, delta=0.1)
+
+
+def speech_with_pauses(pauses_ms, speech_s: float = 0.5) -> np.ndarray:
+    """Tone bursts separated by silences of the given lengths."""
+    parts = [tone(speech_s, 330)]
+    for ms in pauses_ms:
+        parts += [np.zeros(RATE * ms // 1000, dtype=np.float32), tone(speech_s, 330)]
+    return np.concatenate(parts)
+
+
+class TestSilence(unittest.TestCase):
+    def test_dbfs(self):
+        self.assertAlmostEqual(audio.dbfs(np.full(100, 0.5, dtype=np.float32)), 20 * np.log10(0.5), places=5)
+        self.assertEqual(audio.dbfs(np.zeros(10, dtype=np.float32)), float("-inf"))
+
+    def test_detect_silence_ranges(self):
+        x = speech_with_pauses([200, 800])
+        ranges = audio.detect_silence(x, RATE, min_silence_len=60, silence_thresh=-50, seek_step=10)
+        self.assertEqual(len(ranges), 2)
+        (a0, b0), (a1, b1) = ranges
+        self.assertAlmostEqual(b0 - a0, 200, delta=20)
+        self.assertAlmostEqual(a0, 500, delta=20)
+        self.assertAlmostEqual(b1 - a1, 800, delta=20)
+
+    def test_detect_silence_shorter_than_window(self):
+        self.assertEqual(audio.detect_silence(np.zeros(100, dtype=np.float32), RATE, min_silence_len=60), [])
+
+    @unittest.skipIf(AudioSegment is None, "pydub not installed")
+    def test_matches_pydub_detect_silence(self):
+        rng = np.random.default_rng(7)
+        parts = []
+        for _ in range(20):
+            parts.append(rng.uniform(-0.5, 0.5, int(RATE * rng.uniform(0.1, 0.8))).astype(np.float32))
+            parts.append(np.zeros(int(RATE * rng.uniform(0.02, 1.2)), dtype=np.float32))
+        x = np.concatenate(parts)
+        pcm = np.round(x * 32767).astype("<i2").tobytes()
+        segment = AudioSegment(data=pcm, sample_width=2, frame_rate=RATE, channels=1)
+        thresh = segment.dBFS - 35
+        expected = [tuple(r) for r in pydub_detect_silence(segment, min_silence_len=60, silence_thresh=thresh, seek_step=10)]
+        self.assertEqual(audio.detect_silence(x, RATE, 60, thresh, 10), expected)
+
+    def test_compress_only_mid_length_pauses(self):
+        x = speech_with_pauses([200, 800, 1500])
+        silences = audio.detect_silence(x, RATE, min_silence_len=60, silence_thresh=-50, seek_step=10)
+        out = audio.compress_silences(x, RATE, silences, min_ms=400, max_ms=1100, target_ms=90)
+        a, b = silences[1]
+        removed = (b - a - 90) * RATE // 1000
+        self.assertAlmostEqual(len(out), len(x) - removed, delta=2)
+        after = audio.detect_silence(out, RATE, min_silence_len=60, silence_thresh=-50, seek_step=10)
+        self.assertEqual([round((b - a) / 10) * 10 for a, b in after], [200, 90, 1500])
+
+    def test_compress_nothing_to_do(self):
+        x = speech_with_pauses([200])
+        self.assertIs(audio.compress_silences(x, RATE, [(500, 700)], 400, 1100, 90), x)
+
+    @unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+    def test_compress_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pauses.mp3")
+            audio.encode_mp3(speech_with_pauses([700, 700]), RATE, path, bitrate="64k")
+            samples, rate = audio.decode_audio(path)
+            self.assertEqual(rate, RATE)
+            self.assertEqual(audio.compress_short_silences_file(path), 2)
+            with open(path, "rb") as f:
+                duration = mp3.duration_of(f.read())
+        self.assertAlmostEqual(duration, len(samples) / RATE - 2 * 0.61, delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
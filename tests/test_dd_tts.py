@@ -0,0 +1,136 @@
+"""
+Tests for DynamicDevices TTS against the local stand-in server: the streamed single request and the
+chunked mode (section chunks, bounded concurrency, same style/seed, per-chunk retries, paragraph
+pauses, segment cache). No network required; ffmpeg is.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import stub_anthropic_server as stub
+from digest import mp3, tts, tts_providers
+from digest.document import SECTION_CLOSING, SECTION_INTRO, SECTION_THEME, DigestDocument, Section
+
+# Five words each: 2 s of audio per section at the stub's 2.5 words per second
+SECTIONS = [
+    Section.from_text(SECTION_INTRO, "Good morning from the newsroom."),
+    Section.from_text(SECTION_THEME, "Markets rose again this week.", title="Economy"),
+    Section.from_text(SECTION_THEME, "Ministers met late on Tuesday.", title="Politics"),
+    Section.from_text(SECTION_THEME, "Storms battered the western coast.", title="Climate"),
+    Section.from_text(SECTION_CLOSING, "That is all for today."),
+]
+
+
+def _config(**overrides):
+    settings = {
+        "style": "neutral",
+        "seed": 7,
+        "paragraph_pause": 0.5,
+        "max_concurrency": 2,
+        "max_retries": 3,
+        "initial_retry_delay": 0,
+        "chunked": True,
+    }
+    settings.update(overrides)
+    return {"tts_settings": {"dd_tts": settings, "postprocess": {"measure_loudness": False}}}
+
+
+@unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+class TestDDTTS(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = stub.start_server("instant", tts_realtime_factor=0.05)
+        cls._env = {k: os.environ.get(k) for k in ("DD_TTS_URL", "DD_TTS_TOKEN", "AUDIONEWS_LEDGER_DISABLED")}
+        os.environ["DD_TTS_URL"] = cls.server.base_url
+        os.environ.pop("DD_TTS_TOKEN", None)
+        os.environ["AUDIONEWS_LEDGER_DISABLED"] = "1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        for key, value in cls._env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    def setUp(self):
+        # Jobs a failed test's cancelled requests left running on the server must not count here
+        deadline = time.monotonic() + 5
+        while self.server.dd_active and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.server.dd_requests.clear()
+        self.server.fail_texts.clear()
+        self.server.dd_peak = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, "out.mp3")
+        self.document = DigestDocument("en_GB", list(SECTIONS))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, config, document=None):
+        text = " ".join(s.text for s in SECTIONS)
+        job = tts_providers.TTSJob(text, self.out, "", "en_GB", config, document=document)
+        return asyncio.run(tts.DD_TTS.synthesize(job))
+
+    def _duration(self):
+        return mp3.read_info(self.out).duration_s
+
+    def test_single_request_streamed(self):
+        stats = self._run(_config(chunked=False), self.document)
+        self.assertEqual(len(self.server.dd_requests), 1)
+        self.assertAlmostEqual(stats["duration_s"], 10.0, delta=0.1)
+        self.assertAlmostEqual(self._duration(), 10.0, delta=0.1)
+
+    def test_sections_concurrent_with_pauses_and_retry(self):
+        self.server.fail_texts[SECTIONS[2].text] = [503]
+        stats = self._run(_config(), self.document)
+        requests = self.server.dd_requests
+        self.assertEqual(len(requests), len(SECTIONS) + 1)
+        self.assertEqual(sum(r["text"] == SECTIONS[2].text for r in requests), 2)
+        self.assertEqual({(r["style"], r["seed"], r["paragraph_pause"]) for r in requests}, {("neutral", 7, 0.5)})
+        self.assertEqual(self.server.dd_peak, 2)
+        expected = 5 * 2.0 + 4 * 0.5
+        self.assertAlmostEqual(stats["duration_s"], expected, delta=0.1)
+        self.assertAlmostEqual(self._duration(), expected, delta=0.1)
+
+    def test_without_document_sentences_are_packed(self):
+        self._run(_config(chunk_chars=70))
+        self.assertEqual(
+            sorted(r["text"] for r in self.server.dd_requests),
+            # Three requests either way; balanced, the short last sentence joins the fourth
+            sorted([f"{SECTIONS[0].text} {SECTIONS[1].text}", SECTIONS[2].text, f"{SECTIONS[3].text} {SECTIONS[4].text}"]),
+        )
+
+    def test_client_errors_are_not_retried(self):
+        self.server.fail_texts[SECTIONS[1].text] = [400]
+        with self.assertRaises(Exception):
+            self._run(_config(), self.document)
+        self.assertEqual(sum(r["text"] == SECTIONS[1].text for r in self.server.dd_requests), 1)
+        self.assertFalse(os.path.exists(self.out))
+
+    def test_cached_sections_not_requested(self):
+        config = _config()
+        config["tts_settings"]["segment_cache"] = {"enabled": True, "dir": os.path.join(self.tmp.name, "cache")}
+        self._run(config, self.document)
+        self.server.dd_requests.clear()
+        self.document.sections[1] = Section.from_text(SECTION_THEME, "Markets fell again this week.", title="Economy")
+        self._run(config, self.document)
+        self.assertEqual([r["text"] for r in self.server.dd_requests], ["Markets fell again this week."])
+        self.assertAlmostEqual(self._duration(), 12.0, delta=0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
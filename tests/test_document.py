@@ -0,0 +1,124 @@
+"""
+Tests for the provider-neutral digest document and its renderers. No network required.
+"""
+import asyncio
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests", ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from digest import digest_synthesis
+from digest.config_loader import AI_PROMPTS_CONFIG, LANGUAGE_CONFIGS
+from digest.document import (
+    SECTION_CLOSING,
+    SECTION_INTRO,
+    SECTION_THEME,
+    DigestDocument,
+    Section,
+    document_path,
+    load_for_transcript,
+    split_sentences,
+)
+from digest.models import NewsStory
+from legacy_tts_text import legacy_normalize_for_tts
+
+
+def _document(language="en_GB"):
+    return DigestDocument(
+        language,
+        [
+            Section.from_text(SECTION_INTRO, "Good morning. Here's your UK news digest for today."),
+            Section.from_text(
+                SECTION_THEME,
+                "The NHS faces strain — doctors warn of delays. Meanwhile MPs debate the budget.",
+                title="health",
+            ),
+            Section.from_text(SECTION_CLOSING, "For complete coverage, visit news websites directly."),
+        ],
+        date="2026-10-18",
+    )
+
+
+class TestDigestDocument(unittest.TestCase):
+    """Sections of sentences, rendered per provider."""
+
+    def test_split_sentences_is_lossless(self):
+        text = "One. Two! Three? Four... five.  Six"
+        self.assertEqual(" ".join(split_sentences(text)), text)
+        self.assertEqual(split_sentences("  "), [])
+
+    def test_edge_render_matches_original_normalizer(self):
+        doc = _document()
+        self.assertEqual(doc.render("edge_tts"), legacy_normalize_for_tts(doc.raw_text(), "en_GB"))
+        self.assertIn("N H S", doc.render("edge_tts"))
+
+    def test_plain_render_has_no_edge_edits(self):
+        doc = _document()
+        for provider in ("dd_tts", "elevenlabs", "pocket_tts"):
+            text = doc.render(provider)
+            self.assertNotIn("\u00A0", text)
+            self.assertIn("The NHS faces strain", text)
+            self.assertIn("MPs debate", text)
+            self.assertIn("; Meanwhile", text)
+
+    def test_renders_are_cached(self):
+        doc = _document()
+        self.assertIs(doc.render("dd_tts"), doc.render("dd_tts"))
+
+    def test_save_load_roundtrip(self):
+        doc = _document("bella")
+        with tempfile.TemporaryDirectory() as tmp:
+            transcript = Path(tmp) / "news_digest_ai_2026_10_18.txt"
+            path = document_path(str(transcript))
+            self.assertTrue(path.endswith("news_digest_ai_2026_10_18.digest.json"))
+            doc.save(path)
+            loaded = DigestDocument.load(path)
+        self.assertEqual(loaded.language, "bella")
+        self.assertEqual([s.kind for s in loaded.sections], [SECTION_INTRO, SECTION_THEME, SECTION_CLOSING])
+        self.assertEqual(loaded.sections[1].title, "health")
+        self.assertEqual(loaded.render("edge_tts"), doc.render("edge_tts"))
+
+    def test_edited_transcript_replaces_document(self):
+        doc = _document()
+        transcript = doc.render("edge_tts")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "news_digest_ai_2026_10_18.txt")
+            self.assertIsNone(load_for_transcript(path, transcript))
+            doc.save(document_path(path))
+            loaded = load_for_transcript(path, transcript + "\n")
+            self.assertEqual([s.kind for s in loaded.sections], [SECTION_INTRO, SECTION_THEME, SECTION_CLOSING])
+            edited = transcript.replace("budget", "spending plans")
+            self.assertNotEqual(edited, transcript)
+            self.assertIsNone(load_for_transcript(path, edited))
+
+
+class TestBuildDigestDocument(unittest.TestCase):
+    """Synthesis builds sections; the Edge render equals the old single-string digest."""
+
+    def test_build_with_stub_client(self):
+        import stub_anthropic_server as stub
+
+        stories = [
+            NewsStory(title="Bank of England holds interest rates", source="BBC News", link=None, timestamp=""),
+            NewsStory(title="Government unveils hospital plan", source="Guardian", link=None, timestamp=""),
+        ]
+        themes = {"economy": stories[:1], "health": stories[1:]}
+        client = stub.StubAnthropicClient("instant")
+        config = LANGUAGE_CONFIGS["en_GB"]
+        doc = asyncio.run(
+            digest_synthesis.build_digest_document(client, "en_GB", config, themes, AI_PROMPTS_CONFIG)
+        )
+        self.assertEqual([s.kind for s in doc.sections], [SECTION_INTRO, SECTION_THEME, SECTION_THEME, SECTION_CLOSING])
+        self.assertEqual([s.title for s in doc.sections[1:3]], ["economy", "health"])
+        # The old implementation concatenated intro, themes and closing into one string.
+        legacy_raw = " ".join(s.text for s in doc.sections)
+        self.assertEqual(doc.render("edge_tts"), legacy_normalize_for_tts(legacy_raw, "en_GB"))
+
+
+if __name__ == "__main__":
+    unittest.main()
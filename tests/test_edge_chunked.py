@@ -0,0 +1,202 @@
+"""
+Tests for chunked Edge TTS: sentence-boundary chunks, bounded concurrency, per-chunk retries, the
+frame-level join and the shared IPv4 connector with cached DNS. edge_tts.Communicate is replaced by
+an in-memory stand-in; no network required.
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import aiohttp
+
+from digest import mp3, tts, tts_providers
+from test_mp3 import edge_mp3, id3v2
+
+SETTINGS = {
+    "max_retries": 3,
+    "initial_retry_delay": 0,
+    "retry_backoff_multiplier": 1,
+    "force_ipv4": False,
+    "chunked": True,
+    "chunk_chars": 40,
+    "max_concurrency": 2,
+    "compress_silences": False,
+}
+
+
+class FakeCommunicate:
+    """Returns one frame per word; each frame is filled with the chunk's first letter."""
+
+    calls = []
+    connectors = []
+    getaddrinfo_seen = []
+    active = 0
+    peak = 0
+    fail_once = set()
+
+    def __init__(self, text, voice, rate="+0%", connector=None):
+        self.text = text
+        FakeCommunicate.connectors.append(connector)
+        self.texts = iter([text.encode("utf-8")])
+
+    async def stream(self):
+        cls = FakeCommunicate
+        cls.calls.append(self.text)
+        cls.getaddrinfo_seen.append(socket.getaddrinfo)
+        cls.active += 1
+        cls.peak = max(cls.peak, cls.active)
+        try:
+            await asyncio.sleep(0.01)
+            if self.text in cls.fail_once:
+                cls.fail_once.discard(self.text)
+                raise ConnectionError("Cannot connect to host")
+            body = b" ".join(self.texts).decode("utf-8")
+            yield {"type": "audio", "data": id3v2() + edge_mp3(len(body.split()), fill=ord(body[0]))}
+        finally:
+            cls.active -= 1
+
+
+class TestEdgeTextChunks(unittest.TestCase):
+    def test_sentences_packed_whole(self):
+        nb = " "
+        text = f"One{nb}two{nb}three. Four{nb}five. Six{nb}seven{nb}eight{nb}nine{nb}ten{nb}eleven. Twelve!"
+        chunks = tts._edge_text_chunks(text, max_chars=25)
+        self.assertEqual(" ".join(chunks), text)
+        self.assertTrue(all(c.endswith((".", "!")) for c in chunks))
+        self.assertEqual(chunks[0], f"One{nb}two{nb}three. Four{nb}five.")
+
+
+class TestChunkedSynthesis(unittest.TestCase):
+    def setUp(self):
+        self._communicate = tts.edge_tts.Communicate
+        tts.edge_tts.Communicate = FakeCommunicate
+        FakeCommunicate.calls = []
+        FakeCommunicate.peak = 0
+        self.tmp = tempfile.TemporaryDirectory()
+        os.environ["AUDIONEWS_LEDGER_DISABLED"] = "1"
+
+    def tearDown(self):
+        tts.edge_tts.Communicate = self._communicate
+        self.tmp.cleanup()
+        os.environ.pop("AUDIONEWS_LEDGER_DISABLED", None)
+
+    def test_chunks_joined_in_order_with_one_retry(self):
+        pieces = ["Alpha one.", "Bravo two three.", "Charlie four.", "Delta five six seven.", "Echo."]
+        FakeCommunicate.fail_once = {"Charlie four."}
+        out = os.path.join(self.tmp.name, "out.mp3")
+        job = tts_providers.TTSJob(
+            " ".join(pieces), out, "en-IE-EmilyNeural", "en_GB", {"tts_settings": {"edge_tts": SETTINGS}}
+        )
+        asyncio.run(tts.EDGE_TTS.render(job, pieces, SETTINGS))
+        with open(out, "rb") as f:
+            data = f.read()
+        expected = b"".join(edge_mp3(len(p.split()), fill=ord(p[0])) for p in pieces)
+        self.assertEqual(mp3.audio_frames(data), expected)
+        self.assertEqual(data[13:17], b"Info")
+        self.assertEqual(FakeCommunicate.calls.count("Charlie four."), 2)
+        self.assertEqual(len(FakeCommunicate.calls), len(pieces) + 1)
+        self.assertLessEqual(FakeCommunicate.peak, 2)
+
+    def test_generate_audio_digest_chunked(self):
+        text = "First sentence here. Second sentence follows. Third one ends it."
+        config = {"tts_settings": {"edge_tts": dict(SETTINGS, chunk_chars=30)}}
+        out = os.path.join(self.tmp.name, "digest.mp3")
+        asyncio.run(
+            tts.generate_audio_digest(
+                text, out, tts_provider="edge_tts", voice_name="en-IE-EmilyNeural", language="en_GB", voice_config=config
+            )
+        )
+        self.assertEqual(len(FakeCommunicate.calls), 3)
+        with open(out, "rb") as f:
+            self.assertEqual(len(list(mp3.iter_frames(f.read()))), len(text.split()))
+
+
+class FakeResolver:
+    def __init__(self):
+        self.calls = []
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        self.calls.append((host, port, family))
+        return [{"hostname": host, "host": "192.0.2.1", "port": port, "family": family, "proto": 0, "flags": 0}]
+
+    async def close(self):
+        pass
+
+
+class TestEdgeConnector(unittest.TestCase):
+    def setUp(self):
+        self._communicate = tts.edge_tts.Communicate
+        tts.edge_tts.Communicate = FakeCommunicate
+        FakeCommunicate.calls = []
+        FakeCommunicate.connectors = []
+        FakeCommunicate.getaddrinfo_seen = []
+        FakeCommunicate.fail_once = set()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.environ["AUDIONEWS_LEDGER_DISABLED"] = "1"
+
+    def tearDown(self):
+        tts.edge_tts.Communicate = self._communicate
+        self.tmp.cleanup()
+        os.environ.pop("AUDIONEWS_LEDGER_DISABLED", None)
+
+    def test_chunks_share_one_ipv4_connector(self):
+        text = "First sentence here. Second sentence follows. Third one ends it."
+        config = {"tts_settings": {"edge_tts": dict(SETTINGS, chunk_chars=30, force_ipv4=True)}}
+        original = socket.getaddrinfo
+        out = os.path.join(self.tmp.name, "digest.mp3")
+        asyncio.run(
+            tts.generate_audio_digest(
+                text, out, tts_provider="edge_tts", voice_name="en-IE-EmilyNeural", language="en_GB", voice_config=config
+            )
+        )
+        connectors = FakeCommunicate.connectors
+        self.assertEqual(len(connectors), 3)
+        self.assertEqual(len({id(c) for c in connectors}), 1)
+        self.assertEqual(connectors[0].family, socket.AF_INET)
+        self.assertTrue(connectors[0].closed)
+        # Nothing process-global is patched while requests run
+        self.assertTrue(all(f is original for f in FakeCommunicate.getaddrinfo_seen))
+
+    def test_connector_outlives_edge_tts_sessions(self):
+        async def run():
+            connector = tts._EdgeConnector(family=socket.AF_INET)
+            for _ in range(2):  # edge_tts: one session per text piece, each closing its connector
+                async with aiohttp.ClientSession(connector=connector):
+                    pass
+            self.assertFalse(connector.closed)
+            await connector.aclose()
+            self.assertTrue(connector.closed)
+
+        asyncio.run(run())
+
+    def test_resolver_caches_answers(self):
+        async def run(ttl_s):
+            resolver = tts._CachedResolver(ttl_s)
+            resolver._resolver = fake
+            for _ in range(3):
+                results = await resolver.resolve("speech.platform.bing.com", 443, socket.AF_INET)
+            return results
+
+        tts._dns_cache.clear()
+        fake = FakeResolver()
+        results = asyncio.run(run(300))
+        self.assertEqual(results[0]["host"], "192.0.2.1")
+        self.assertEqual(len(fake.calls), 1)
+        tts._dns_cache.clear()
+        fake.calls = []
+        asyncio.run(run(0))
+        self.assertEqual(len(fake.calls), 3)
+        tts._dns_cache.clear()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for Edge TTS SSML mode: document fragments with explicit breaks and request packing. No network required.
+"""
+import sys
+import unittest
+import xml.dom.minidom
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from edge_tts.communicate import TTSConfig, mkssml
+
+from digest import tts
+from digest.document import SECTION_CLOSING, SECTION_INTRO, SECTION_THEME, DigestDocument, Section
+
+
+def _document(language="en_GB"):
+    return DigestDocument(
+        language,
+        [
+            Section.from_text(SECTION_INTRO, "Good morning. Here's your UK news digest."),
+            Section.from_text(SECTION_THEME, "Profits at M&S rose <sharply>. The NHS faces strain.", title="business"),
+            Section.from_text(SECTION_CLOSING, "That's all for today."),
+        ],
+    )
+
+
+class TestSsmlFragments(unittest.TestCase):
+    def test_breaks_between_sentences_and_sections(self):
+        fragments = _document().ssml_fragments(sentence_break_ms=300, section_break_ms=900)
+        self.assertEqual(len(fragments), 5)
+        self.assertTrue(fragments[0].endswith("<break time='300ms'/>"))
+        self.assertTrue(fragments[1].endswith("<break time='900ms'/>"))
+        self.assertTrue(fragments[3].endswith("<break time='900ms'/>"))
+        self.assertNotIn("<break", fragments[-1])
+
+    def test_text_is_escaped_and_free_of_edge_workarounds(self):
+        fragments = _document().ssml_fragments()
+        self.assertIn("M&amp;S", fragments[2])
+        self.assertIn("&lt;sharply&gt;", fragments[2])
+        self.assertIn("NHS", fragments[3])
+        self.assertFalse(any(" " in f for f in fragments))
+
+    def test_zero_break_omits_tag(self):
+        fragments = _document().ssml_fragments(sentence_break_ms=0, section_break_ms=0)
+        self.assertFalse(any("<break" in f for f in fragments))
+
+
+class TestEdgeSsmlTexts(unittest.TestCase):
+    def test_packs_fragments_within_limit(self):
+        fragments = [f"Sentence number {i} is here.<break time='250ms'/>" for i in range(400)]
+        texts = tts._edge_ssml_texts(fragments, max_bytes=1000)
+        self.assertGreater(len(texts), 1)
+        self.assertTrue(all(len(t) <= 1000 for t in texts))
+        # Splits fall between fragments, so every request ends on a complete break tag
+        self.assertTrue(all(t.endswith(b"/>") for t in texts))
+        self.assertEqual(b" ".join(texts).decode("utf-8"), " ".join(fragments))
+
+    def test_oversized_fragment_is_split(self):
+        texts = tts._edge_ssml_texts(["word " * 500], max_bytes=200)
+        self.assertTrue(all(len(t) <= 200 for t in texts))
+
+    def test_oversized_fragment_keeps_its_break_tag_whole(self):
+        fragments = ["word " * 500 + "end.<break time='250ms'/>", "Next sentence.<break time='800ms'/>"]
+        texts = tts._edge_ssml_texts(fragments, max_bytes=200)
+        self.assertTrue(all(len(t) <= 200 for t in texts))
+        self.assertEqual([t.count(b"<break") for t in texts], [0] * (len(texts) - 1) + [2])
+        self.assertTrue(texts[-1].endswith(b"end.<break time='250ms'/> Next sentence.<break time='800ms'/>"))
+
+    def test_request_is_well_formed_ssml(self):
+        body = tts._edge_ssml_texts(_document().ssml_fragments())[0]
+        ssml = mkssml(TTSConfig("en-IE-EmilyNeural", "+10%", "+0%", "+0Hz", "SentenceBoundary"), body)
+        dom = xml.dom.minidom.parseString(ssml)
+        self.assertEqual(len(dom.getElementsByTagName("break")), 4)
+        prosody = dom.getElementsByTagName("prosody")[0]
+        self.assertEqual(prosody.getAttribute("rate"), "+10%")
+
+
+if __name__ == "__main__":
+    unittest.main()
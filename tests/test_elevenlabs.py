@@ -0,0 +1,119 @@
+"""
+Tests for concurrent ElevenLabs chunk requests against the local stand-in server. No network required.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import stub_anthropic_server as stub
+from digest import instrumentation, mp3, tts, tts_providers
+
+SENTENCES = [f"Sentence {word} has exactly six words." for word in ("one", "two", "three", "four", "five", "six")]
+
+
+def _config(**overrides):
+    settings = {
+        "voice_id": "stub-voice",
+        "chunk_size": 40,
+        "max_concurrency": 3,
+        "max_retries": 3,
+        "initial_retry_delay": 0,
+    }
+    settings.update(overrides)
+    return {"tts_settings": {"elevenlabs": settings}}
+
+
+class TestElevenLabsChunks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = stub.start_server("instant", tts_realtime_factor=0.1)
+        cls._env = {k: os.environ.get(k) for k in ("ELEVENLABS_API_KEY", "ELEVENLABS_BASE_URL", "AUDIONEWS_LEDGER_DISABLED")}
+        os.environ["ELEVENLABS_API_KEY"] = "stub"
+        os.environ["ELEVENLABS_BASE_URL"] = cls.server.base_url
+        os.environ["AUDIONEWS_LEDGER_DISABLED"] = "1"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        for key, value in cls._env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    def setUp(self):
+        self.server.elevenlabs_requests.clear()
+        self.server.fail_texts.clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, "out.mp3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, config, language=None):
+        job = tts_providers.TTSJob(" ".join(SENTENCES), self.out, "", language, config, elevenlabs_voice_id="stub-voice")
+        asyncio.run(tts.ELEVENLABS.synthesize(job))
+        with open(self.out, "rb") as f:
+            return f.read()
+
+    def test_chunking_matches_size(self):
+        chunks = tts._elevenlabs_chunks(" ".join(SENTENCES), 40)
+        self.assertEqual(chunks, SENTENCES)
+
+    def test_ordered_join_with_context_and_retry(self):
+        self.server.fail_texts[SENTENCES[2]] = [503]
+        data = self._run(_config())
+        requests = self.server.elevenlabs_requests
+        self.assertEqual(len(requests), len(SENTENCES) + 1)
+        self.assertEqual(sum(r["text"] == SENTENCES[2] for r in requests), 2)
+        by_text = {r["text"]: r for r in requests}
+        self.assertNotIn("previous_text", by_text[SENTENCES[0]])
+        self.assertEqual(by_text[SENTENCES[0]]["next_text"], SENTENCES[1])
+        self.assertEqual(by_text[SENTENCES[3]]["previous_text"], SENTENCES[2])
+        self.assertNotIn("next_text", by_text[SENTENCES[-1]])
+        expected = sum(len(list(mp3.iter_frames(stub.silent_mp3(len(s.split()) / 2.5)))) for s in SENTENCES)
+        self.assertEqual(len(list(mp3.iter_frames(data))), expected)
+        self.assertEqual(data[21:25], b"Info")
+
+    def test_concurrency_cuts_wall_time(self):
+        t0 = time.perf_counter()
+        self._run(_config(max_concurrency=1))
+        serial = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        self._run(_config(max_concurrency=3))
+        concurrent = time.perf_counter() - t0
+        self.assertLess(concurrent, serial * 0.6)
+
+    def test_client_errors_are_not_retried(self):
+        self.server.fail_texts[SENTENCES[1]] = [401]
+        with self.assertRaises(Exception):
+            self._run(_config(max_concurrency=1))
+        texts = [r["text"] for r in self.server.elevenlabs_requests]
+        self.assertEqual(texts.count(SENTENCES[1]), 1)
+        # The chunks before the failed one were already written: no truncated episode is left
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_ledger_records_carry_the_language(self):
+        path = Path(self.tmp.name) / "ledger.jsonl"
+        instrumentation._active_ledger = instrumentation.Ledger(path, "run")
+        try:
+            self._run(_config(), "pl_PL")
+        finally:
+            instrumentation.end_run()
+        records = instrumentation.load_records([path])
+        self.assertEqual(len(records), len(SENTENCES))
+        self.assertEqual({r["language"] for r in records}, {"pl_PL"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for the per-episode metadata sidecar and the RSS generator reading it before the audio.
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "scripts", ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import generate_podcast_rss
+from digest import episode_meta
+from test_mp3 import edge_mp3
+
+STATS = {"duration": 754.0, "words": 1508, "wps": 2.0, "postprocess": {"integrated_lufs": -16.2}}
+
+
+class TestEpisodeMeta(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.audio_dir = os.path.join(self.tmp.name, "audio")
+        os.makedirs(self.audio_dir)
+        self.audio = os.path.join(self.audio_dir, "news_digest_ai_2026_10_18.mp3")
+        self.transcript = os.path.join(self.tmp.name, "news_digest_ai_2026_10_18.txt")
+        with open(self.audio, "wb") as f:
+            f.write(edge_mp3(100))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, **kwargs):
+        return episode_meta.write_for_episode(self.audio, self.transcript, "en_GB", STATS, **kwargs)
+
+    def test_path_next_to_mp3(self):
+        self.assertEqual(episode_meta.meta_path(self.audio), self.audio[:-4] + ".meta.json")
+
+    def test_written_fields(self):
+        self.write(
+            tts_provider="edge_tts", voice="en-IE-EmilyNeural", themes=["Politics", "Economy"], story_count=42,
+            timings_s={"fetch": 1.23456, "tts": 30.0}, episode_date="2026-10-18",
+            tts_attempts=[{"provider": "dd_tts", "outcome": "cancelled"}, {"provider": "edge_tts", "outcome": "won"}],
+        )
+        with open(episode_meta.meta_path(self.audio), encoding="utf-8") as f:
+            data = json.load(f)
+        with open(self.audio, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self.assertEqual(data["audio_file"], "news_digest_ai_2026_10_18.mp3")
+        self.assertEqual(data["transcript_file"], "news_digest_ai_2026_10_18.txt")
+        self.assertEqual((data["duration_s"], data["words"], data["wps"]), (754.0, 1508, 2.0))
+        self.assertEqual((data["size_bytes"], data["sha256"]), (100 * 144, digest))
+        self.assertEqual((data["theme_count"], data["story_count"]), (2, 42))
+        self.assertEqual(data["timings_s"], {"fetch": 1.235, "tts": 30.0})
+        self.assertEqual(data["loudness_lufs"], -16.2)
+        self.assertEqual(data["date"], "2026-10-18")
+        self.assertEqual([a["provider"] for a in data["tts_attempts"]], ["dd_tts", "edge_tts"])
+
+    def test_load_for_audio(self):
+        written = self.write(themes=["Health"])
+        loaded = episode_meta.load_for_audio(self.audio)
+        self.assertEqual(loaded, written)
+        self.assertIsNotNone(loaded.generated_datetime.tzinfo)
+
+    def test_stale_or_missing_sidecar_is_ignored(self):
+        self.assertIsNone(episode_meta.load_for_audio(self.audio))
+        self.write()
+        with open(self.audio, "ab") as f:
+            f.write(edge_mp3(1))  # MP3 changed after the sidecar was written
+        self.assertIsNone(episode_meta.load_for_audio(self.audio))
+
+    def test_unreadable_or_newer_format(self):
+        path = episode_meta.meta_path(self.audio)
+        with open(path, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(episode_meta.EpisodeMeta.load(path))
+        self.write()
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        data["format_version"] = episode_meta.FORMAT_VERSION + 1
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        self.assertIsNone(episode_meta.EpisodeMeta.load(path))
+
+
+class TestRssUsesSidecar(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp.name, "audio"))
+        self.audio = os.path.join(self.tmp.name, "audio", "news_digest_ai_2026_10_18.mp3")
+        with open(self.audio, "wb") as f:
+            f.write(edge_mp3(2500))  # 60 s of frames
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_duration_from_sidecar(self):
+        episode_meta.write_for_episode(self.audio, self.audio[:-4] + ".txt", "en_GB", STATS)
+        xml = generate_podcast_rss.generate_rss_feed("en_GB", self.tmp.name)
+        self.assertIn("<itunes:duration>12:34</itunes:duration>", xml)
+
+    def test_duration_from_headers_without_sidecar(self):
+        xml = generate_podcast_rss.generate_rss_feed("en_GB", self.tmp.name)
+        self.assertIn("<itunes:duration>01:00</itunes:duration>", xml)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+"""
+Tests for hedged TTS provider chains: latency budgets from the call ledger, a slow provider hedged by
+the next one, first audio within the budget, failover on errors, and cleanup of the losing attempts.
+Providers are stand-in coroutines; no network or ffmpeg required.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from digest import hedging, instrumentation
+
+
+def _record(provider, run_id, ttfb=None, duration=1.0, ok=True, language="en_GB"):
+    return {
+        "stage": "tts", "provider": provider, "run_id": run_id, "language": language,
+        "time_to_first_byte_s": ttfb, "duration_s": duration, "ok": ok,
+    }
+
+
+# Budgets for the chain tests: dd_tts 0.2 s (whole call), edge_tts 0.1 s (p95 x 1, no floor)
+RECORDS = [_record("dd_tts", "a", ttfb=0.15, duration=0.2), _record("edge_tts", "a", ttfb=0.1)]
+CONFIG = {"tts_settings": {"hedging": {"enabled": True, "budget_multiplier": 1, "min_budget_s": 0}}}
+
+
+class FakeProvider:
+    """first_audio_s None: no audio until done. fail: raise instead of finishing."""
+
+    def __init__(self, first_audio_s=None, total_s=0.05, fail=False):
+        self.first_audio_s = first_audio_s
+        self.total_s = total_s
+        self.fail = fail
+        self.started = False
+        self.cancelled = False
+
+
+class TestLatencyBudget(unittest.TestCase):
+    def test_one_sample_per_run(self):
+        records = [
+            _record("dd_tts", "a", ttfb=2.0),
+            _record("dd_tts", "a", ttfb=1.0),  # chunked: the run's first audio is its earliest chunk
+            _record("dd_tts", "b", ttfb=None, duration=30.0),  # nothing streamed: whole call
+            _record("dd_tts", "c", ttfb=0.5, ok=False),
+            _record("dd_tts", "d", ttfb=9.0, language="pl_PL"),
+            _record("edge_tts", "e", ttfb=0.3),
+            dict(_record("dd_tts", "f", ttfb=0.0), detail={"cached": True}),  # segment cache hit
+        ]
+        self.assertEqual(hedging.first_audio_samples(records, "dd_tts", "en_GB"), [1.0, 30.0])
+
+    def test_budget_from_p95(self):
+        records = [_record("edge_tts", str(i), ttfb=float(i + 1)) for i in range(20)]
+        settings = hedging.resolve_settings({})
+        budget, p95 = hedging.latency_budget("edge_tts", settings, "en_GB", records)
+        self.assertEqual(p95, 19.0)
+        self.assertAlmostEqual(budget, 19.0 * 1.5)
+        settings["history_runs"] = 5  # only the last five runs count
+        self.assertEqual(hedging.latency_budget("edge_tts", settings, "en_GB", records)[1], 20.0)
+        self.assertEqual(hedging.latency_budget("pocket_tts", settings, "en_GB", records), (60.0, None))
+        fast = [_record("edge_tts", "a", ttfb=0.5)]
+        self.assertEqual(hedging.latency_budget("edge_tts", hedging.resolve_settings({}), "en_GB", fast), (10.0, 0.5))
+
+    def test_budget_read_from_ledger_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i, (language, ttfb) in enumerate((("en_GB", 4.0), ("en_GB_LON", 40.0))):
+                ledger = instrumentation.Ledger(Path(tmp) / f"run_20261019T0{i}0000Z_{language}_{i}.jsonl", str(i), language)
+                with ledger.track("tts", "edge_tts") as call:
+                    call.time_to_first_byte_s = ttfb
+            env = os.environ.get(instrumentation.LEDGER_DIR_ENV)
+            os.environ[instrumentation.LEDGER_DIR_ENV] = tmp
+            try:
+                _, p95 = hedging.latency_budget("edge_tts", hedging.resolve_settings({}), "en_GB")
+            finally:
+                if env is None:
+                    os.environ.pop(instrumentation.LEDGER_DIR_ENV, None)
+                else:
+                    os.environ[instrumentation.LEDGER_DIR_ENV] = env
+        self.assertEqual(p95, 4.0)
+
+    def test_dd_budget_from_whole_calls(self):
+        # DD's first byte only arrives once the audio is synthesized: time the whole call
+        records = [_record("dd_tts", str(i), ttfb=float(i + 1), duration=float(i + 2)) for i in range(20)]
+        settings = hedging.resolve_settings({})
+        self.assertEqual(hedging.latency_budget("dd_tts", settings, "en_GB", records)[1], 20.0)
+        settings["duration_budget_providers"] = []
+        self.assertEqual(hedging.latency_budget("dd_tts", settings, "en_GB", records)[1], 19.0)
+
+    def test_off_by_default(self):
+        self.assertFalse(hedging.resolve_settings({})["enabled"])
+
+
+class TestGenerateHedged(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmp.name, "news_digest_ai_2026_10_19.mp3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, providers, config=CONFIG):
+        async def synthesize(provider, filename):
+            fake = providers[provider]
+            fake.started = True
+            try:
+                with instrumentation.track("tts", provider) as call:
+                    with open(filename, "wb") as f:
+                        f.write(provider.encode())
+                    if fake.first_audio_s is not None:
+                        await asyncio.sleep(fake.first_audio_s)
+                        call.mark_first_byte()
+                    await asyncio.sleep(fake.total_s - (fake.first_audio_s or 0))
+                    if fake.fail:
+                        raise ConnectionError(f"{provider} down")
+            except asyncio.CancelledError:
+                fake.cancelled = True
+                raise
+            return {"filename": filename, "duration": 1.0}
+
+        return asyncio.run(hedging.generate_hedged(list(providers), synthesize, self.out, config, "en_GB", RECORDS))
+
+    def _files(self):
+        return sorted(os.listdir(self.tmp.name))
+
+    def test_slow_primary_hedged_and_secondary_wins(self):
+        providers = {"dd_tts": FakeProvider(total_s=2.0), "edge_tts": FakeProvider(total_s=0.05)}
+        stats = self._run(providers)
+        self.assertEqual(stats["tts_provider"], "edge_tts")
+        self.assertEqual(stats["filename"], self.out)
+        self.assertTrue(providers["dd_tts"].cancelled)
+        self.assertEqual([a["provider"] for a in stats["tts_attempts"]], ["dd_tts", "edge_tts"])
+        self.assertEqual([a["outcome"] for a in stats["tts_attempts"]], ["cancelled", "won"])
+        self.assertGreaterEqual(stats["tts_attempts"][1]["started_s"], 0.2)
+        self.assertEqual(self._files(), [os.path.basename(self.out)])
+        with open(self.out, "rb") as f:
+            self.assertEqual(f.read(), b"edge_tts")
+
+    def test_no_hedge_after_first_audio(self):
+        providers = {
+            "dd_tts": FakeProvider(first_audio_s=0.05, total_s=0.5),
+            "edge_tts": FakeProvider(),
+        }
+        stats = self._run(providers)
+        self.assertEqual(stats["tts_provider"], "dd_tts")
+        self.assertFalse(providers["edge_tts"].started)
+        self.assertIsNotNone(stats["tts_attempts"][0]["first_audio_s"])
+
+    def test_failover_on_error(self):
+        providers = {
+            "dd_tts": FakeProvider(total_s=0.01, fail=True),
+            "edge_tts": FakeProvider(total_s=2.0, fail=True),
+            "pocket_tts": FakeProvider(total_s=0.01),
+        }
+        stats = self._run(providers)
+        self.assertEqual(stats["tts_provider"], "pocket_tts")
+        self.assertEqual(
+            [a["outcome"] for a in stats["tts_attempts"]], ["failed: ConnectionError", "cancelled", "won"]
+        )
+        self.assertEqual(self._files(), [os.path.basename(self.out)])
+
+    def test_all_failing_raises_last_error(self):
+        providers = {"dd_tts": FakeProvider(fail=True), "edge_tts": FakeProvider(fail=True)}
+        with self.assertRaisesRegex(ConnectionError, "edge_tts down"):
+            self._run(providers)
+        self.assertEqual(self._files(), [])
+
+    def test_disabled_hedging_only_fails_over(self):
+        providers = {"dd_tts": FakeProvider(total_s=0.4), "edge_tts": FakeProvider()}
+        config = {"tts_settings": {"hedging": {"enabled": False}}}
+        stats = self._run(providers, config=config)
+        self.assertEqual(stats["tts_provider"], "dd_tts")
+        self.assertFalse(providers["edge_tts"].started)
+
+    def test_uncancellable_worker_leaves_nothing_behind(self):
+        # Pocket synthesizes in a worker thread, which keeps running after its attempt is cancelled
+        written = []
+
+        def render(filename):
+            time.sleep(0.3)
+            try:
+                with open(filename, "wb") as f:
+                    f.write(b"late")
+            except OSError:
+                return
+            written.append(filename)
+
+        async def synthesize(provider, filename):
+            if provider == "pocket_tts":
+                await asyncio.to_thread(render, filename)
+            else:
+                with open(filename, "wb") as f:
+                    f.write(provider.encode())
+            return {"filename": filename}
+
+        records = [_record("pocket_tts", "a", duration=0.05)]
+        stats = asyncio.run(
+            hedging.generate_hedged(["pocket_tts", "edge_tts"], synthesize, self.out, CONFIG, "en_GB", records)
+        )
+        self.assertEqual(stats["tts_provider"], "edge_tts")
+        time.sleep(0.5)
+        self.assertEqual(written, [])
+        self.assertEqual(self._files(), [os.path.basename(self.out)])
+
+    def test_single_provider_writes_output_directly(self):
+        stats = self._run({"edge_tts": FakeProvider()})
+        self.assertEqual((stats["tts_provider"], stats["tts_attempts"]), ("edge_tts", []))
+        self.assertEqual(self._files(), [os.path.basename(self.out)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for the per-run call ledger. No network required.
+"""
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from digest import instrumentation
+
+
+class TestLedger(unittest.TestCase):
+    """Ledger writes one JSON line per tracked call, including failures."""
+
+    def tearDown(self):
+        instrumentation.end_run()
+
+    def test_track_writes_records(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ledger = instrumentation.start_run("en_GB", directory=Path(tmp))
+            with instrumentation.track("fetch", "BBC News") as call:
+                call.bytes_received = 1234
+            with self.assertRaises(ValueError):
+                with instrumentation.track("tts", "edge_tts", language="pl_PL") as call:
+                    call.retries = 2
+                    raise ValueError("boom")
+            records = instrumentation.load_records([ledger.path])
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["stage"], "fetch")
+        self.assertEqual(records[0]["language"], "en_GB")
+        self.assertEqual(records[0]["bytes_received"], 1234)
+        self.assertTrue(records[0]["ok"])
+        self.assertEqual(records[1]["language"], "pl_PL")
+        self.assertFalse(records[1]["ok"])
+        self.assertIn("boom", records[1]["error"])
+        self.assertEqual(records[1]["retries"], 2)
+        self.assertEqual(records[0]["run_id"], ledger.run_id)
+
+    def test_claude_usage_and_cost(self):
+        call = instrumentation.CallRecord(stage="synthesis", provider="anthropic")
+        response = SimpleNamespace(usage=SimpleNamespace(input_tokens=1000, output_tokens=200))
+        instrumentation.record_claude_usage(
+            call, response, {"input_cost_per_mtok": 3.0, "output_cost_per_mtok": 15.0}
+        )
+        self.assertEqual(call.input_tokens, 1000)
+        self.assertEqual(call.output_tokens, 200)
+        self.assertAlmostEqual(call.cost_usd, 0.006)
+
+
+class TestAggregate(unittest.TestCase):
+    """Aggregation groups by day/language/stage and sums counters."""
+
+    def test_aggregate_by_stage_language_day(self):
+        records = [
+            {"stage": "tts", "language": "en_GB", "started_at": "2026-10-01T05:00:00+00:00", "duration_s": 2.0, "characters": 100, "ok": True},
+            {"stage": "tts", "language": "en_GB", "started_at": "2026-10-01T05:01:00+00:00", "duration_s": 4.0, "characters": 50, "ok": False, "retries": 1},
+            {"stage": "synthesis", "language": "en_GB", "started_at": "2026-10-01T05:00:00+00:00", "duration_s": 1.0, "input_tokens": 10, "cost_usd": 0.5},
+            {"stage": "tts", "language": "pl_PL", "started_at": "2026-10-02T05:00:00+00:00", "duration_s": 3.0},
+        ]
+        rows = instrumentation.aggregate(records)
+        self.assertEqual(len(rows), 3)
+        tts_gb = next(r for r in rows if r["stage"] == "tts" and r["language"] == "en_GB")
+        self.assertEqual(tts_gb["day"], "2026-10-01")
+        self.assertEqual(tts_gb["calls"], 2)
+        self.assertEqual(tts_gb["errors"], 1)
+        self.assertEqual(tts_gb["retries"], 1)
+        self.assertEqual(tts_gb["characters"], 150)
+        self.assertEqual(tts_gb["total_s"], 6.0)
+        self.assertEqual(tts_gb["p95_s"], 4.0)
+        self.assertIsNone(tts_gb["cost_usd"])
+        synth = next(r for r in rows if r["stage"] == "synthesis")
+        self.assertEqual(synth["cost_usd"], 0.5)
+
+    def test_percentile(self):
+        self.assertEqual(instrumentation.percentile([], 95), 0.0)
+        self.assertEqual(instrumentation.percentile([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], 95), 10)
+        self.assertEqual(instrumentation.percentile([1, 2, 3, 4], 50), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+"""
+Tests for MPEG frame parsing, re-encode-free MP3 joining and the header-based metadata reader.
+Frames are built in memory; no ffmpeg needed (except where marked).
+"""
+import os
+import shutil
+import subprocess
+import struct
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from digest import mp3
+
+# MPEG-2 Layer III, 48 kbps, 24 kHz, mono: Edge TTS output format (144-byte frames of 576 samples).
+EDGE_HEADER = b"\xff\xf3\x64\xc4"
+
+
+def edge_frame(fill: int = 0) -> bytes:
+    return EDGE_HEADER + bytes([fill]) * 140
+
+
+def edge_mp3(n: int, fill: int = 0) -> bytes:
+    return edge_frame(fill) * n
+
+
+def id3v2(payload: bytes = b"\x00" * 20) -> bytes:
+    size = len(payload)
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x04\x00\x00" + syncsafe + payload
+
+
+def info_frame() -> bytes:
+    # Mono MPEG-2: side info is 9 bytes, so the tag sits at offset 4 + 9
+    frame = bytearray(edge_frame())
+    frame[13:17] = b"Info"
+    return bytes(frame)
+
+
+class TestFrameHeader(unittest.TestCase):
+    def test_edge_format(self):
+        h = mp3.parse_frame_header(EDGE_HEADER)
+        self.assertEqual((h.version, h.layer, h.bitrate_kbps, h.sample_rate), ("2", 3, 48, 24000))
+        self.assertTrue(h.mono)
+        self.assertEqual(h.frame_length, 144)
+        self.assertEqual(h.samples_per_frame, 576)
+
+    def test_mpeg1_with_padding(self):
+        # MPEG-1 Layer III, 128 kbps, 44.1 kHz, padded, joint stereo
+        h = mp3.parse_frame_header(b"\xff\xfb\x92\x64")
+        self.assertEqual((h.version, h.bitrate_kbps, h.sample_rate), ("1", 128, 44100))
+        self.assertEqual(h.frame_length, 418)
+        self.assertEqual(h.samples_per_frame, 1152)
+
+    def test_invalid_headers(self):
+        for data in (b"", b"\x00\x00\x00\x00", b"\xff\xf3\xf4\xc4", b"\xff\xf3\x6c\xc4", b"\xff\xeb\x64\xc4"):
+            self.assertIsNone(mp3.parse_frame_header(data))
+
+
+class TestJoin(unittest.TestCase):
+    def test_tags_and_info_frame_are_dropped(self):
+        data = id3v2() + info_frame() + edge_mp3(10) + b"TAG" + b"\x00" * 125
+        self.assertEqual(mp3.audio_frames(data), edge_mp3(10))
+        self.assertAlmostEqual(mp3.duration_of(data), 10 * 576 / 24000)
+
+    def test_join_keeps_order_and_frames(self):
+        parts = [id3v2() + edge_mp3(3, fill=1), edge_mp3(2, fill=2), info_frame() + edge_mp3(4, fill=3)]
+        joined = mp3.join_mp3(parts)
+        self.assertEqual(joined, edge_mp3(3, 1) + edge_mp3(2, 2) + edge_mp3(4, 3))
+        self.assertEqual(len(list(mp3.iter_frames(joined))), 9)
+
+    def test_resyncs_past_junk_and_drops_truncated_frame(self):
+        data = b"\x00junk" + edge_mp3(2) + edge_frame()[:50]
+        self.assertEqual(mp3.audio_frames(data), edge_mp3(2))
+
+
+class TestMp3Writer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "joined.mp3")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_cbr_info_header(self):
+        writer = mp3.write_joined_mp3(self.path, [id3v2() + info_frame() + edge_mp3(30), edge_mp3(20)])
+        data = self._read()
+        self.assertEqual(writer.frames, 50)
+        self.assertAlmostEqual(writer.duration_s, 50 * 576 / 24000)
+        self.assertEqual(data[13:17], b"Info")
+        flags, frames, size = struct.unpack(">III", data[17:29])
+        self.assertEqual((flags & 7, frames, size), (7, 50, len(data)))
+        self.assertEqual(len(data), 144 + 50 * 144)
+        # The header frame is skipped when the file is read back
+        self.assertEqual(mp3.audio_frames(data), edge_mp3(50))
+        toc = data[29:129]
+        self.assertEqual(list(toc), sorted(toc))
+
+    def test_vbr_xing_header(self):
+        frame_64k = b"\xff\xf3\x84\xc4" + b"\x00" * 188  # 64 kbps: 192-byte frames
+        mp3.write_joined_mp3(self.path, [edge_mp3(5), frame_64k * 5])
+        data = self._read()
+        self.assertEqual(data[13:17], b"Xing")
+        self.assertEqual(struct.unpack(">I", data[21:25])[0], 10)
+
+    def test_no_frames_is_an_error(self):
+        with self.assertRaises(ValueError):
+            mp3.write_joined_mp3(self.path, [b"not an mp3"])
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_error_mid_write_leaves_no_file(self):
+        with open(self.path, "wb") as f:
+            f.write(b"previous episode")
+        with self.assertRaises(ConnectionResetError):
+            with mp3.Mp3Writer(self.path) as writer:
+                writer.append(edge_mp3(10))
+                raise ConnectionResetError("stream cut")
+        self.assertEqual(os.listdir(self.tmp.name), ["joined.mp3"])
+        self.assertEqual(self._read(), b"previous episode")
+
+    @unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+    def test_joined_encoder_output_decodes(self):
+        parts = []
+        for freq in (440, 660):
+            src = os.path.join(self.tmp.name, f"{freq}.mp3")
+            subprocess.run(
+                ["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", f"sine=f={freq}:d=1",
+                 "-ar", "44100", "-b:a", "128k", src],
+                check=True,
+            )
+            with open(src, "rb") as f:
+                parts.append(f.read())
+        writer = mp3.write_joined_mp3(self.path, parts)
+        self.assertAlmostEqual(writer.duration_s, sum(mp3.duration_of(p) for p in parts))
+        result = subprocess.run(["ffmpeg", "-v", "error", "-i", self.path, "-f", "null", "-"], capture_output=True)
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stderr, b"")
+
+
+FRAME_64K = b"\xff\xf3\x84\xc4" + b"\x00" * 188  # MPEG-2 64 kbps, 24 kHz, mono: 192-byte frames
+
+
+def vbri_frame(frames: int, total_bytes: int) -> bytes:
+    frame = bytearray(edge_frame())
+    frame[36:54] = b"VBRI" + struct.pack(">HHHII", 1, 576, 75, total_bytes, frames)
+    return bytes(frame)
+
+
+class TestReadInfo(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data: bytes, name: str = "a.mp3") -> str:
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_cbr_without_header_from_byte_count(self):
+        info = mp3.read_info(self.write(id3v2() + edge_mp3(500) + b"TAG" + b"\x00" * 125))
+        self.assertEqual(info.source, "cbr")
+        self.assertEqual(info.frames, 500)
+        self.assertAlmostEqual(info.duration_s, 500 * 576 / 24000)
+        self.assertEqual((info.bitrate_kbps, info.sample_rate, info.channels, info.vbr), (48, 24000, 1, False))
+
+    def test_writer_info_header(self):
+        path = os.path.join(self.tmp.name, "joined.mp3")
+        writer = mp3.write_joined_mp3(path, [edge_mp3(30), edge_mp3(20)])
+        info = mp3.read_info(path)
+        self.assertEqual((info.source, info.frames), ("info", 50))
+        self.assertAlmostEqual(info.duration_s, writer.duration_s)
+        self.assertAlmostEqual(info.bitrate_kbps, 48)
+
+    def test_writer_xing_header_vbr(self):
+        path = os.path.join(self.tmp.name, "vbr.mp3")
+        mp3.write_joined_mp3(path, [edge_mp3(5), FRAME_64K * 5])
+        info = mp3.read_info(path)
+        self.assertEqual((info.source, info.frames, info.vbr), ("xing", 10, True))
+        self.assertAlmostEqual(info.bitrate_kbps, 56)
+
+    def test_vbri_header(self):
+        audio = edge_mp3(4) + FRAME_64K * 4
+        info = mp3.read_info(self.write(vbri_frame(8, 144 + len(audio)) + audio))
+        self.assertEqual((info.source, info.frames, info.vbr), ("vbri", 8, True))
+        self.assertAlmostEqual(info.duration_s, 8 * 576 / 24000)
+
+    def test_vbr_without_header_walks_frames(self):
+        info = mp3.read_info(self.write(edge_mp3(3) + FRAME_64K * 2 + edge_mp3(4)))
+        self.assertEqual((info.source, info.frames, info.vbr), ("scan", 9, True))
+        self.assertAlmostEqual(info.duration_s, 9 * 576 / 24000)
+
+    def test_not_mpeg(self):
+        path = self.write(b"version https://git-lfs.github.com/spec/v1\n")
+        self.assertIsNone(mp3.read_info(path))
+        self.assertIsNone(mp3.read_duration(path))
+        self.assertIsNone(mp3.read_duration(os.path.join(self.tmp.name, "missing.mp3")))
+
+    @unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+    def test_encoder_delay_matches_decoded_length(self):
+        for args in (["-b:a", "48k"], ["-q:a", "4"]):
+            path = os.path.join(self.tmp.name, "enc.mp3")
+            subprocess.run(
+                ["ffmpeg", "-v", "error", "-y", "-f", "lavfi", "-i", "sine=f=300:d=3.3", "-ar", "24000", *args, path],
+                check=True,
+            )
+            info = mp3.read_info(path)
+            self.assertGreater(info.encoder_delay, 0)
+            decoded = subprocess.run(
+                ["ffmpeg", "-v", "error", "-i", path, "-f", "s16le", "-ac", "1", "-"], capture_output=True, check=True
+            ).stdout
+            self.assertAlmostEqual(info.duration_s, len(decoded) / 2 / 24000, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
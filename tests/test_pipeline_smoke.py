@@ -50,6 +50,8 @@ class TestPipelineSmoke(unittest.TestCase):
             audio_path = audio_dir / f"news_digest_ai_{today}.mp3"
             self.assertTrue(audio_path.exists(), msg=f"Expected {audio_path} to exist")
             self.assertGreater(audio_path.stat().st_size, 1000, msg="MP3 should be non-trivial")
+            meta_path = audio_dir / f"news_digest_ai_{today}.meta.json"
+            self.assertTrue(meta_path.exists(), msg=f"Expected episode sidecar {meta_path}")
 
 
 if __name__ == "__main__":
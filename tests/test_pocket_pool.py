@@ -0,0 +1,67 @@
+"""
+Tests for the Pocket TTS process pool. A stand-in model (loaded in each spawned worker) returns a
+constant signal per chunk, so torch/pocket_tts are not needed.
+"""
+import os
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from digest.pocket_pool import PocketPool, resolve_workers
+
+
+class FakeModel:
+    sample_rate = 24000
+
+    def generate_audio(self, voice_state, text):
+        # Length and level identify the chunk
+        return np.full(len(text) * 10, float(len(text)) / 100, dtype=np.float32)
+
+
+def fake_loader(voice_id, settings):
+    """Module-level so spawned workers can unpickle it."""
+    return FakeModel(), {"voice": voice_id}
+
+
+class TestResolveWorkers(unittest.TestCase):
+    def test_off_by_default(self):
+        self.assertEqual(resolve_workers({}), (0, 1))
+
+    def test_explicit(self):
+        self.assertEqual(resolve_workers({"parallel_workers": 3, "threads_per_worker": 2}), (3, 2))
+
+    def test_auto_divides_cores_by_threads(self):
+        cores = os.cpu_count() or 1
+        self.assertEqual(resolve_workers({"parallel_workers": "auto", "threads_per_worker": 2}), (cores // 2, 2))
+        self.assertEqual(resolve_workers({"parallel_workers": "auto"}), (cores, 1))
+
+
+class TestPocketPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = PocketPool("alba", {}, workers=2, threads_per_worker=1, loader=fake_loader)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_sample_rate_from_worker_model(self):
+        self.assertEqual(self.pool.sample_rate, 24000)
+
+    def test_results_in_chunk_order(self):
+        chunks = ["a" * n for n in (30, 5, 12, 1, 44, 7)]
+        pieces = self.pool.generate(chunks)
+        self.assertEqual([len(p) for p in pieces], [len(c) * 10 for c in chunks])
+        for chunk, piece in zip(chunks, pieces):
+            self.assertEqual(piece.dtype, np.float32)
+            self.assertAlmostEqual(float(piece[0]), len(chunk) / 100, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Tests for the on-disk Pocket TTS voice-state cache. A stand-in model and exporter keep states as JSON,
+so torch/pocket_tts are not needed.
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from digest.pocket_voice_cache import VoiceStateCache, model_version
+
+
+class FakeModel:
+    """Encodes prompts by counting calls; .safetensors paths are loaded like the real model does."""
+
+    def __init__(self, origin="english.yaml"):
+        self.origin = origin
+        self.has_custom_weights = False
+        self.encoded = []
+
+    def get_state_for_audio_prompt(self, source):
+        if str(source).endswith(".safetensors"):
+            with open(source, "r", encoding="utf-8") as f:
+                return json.load(f)
+        self.encoded.append(source)
+        return {"voice": source, "encoding": len(self.encoded)}
+
+
+def export_json(state, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+class TestVoiceStateCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = VoiceStateCache(os.path.join(self.tmp.name, "voices"), export=export_json)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _files(self):
+        return sorted(p.name for p in self.cache.cache_dir.glob("*.safetensors"))
+
+    def test_second_process_loads_from_disk(self):
+        first = FakeModel()
+        state = self.cache.get_or_create(first, "alba")
+        second = FakeModel()  # a new process: nothing in memory
+        self.assertEqual(self.cache.get_or_create(second, "alba"), state)
+        self.assertEqual(second.encoded, [])
+
+    def test_model_change_invalidates(self):
+        self.cache.get_or_create(FakeModel("english.yaml"), "alba")
+        other = FakeModel("english_v2.yaml")
+        self.assertNotEqual(model_version(other), model_version(FakeModel()))
+        self.cache.get_or_create(other, "alba")
+        self.assertEqual(other.encoded, ["alba"])
+        # The state for the old model is gone, the new one is cached
+        self.assertEqual(len(self._files()), 1)
+        self.assertIsNotNone(self.cache.load(FakeModel("english_v2.yaml"), "alba"))
+
+    def test_prompt_file_change_invalidates(self):
+        prompt = os.path.join(self.tmp.name, "my_voice.wav")
+        with open(prompt, "wb") as f:
+            f.write(b"first recording")
+        model = FakeModel()
+        self.cache.get_or_create(model, prompt)
+        with open(prompt, "wb") as f:
+            f.write(b"second recording")
+        self.assertIsNone(self.cache.load(model, prompt))
+        self.cache.get_or_create(model, prompt)
+        self.assertEqual(len(model.encoded), 2)
+        self.assertEqual(len(self._files()), 1)
+
+    def test_voices_are_kept_apart(self):
+        model = FakeModel()
+        self.cache.get_or_create(model, "alba")
+        self.cache.get_or_create(model, "marius")
+        self.assertEqual(len(self._files()), 2)
+
+    def test_unreadable_entry_is_dropped(self):
+        model = FakeModel()
+        path = self.cache.store(model, "alba", {"voice": "alba"})
+        path.write_text("not json")
+        self.assertIsNone(self.cache.load(model, "alba"))
+        self.assertFalse(path.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
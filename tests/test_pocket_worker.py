@@ -0,0 +1,105 @@
+"""
+Tests for the warm Pocket TTS worker protocol and generate_audio_digest dispatch. The worker is given
+a stand-in synthesize function, so pocket_tts itself is not needed.
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from digest import pocket_worker, tts
+from test_mp3 import edge_mp3
+
+
+class Recorder:
+    """Writes one MPEG frame per word, records each job and reports the duration like post-processing."""
+
+    def __init__(self):
+        self.jobs = []
+        self.languages = []
+
+    def __call__(self, text, output_filename, voice_id, voice_config, language=None):
+        if "boom" in text:
+            raise ValueError("synthesis exploded")
+        self.jobs.append((text, voice_id))
+        self.languages.append(language)
+        with open(output_filename, "wb") as f:
+            f.write(edge_mp3(len(text.split())))
+        return {"duration_s": len(text.split()) * 0.024}
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets not available")
+class TestPocketWorker(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp.name, "pocket.sock")
+        self.recorder = Recorder()
+        self.worker = pocket_worker.start_worker(self.socket_path, self.recorder)
+        self._env = os.environ.get(pocket_worker.SOCKET_ENV)
+        os.environ[pocket_worker.SOCKET_ENV] = self.socket_path
+        os.environ["AUDIONEWS_LEDGER_DISABLED"] = "1"
+
+    def tearDown(self):
+        self.worker.shutdown()
+        self.worker.server_close()
+        if self._env is None:
+            os.environ.pop(pocket_worker.SOCKET_ENV, None)
+        else:
+            os.environ[pocket_worker.SOCKET_ENV] = self._env
+        os.environ.pop("AUDIONEWS_LEDGER_DISABLED", None)
+        self.tmp.cleanup()
+
+    def test_ping_and_synthesize(self):
+        self.assertTrue(pocket_worker.is_running(self.socket_path))
+        out = os.path.join(self.tmp.name, "a.mp3")
+        reply = pocket_worker.synthesize(self.socket_path, "one two three", out, "alba", {})
+        self.assertTrue(reply["ok"])
+        self.assertAlmostEqual(reply["stats"]["duration_s"], 0.072)
+        self.assertEqual(os.path.getsize(out), 3 * 144)
+        status = pocket_worker.ping(self.socket_path)
+        self.assertEqual((status["voices"], status["jobs"]), (["alba"], 1))
+
+    def test_errors_are_reported_and_worker_survives(self):
+        with self.assertRaises(RuntimeError) as ctx:
+            pocket_worker.synthesize(self.socket_path, "boom", os.path.join(self.tmp.name, "x.mp3"), "alba", {})
+        self.assertIn("synthesis exploded", str(ctx.exception))
+        self.assertTrue(pocket_worker.is_running(self.socket_path))
+
+    def test_no_worker(self):
+        self.assertFalse(pocket_worker.is_running(os.path.join(self.tmp.name, "missing.sock")))
+
+    def test_second_worker_refused(self):
+        with self.assertRaises(RuntimeError):
+            pocket_worker.PocketWorker(self.socket_path, self.recorder)
+
+    def test_generate_audio_digest_dispatches_to_worker(self):
+        out = os.path.join(self.tmp.name, "digest.mp3")
+        stats = asyncio.run(
+            tts.generate_audio_digest(
+                "Good morning from the warm worker.",
+                out,
+                tts_provider="pocket_tts",
+                voice_name="en-IE-EmilyNeural",
+                language="en_GB",
+                voice_config={"tts_settings": {"pocket_tts": {"voice": "alba"}}, "voices": {}},
+                pocket_voice="marius",
+            )
+        )
+        self.assertEqual(self.recorder.jobs, [("Good morning from the warm worker.", "marius")])
+        # The job's language reaches the worker so chunking uses its rules
+        self.assertEqual(self.recorder.languages, ["en_GB"])
+        self.assertEqual(stats["filename"], out)
+        # Duration comes back from the worker's post-processing stats, no decode of the file
+        self.assertAlmostEqual(stats["duration"], 6 * 0.024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,203 @@
+"""
+Tests for the single-pass ffmpeg post-processing chain (filter graph, stats from the same run).
+"""
+import asyncio
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from digest import audio, mp3, postprocess
+
+RATE = 24000
+
+LOUDNORM_STDERR = """
+[Parsed_loudnorm_0 @ 0x7f7550002100]
+{
+	"input_i" : "-22.76",
+	"input_tp" : "-18.36",
+	"input_lra" : "0.20",
+	"input_thresh" : "-32.90",
+	"output_i" : "-15.20",
+	"output_tp" : "-10.86",
+	"output_lra" : "0.10",
+	"output_thresh" : "-25.32",
+	"normalization_type" : "dynamic",
+	"target_offset" : "-0.80"
+}
+"""
+
+EBUR128_STDERR = """
+[Parsed_ebur128_0 @ 0x1] Summary:
+
+  Integrated loudness:
+    I:         -22.6 LUFS
+    Threshold: -32.8 LUFS
+
+  Loudness range:
+    LRA:         0.0 LU
+
+  True peak:
+    Peak:      -18.4 dBFS
+"""
+
+
+def speech_with_pauses(pauses_ms):
+    t = np.arange(int(0.5 * RATE)) / RATE
+    burst = (0.3 * np.sin(2 * np.pi * 330 * t)).astype(np.float32)
+    parts = [burst]
+    for ms in pauses_ms:
+        parts += [np.zeros(RATE * ms // 1000, dtype=np.float32), burst]
+    return np.concatenate(parts)
+
+
+def frames_of(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return [h for _, h in mp3.iter_frames(data)], mp3.duration_of(data)
+
+
+class TestFilterGraph(unittest.TestCase):
+    def test_defaults_only_measure(self):
+        settings = postprocess.resolve_settings({})
+        self.assertFalse(postprocess.needs_reencode(settings))
+        self.assertEqual(postprocess.filter_graph(settings), ["ebur128=peak=true:framelog=quiet"])
+
+    def test_loudnorm_and_resample(self):
+        settings = postprocess.resolve_settings(
+            {"tts_settings": {"postprocess": {"loudnorm": True, "sample_rate": 22050}}}, bitrate="96k"
+        )
+        self.assertTrue(postprocess.needs_reencode(settings))
+        self.assertEqual(settings["bitrate"], "96k")
+        graph = postprocess.filter_graph(settings)
+        self.assertTrue(graph[0].startswith("loudnorm=I=-16.0:TP=-1.5:LRA=11.0"))
+        self.assertEqual(graph[1:], ["aresample=22050"])
+
+    def test_overrides_ignore_none(self):
+        settings = postprocess.resolve_settings({"tts_settings": {"postprocess": {"bitrate": "128k"}}}, bitrate=None)
+        self.assertEqual(settings["bitrate"], "128k")
+
+
+class TestParseStats(unittest.TestCase):
+    def test_loudnorm_report_and_progress(self):
+        stats = postprocess.PostProcessStats(0.0)
+        postprocess._parse_stats(LOUDNORM_STDERR, "out_time_us=1000\nout_time_us=4200000\nprogress=end\n", stats)
+        self.assertEqual(stats.duration_s, 4.2)
+        self.assertEqual((stats.integrated_lufs, stats.true_peak_db, stats.input_integrated_lufs), (-15.2, -10.86, -22.76))
+
+    def test_ebur128_summary(self):
+        stats = postprocess.PostProcessStats(1.0)
+        postprocess._parse_stats(EBUR128_STDERR, "", stats)
+        self.assertEqual((stats.duration_s, stats.integrated_lufs, stats.lra, stats.true_peak_db), (1.0, -22.6, 0.0, -18.4))
+
+
+@unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+class TestSinglePass(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_samples_with_silence_band(self):
+        x = speech_with_pauses([200, 800, 1500])
+        out = self.path("band.mp3")
+        stats = postprocess.process_samples(x, RATE, out, postprocess.resolve_settings({}), silence=(400, 1100, 90))
+        self.assertEqual(stats.pauses_shortened, 1)
+        expected = len(x) / RATE - 0.71
+        self.assertAlmostEqual(stats.duration_s, expected, delta=0.05)
+        self.assertAlmostEqual(frames_of(out)[1], expected, delta=0.1)
+        self.assertIsNotNone(stats.integrated_lufs)
+
+    def test_loudnorm_in_place_with_resample(self):
+        src = self.path("quiet.mp3")
+        audio.encode_mp3(speech_with_pauses([300, 300]) * 0.1, RATE, src, bitrate="64k")
+        settings = postprocess.resolve_settings({"tts_settings": {"postprocess": {"loudnorm": True, "sample_rate": 16000}}})
+        stats = postprocess.process_file(src, src, settings)
+        headers, duration = frames_of(src)
+        self.assertEqual({h.sample_rate for h in headers}, {16000})
+        self.assertEqual(stats.sample_rate, 16000)
+        self.assertAlmostEqual(stats.duration_s, duration, delta=0.1)
+        self.assertGreater(stats.integrated_lufs, stats.input_integrated_lufs)
+        self.assertFalse([p for p in os.listdir(self.tmp.name) if ".tmp" in p])
+
+    def wav(self):
+        pcm = np.round(speech_with_pauses([500]) * 32767).astype("<i2").tobytes()
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(RATE)
+            w.writeframes(pcm)
+        return buf.getvalue()
+
+    def test_wav_bytes_through_stdin(self):
+        out = self.path("dd.mp3")
+        stats = postprocess.process_encoded(self.wav(), out, postprocess.resolve_settings({}))
+        self.assertEqual(stats.sample_rate, RATE)
+        self.assertAlmostEqual(stats.duration_s, 1.5, delta=0.1)
+        self.assertAlmostEqual(frames_of(out)[1], 1.5, delta=0.1)
+
+    def test_wav_streamed_in_chunks(self):
+        data = self.wav()
+
+        async def body():
+            for i in range(0, len(data), 1000):
+                await asyncio.sleep(0)
+                yield data[i:i + 1000]
+
+        out = self.path("stream.mp3")
+        settings = postprocess.resolve_settings({"tts_settings": {"postprocess": {"loudnorm": True}}})
+        stats = asyncio.run(postprocess.process_stream(body(), out, settings))
+        self.assertEqual(stats.sample_rate, RATE)
+        self.assertIn(f"aresample={RATE}", stats.filters)
+        self.assertAlmostEqual(stats.duration_s, 1.5, delta=0.1)
+        self.assertAlmostEqual(frames_of(out)[1], 1.5, delta=0.1)
+
+    def test_metadata_chunks_before_fmt(self):
+        data = self.wav()
+        junk = b"LIST" + (5).to_bytes(4, "little") + b"INFOx\0"  # odd size, padded
+        data = data[:4] + (len(data) - 8 + len(junk)).to_bytes(4, "little") + data[8:12] + junk + data[12:]
+        self.assertEqual(postprocess.wav_sample_rate(data), RATE)
+        self.assertIsNone(postprocess.wav_sample_rate(data[:30]))
+
+        async def body():
+            for i in range(0, len(data), 20):
+                yield data[i:i + 20]
+
+        settings = postprocess.resolve_settings({"tts_settings": {"postprocess": {"loudnorm": True}}})
+        stats = asyncio.run(postprocess.process_stream(body(), self.path("list.mp3"), settings))
+        self.assertIn(f"aresample={RATE}", stats.filters)
+
+    def test_stream_error_mid_download(self):
+        data = self.wav()
+
+        async def body():
+            yield data[:4096]
+            raise ConnectionResetError("peer went away")
+
+        with self.assertRaises(ConnectionResetError):
+            asyncio.run(postprocess.process_stream(body(), self.path("cut.mp3"), postprocess.resolve_settings({})))
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_ffmpeg_failure_is_raised(self):
+        with self.assertRaises(RuntimeError):
+            postprocess.process_encoded(b"not audio at all", self.path("bad.mp3"), postprocess.resolve_settings({}))
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
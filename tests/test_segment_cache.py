@@ -0,0 +1,211 @@
+"""
+Tests for the TTS segment cache: keys, LRU eviction by size, and incremental re-render for Edge and
+Pocket (only new or edited sentences are synthesized, also when the edit is made in a saved
+transcript that has a digest document). Edge uses the in-memory Communicate stand-in
+from test_edge_chunked; Pocket a stand-in model. No network, torch or pocket_tts required.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from digest import instrumentation, mp3, tts
+from digest.document import SECTION_CLOSING, SECTION_INTRO, DigestDocument, Section, document_path, load_for_transcript
+from digest.segment_cache import SegmentCache, segment_key, split_segments
+from test_edge_chunked import SETTINGS, FakeCommunicate
+from test_mp3 import edge_mp3
+
+TEXT = "Good morning. Here is your digest for Monday. Markets rose today. That is all for now."
+
+
+class TestSegmentCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_split_segments(self):
+        nb = " "
+        text = f"Good{nb}morning.  Here{nb}it{nb}is! Done?"
+        self.assertEqual(split_segments(text), [f"Good{nb}morning.", f"Here{nb}it{nb}is!", "Done?"])
+
+    def test_key_covers_provider_voice_settings_and_text(self):
+        base = segment_key("edge_tts", "en-IE-EmilyNeural", {"rate": "+0%"}, "Hello.")
+        self.assertEqual(base, segment_key("edge_tts", "en-IE-EmilyNeural", {"rate": "+0%"}, "Hello."))
+        for other in (
+            segment_key("pocket_tts", "en-IE-EmilyNeural", {"rate": "+0%"}, "Hello."),
+            segment_key("edge_tts", "en-GB-SoniaNeural", {"rate": "+0%"}, "Hello."),
+            segment_key("edge_tts", "en-IE-EmilyNeural", {"rate": "+10%"}, "Hello."),
+            segment_key("edge_tts", "en-IE-EmilyNeural", {"rate": "+0%"}, "Hello!"),
+        ):
+            self.assertNotEqual(base, other)
+
+    def test_least_recently_used_evicted_first(self):
+        cache = SegmentCache(self.tmp.name, max_bytes=350)
+        for i, key in enumerate(("a", "b", "c")):
+            cache.put(key, "mp3", bytes(100))
+            os.utime(cache.path_for(key, "mp3"), (1000 + i, 1000 + i))
+        self.assertIsNotNone(cache.get("a", "mp3"))  # "a" is now the most recent
+        cache.put("d", "mp3", bytes(100))
+        self.assertEqual(sorted(p.stem for p in Path(self.tmp.name).iterdir()), ["a", "c", "d"])
+        self.assertIsNone(cache.get("b", "mp3"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TestEdgeIncremental(unittest.TestCase):
+    def setUp(self):
+        self._communicate = tts.edge_tts.Communicate
+        tts.edge_tts.Communicate = FakeCommunicate
+        FakeCommunicate.calls = []
+        FakeCommunicate.fail_once = set()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.environ["AUDIONEWS_LEDGER_DISABLED"] = "1"
+        settings = dict(SETTINGS, chunked=False)
+        self.config = {
+            "tts_settings": {
+                "edge_tts": settings,
+                "segment_cache": {"enabled": True, "dir": os.path.join(self.tmp.name, "cache")},
+            }
+        }
+
+    def tearDown(self):
+        tts.edge_tts.Communicate = self._communicate
+        self.tmp.cleanup()
+        os.environ.pop("AUDIONEWS_LEDGER_DISABLED", None)
+
+    def _render(self, text: str, name: str) -> bytes:
+        out = os.path.join(self.tmp.name, name)
+        asyncio.run(
+            tts.generate_audio_digest(
+                text, out, tts_provider="edge_tts", voice_name="en-IE-EmilyNeural", language="en_GB", voice_config=self.config
+            )
+        )
+        with open(out, "rb") as f:
+            return f.read()
+
+    def test_only_edited_sentence_is_synthesized(self):
+        first = self._render(TEXT, "one.mp3")
+        self.assertEqual(FakeCommunicate.calls, split_segments(TEXT))
+        expected = b"".join(edge_mp3(len(s.split()), fill=ord(s[0])) for s in split_segments(TEXT))
+        self.assertEqual(mp3.audio_frames(first), expected)
+
+        FakeCommunicate.calls = []
+        self.assertEqual(mp3.audio_frames(self._render(TEXT, "two.mp3")), expected)
+        self.assertEqual(FakeCommunicate.calls, [])
+
+        edited = TEXT.replace("Markets rose today.", "Bonds fell sharply today.")
+        data = self._render(edited, "three.mp3")
+        self.assertEqual(FakeCommunicate.calls, ["Bonds fell sharply today."])
+        self.assertEqual(len(list(mp3.iter_frames(data))), len(edited.split()))
+
+    def test_cached_segment_records_first_audio(self):
+        self._render(TEXT, "one.mp3")
+        path = Path(self.tmp.name) / "ledger.jsonl"
+        instrumentation._active_ledger = instrumentation.Ledger(path, "run", "en_GB")
+        heard = []
+        try:
+            with instrumentation.first_byte_listener(heard.append):
+                self._render(TEXT, "two.mp3")
+        finally:
+            instrumentation.end_run()
+        self.assertEqual(FakeCommunicate.calls, split_segments(TEXT))  # nothing new requested
+        records = instrumentation.load_records([path])
+        self.assertEqual(len(records), len(split_segments(TEXT)))
+        self.assertTrue(all(r["detail"]["cached"] and r["time_to_first_byte_s"] is not None for r in records))
+        self.assertEqual(len(heard), len(records))
+
+    def test_edited_transcript_reaches_tts(self):
+        document = DigestDocument("en_GB", [
+            Section.from_text(SECTION_INTRO, "Good morning. Here is your digest for Monday."),
+            Section.from_text(SECTION_CLOSING, "Markets rose today. That is all for now."),
+        ])
+        transcript = os.path.join(self.tmp.name, "news_digest_ai_2026_10_19.txt")
+        document.save(document_path(transcript))
+        text = document.render("edge_tts")
+        with open(transcript, "w", encoding="utf-8") as f:
+            f.write("HEADER\n" + "=" * 40 + "\n\n" + text)
+        self._render(text, "one.mp3")
+
+        with open(transcript, "w", encoding="utf-8") as f:
+            f.write("HEADER\n" + "=" * 40 + "\n\n" + text.replace("rose", "fell"))
+        edited = tts.parse_existing_transcript(transcript)
+        self.assertIsNone(load_for_transcript(transcript, edited))
+        FakeCommunicate.calls = []
+        self._render(edited, "two.mp3")
+        self.assertEqual(len(FakeCommunicate.calls), 1)
+        self.assertIn("fell", FakeCommunicate.calls[0])
+
+
+class FakePocketModel:
+    sample_rate = 24000
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_audio(self, voice_state, text):
+        self.calls.append(text)
+        return np.full(len(text) * 10, 0.25, dtype=np.float32)
+
+
+@unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+class TestPocketIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model = FakePocketModel()
+        self._loader = tts._pocket_tts_model_and_voice
+        tts._pocket_tts_model_and_voice = lambda voice_id, settings=None: (self.model, {})
+        self.config = {
+            "tts_settings": {
+                "pocket_tts": {"crossfade_ms": 0, "normalize": False, "parallel_workers": 0},
+                "postprocess": {"measure_loudness": False},
+                "segment_cache": {"enabled": True, "dir": os.path.join(self.tmp.name, "cache")},
+            }
+        }
+
+    def tearDown(self):
+        tts._pocket_tts_model_and_voice = self._loader
+        self.tmp.cleanup()
+
+    def test_cached_chunks_reused(self):
+        out = os.path.join(self.tmp.name, "out.mp3")
+        tts._pocket_tts_generate_sync(TEXT, out, "alba", self.config)
+        self.assertEqual(self.model.calls, split_segments(TEXT))
+        self.model.calls = []
+        edited = TEXT.replace("Monday", "Tuesday")
+        stats = tts._pocket_tts_generate_sync(edited, out, "alba", self.config)
+        self.assertEqual(self.model.calls, ["Here is your digest for Tuesday."])
+        self.assertAlmostEqual(stats["duration_s"], len("".join(split_segments(edited))) * 10 / 24000, places=2)
+
+    def test_all_cached_needs_no_model(self):
+        out = os.path.join(self.tmp.name, "out.mp3")
+        tts._pocket_tts_generate_sync(TEXT, out, "alba", self.config)
+        tts._pocket_tts_model_and_voice = lambda *a, **k: self.fail("model loaded for a fully cached episode")
+        stats = tts._pocket_tts_generate_sync(TEXT, out, "alba", self.config)
+        self.assertAlmostEqual(stats["duration_s"], len("".join(split_segments(TEXT))) * 10 / 24000, places=2)
+
+    def test_chunks_follow_language_rules(self):
+        out = os.path.join(self.tmp.name, "out.mp3")
+        self.config["tts_settings"]["segment_cache"]["enabled"] = False
+        self.config["tts_settings"]["pocket_tts"]["chunk_chars"] = 40
+        text = "Im Norden gibt es morgen z.B. Wind und Regen, im Land"
+        tts._pocket_tts_generate_sync(text, out, "alba", self.config, "en_GB")
+        self.assertEqual(self.model.calls, ["Im Norden gibt es morgen z.B.", "Wind und Regen, im Land"])
+        self.model.calls = []
+        # German knows "z.B." is an abbreviation, so it is not a sentence end to cut at
+        tts._pocket_tts_generate_sync(text, out, "alba", self.config, "de_DE")
+        self.assertEqual(self.model.calls, ["Im Norden gibt es morgen", "z.B. Wind und Regen, im Land"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Tests for the sentence breaking engine (byte-identical to the original generic and Bella breakers on
+the archived transcripts and on seeded random long sentences) and for the TTS request chunker (fewest
+chunks under the limit, balanced, cut at the strongest boundaries). No network required.
+"""
+import re
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from digest.segmentation import (
+    BELLA_POLICY,
+    GENERIC_POLICY,
+    SENTENCE,
+    BreakPolicy,
+    break_long_sentences,
+    chunk_text,
+    get_break_policy,
+)
+from digest.tts import parse_existing_transcript, reverse_edge_tts_edits
+from legacy_tts_text import legacy_bella_sentence_breaking, legacy_break_long_sentences
+
+FUZZ_TOKENS = [
+    "word", "clause", "banking", "x", "etc.", " ", " ", " ", " ", " ", "  ", "\t", "\n",
+    ",", ", ", " , ", ",,", ", ,", ";", "; ", " ; ", ";;", "; ;", ",x", ". ", ".", "..", "! ", "?",
+]
+
+
+def _legacy_generic(text):
+    return legacy_break_long_sentences(text, max_words=100, comma_break=80, sub_break=50)
+
+
+def _fuzz_text(rng: random.Random) -> str:
+    size = rng.choice([5, 60, 200, 600])
+    return "".join(rng.choice(FUZZ_TOKENS) for _ in range(size))
+
+
+class TestBreakerEquivalence(unittest.TestCase):
+    """Same output as the original quadratic breakers."""
+
+    def test_archived_transcripts(self):
+        paths = sorted(ROOT.glob("docs/*/news_digest_ai_*.txt"))
+        if not paths:
+            self.skipTest("No archived transcripts found")
+        for path in paths:
+            text = reverse_edge_tts_edits(parse_existing_transcript(str(path)))
+            # Undo earlier breaking so long sentences come back together.
+            joined = text.replace(" . ", " ").replace(", ", " ").replace("; ", ", ")
+            for variant in (text, joined):
+                self.assertEqual(break_long_sentences(variant, GENERIC_POLICY), _legacy_generic(variant), str(path))
+                self.assertEqual(
+                    break_long_sentences(variant, BELLA_POLICY), legacy_bella_sentence_breaking(variant), str(path)
+                )
+
+    def test_random_long_sentences(self):
+        rng = random.Random(29)
+        for _ in range(3000):
+            text = _fuzz_text(rng)
+            self.assertEqual(break_long_sentences(text, GENERIC_POLICY), _legacy_generic(text), repr(text))
+            self.assertEqual(break_long_sentences(text, BELLA_POLICY), legacy_bella_sentence_breaking(text), repr(text))
+
+
+class TestBreakPolicy(unittest.TestCase):
+    """Policies per language and custom policies."""
+
+    def test_every_language_has_a_policy(self):
+        self.assertIs(get_break_policy("bella"), BELLA_POLICY)
+        for language in ("en_GB", "pl_PL", "de_DE", "fr_FR", "es_ES", "it_IT", "nl_NL"):
+            self.assertIs(get_break_policy(language), GENERIC_POLICY)
+
+    def test_short_sentences_untouched(self):
+        self.assertEqual(break_long_sentences("One two. Three four", BELLA_POLICY), "One two .  Three four")
+
+    def test_custom_policy(self):
+        policy = BreakPolicy(max_words=4, chunk_words=3, clause_marks=",", close_at_clause_marks=False,
+                             split_oversized=False, trim=", ", terminators=".!?。")
+        out = break_long_sentences("a b, c d, e f, g h。 short", policy)
+        self.assertEqual(out, "a b, c d, e f, g h 。  short")
+
+    def test_pieces_respect_budget(self):
+        text = ", ".join(["one two three"] * 20000) + "."
+        out = break_long_sentences(text, BELLA_POLICY)
+        pieces = out.split(",")
+        self.assertGreater(len(pieces), 1000)
+        self.assertTrue(all(len(p.split()) <= BELLA_POLICY.chunk_words for p in pieces))
+
+
+CHUNK_WORDS = ["a", "to", "the", "market", "rose,", "sharply;", "again.", "Dr.", "policy!", "e.g."]
+
+
+def _fewest_chunks(text: str, max_chars: int) -> int:
+    """Reference count by dynamic programming over every word gap."""
+    words = [(m.start(), m.end()) for m in re.finditer(r"\S+", text)]
+    best = [0] + [len(words) + 1] * len(words)
+    for j in range(1, len(words) + 1):
+        for i in range(j):
+            if words[j - 1][1] - words[i][0] <= max_chars:
+                best[j] = min(best[j], best[i] + 1)
+    return best[-1]
+
+
+class TestChunkText(unittest.TestCase):
+    """Fewest, balanced TTS requests cut at sentence, clause and word boundaries."""
+
+    def test_fewest_chunks_within_limit(self):
+        rng = random.Random(50)
+        for _ in range(2000):
+            text = " ".join(rng.choice(CHUNK_WORDS) for _ in range(rng.randint(1, 40)))
+            max_chars = rng.randint(9, 60)
+            chunks = chunk_text(text, max_chars)
+            self.assertEqual(" ".join(chunks), text, repr(text))
+            self.assertTrue(all(len(c) <= max_chars for c in chunks), repr(text))
+            self.assertEqual(len(chunks), _fewest_chunks(text, max_chars), repr(text))
+
+    def test_chunks_are_balanced(self):
+        text = " ".join(["The markets rose again this week."] * 7)
+        # Greedy packing gives 3 + 3 + 1 sentences; balanced gives 2 + 3 + 2
+        self.assertEqual([c.count(".") for c in chunk_text(text, 110)], [2, 3, 2])
+
+    def test_strongest_boundary_near_the_middle(self):
+        text = "Ministers met late in Brussels, and they agreed at dawn. Nobody was at all surprised by the outcome"
+        self.assertEqual(chunk_text(text, 60)[0], "Ministers met late in Brussels, and they agreed at dawn.")
+        # Without the sentence end the comma is too far from the middle; a word gap there wins
+        text = text.replace(". Nobody", " but nobody")
+        self.assertEqual(chunk_text(text, 60)[0], "Ministers met late in Brussels, and they agreed at")
+
+    def test_abbreviations_per_language(self):
+        text = "Dr. Smith and Prof. J. Jones met today. Everyone agreed in the end"
+        self.assertEqual(chunk_text(text, 45)[0], "Dr. Smith and Prof. J. Jones met today.")
+        german = "Es gibt z.B. Wind und Regen heute. Morgen wird es wieder sonnig"
+        self.assertEqual(chunk_text(german, 40, "de_DE", min_boundary=SENTENCE), [
+            "Es gibt z.B. Wind und Regen heute.", "Morgen wird es wieder sonnig",
+        ])
+
+    def test_sentence_mode_keeps_long_sentences_whole(self):
+        text = "Short one. " + "word " * 30 + "end. Short two."
+        chunks = chunk_text(text, 40, min_boundary=SENTENCE, split_long=False)
+        self.assertEqual([len(c) > 40 for c in chunks], [False, True, False])
+
+    def test_long_words_split_evenly_in_linear_time(self):
+        self.assertEqual([len(c) for c in chunk_text("x" * 250, 100)], [83, 83, 84])
+        chunks = chunk_text("x" * 4_000_000, 120)
+        self.assertEqual((len(chunks), max(map(len, chunks))), (33334, 120))
+        text = "Markets rose, and then they fell. " * 100_000
+        chunks = chunk_text(text, 120)
+        self.assertEqual(" ".join(chunks), text.strip())
+        self.assertLessEqual(max(map(len, chunks)), 120)
+
+
+if __name__ == "__main__":
+    unittest.main()
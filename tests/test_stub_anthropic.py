@@ -0,0 +1,100 @@
+"""
+Tests for the local stand-in Anthropic server and stub client. No network required.
+"""
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import stub_anthropic_server as stub
+from digest.ai_analysis import ai_analyze_stories, ai_synthesize_content
+from digest.config_loader import AI_PROMPTS_CONFIG
+from digest.models import NewsStory
+
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
+
+def _stories():
+    titles = [
+        "Bank of England holds interest rates as inflation edges lower",
+        "Government unveils plan to cut hospital waiting lists",
+        "Ukraine and Europe leaders meet for peace talks",
+        "Storm brings flood warnings across the north",
+    ]
+    return [NewsStory(title=t, source="BBC News", link=None, timestamp="2026-10-18T06:00:00") for t in titles]
+
+
+class TestStubClient(unittest.TestCase):
+    """In-process stub client drives the real analysis/synthesis code."""
+
+    def test_analysis_and_synthesis(self):
+        client = stub.StubAnthropicClient("instant")
+        stories = _stories()
+        themes = ai_analyze_stories(client, "en_GB", stories, AI_PROMPTS_CONFIG)
+        self.assertIn("economy", themes)
+        self.assertIs(themes["economy"][0], stories[0])
+        text = asyncio.run(
+            ai_synthesize_content(client, "en_GB", "economy", themes["economy"], "", AI_PROMPTS_CONFIG)
+        )
+        self.assertIn("interest rates", text)
+
+    def test_replies_are_deterministic(self):
+        body = {"messages": [{"role": "user", "content": "1. Bank raises interest rates (Source: BBC)"}]}
+        self.assertEqual(stub.reply_for(body), stub.reply_for(body))
+        self.assertEqual(json.loads(stub.reply_for(body)), {"economy": [{"index": 1, "significance": 9}]})
+
+
+class TestStubServer(unittest.TestCase):
+    """HTTP server speaks the Messages API, serves headlines and DD TTS audio."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = stub.start_server("instant")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_news_page_and_tts(self):
+        page = requests.get(f"{self.server.base_url}/news/bbc-news", timeout=5)
+        self.assertEqual(page.status_code, 200)
+        self.assertIn("<h2>", page.text)
+        job = requests.post(f"{self.server.base_url}/tts", json={"text": "one two three four five"}, timeout=5).json()
+        audio = requests.get(f"{self.server.base_url}/audio/{job['name']}", timeout=5)
+        self.assertEqual(audio.content[:4], b"RIFF")
+
+    @unittest.skipIf(anthropic is None, "anthropic SDK not installed")
+    def test_sdk_messages_and_streaming(self):
+        client = anthropic.Anthropic(api_key="stub", base_url=self.server.base_url)
+        content = "Summarize:\n- Bank holds interest rates\n- Markets rise"
+        response = client.messages.create(
+            model="claude-test",
+            max_tokens=100,
+            messages=[{"role": "user", "content": content}],
+        )
+        text = response.content[0].text
+        self.assertIn("bank holds interest rates", text)
+        self.assertGreater(response.usage.output_tokens, 0)
+        with client.messages.stream(
+            model="claude-test",
+            max_tokens=100,
+            messages=[{"role": "user", "content": content}],
+        ) as stream:
+            streamed = "".join(stream.text_stream)
+        self.assertEqual(streamed, text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+Golden snapshot check for the TTS text stages over the archived transcripts: the normalizer and
+breakers stages are pinned to the original implementations, the rest to current output. No network
+required.
+
+If an output change is intended, regenerate with: python scripts/benchmark_tts_text.py --write-snapshot
+"""
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "scripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import benchmark_tts_text as golden
+
+
+class TestGoldenSnapshot(unittest.TestCase):
+    """Every stage's output matches the snapshot byte-for-byte."""
+
+    def test_outputs_match_snapshot(self):
+        if not golden.SNAPSHOT_PATH.exists():
+            self.skipTest("No golden snapshot")
+        corpus = golden.load_corpus()
+        if not corpus:
+            self.skipTest("No archived transcripts found")
+        snapshot = golden.load_snapshot()
+        self.assertEqual(snapshot["stages"], list(golden.STAGES))
+        checked, mismatches = golden.compare_snapshot(corpus, snapshot)
+        self.assertGreater(checked, 0)
+        self.assertEqual(mismatches, [])
+
+    def test_snapshot_pins_original_output(self):
+        if not golden.SNAPSHOT_PATH.exists():
+            self.skipTest("No golden snapshot")
+        snapshot = golden.load_snapshot()
+        self.assertEqual(snapshot["baseline_stages"], list(golden.BASELINE))
+        corpus = golden.load_corpus()[::20]
+        if not corpus:
+            self.skipTest("No archived transcripts found")
+        for t in corpus:
+            want = snapshot["transcripts"][t.key]
+            got = golden.output_hashes(t, baseline=True)
+            for stage in golden.BASELINE:
+                self.assertEqual(got[stage], want[stage], f"{t.key}: {stage}")
+
+    def test_benchmark_reports_throughput(self):
+        corpus = golden.load_corpus("bella")[:2]
+        if not corpus:
+            self.skipTest("No archived transcripts found")
+        rows = golden.benchmark(corpus, repeat=1)
+        self.assertEqual({r["stage"] for r in rows}, set(golden.STAGES))
+        self.assertTrue(all(r["chars"] > 0 for r in rows))
+
+
+if __name__ == "__main__":
+    unittest.main()
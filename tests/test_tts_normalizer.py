@@ -0,0 +1,100 @@
+"""
+Equivalence tests for the compiled TTS normalizer against the original implementation.
+
+Uses the archived transcripts under docs/*/news_digest_ai_*.txt (as saved, and with the Edge TTS
+edits reversed so acronyms and transitions are normalized again) plus seeded random inputs.
+No network required.
+"""
+import random
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from digest.digest_synthesis import _normalize_for_tts, get_normalizer
+from digest.tts import parse_existing_transcript, reverse_edge_tts_edits
+from legacy_tts_text import legacy_normalize_for_tts
+
+LANGUAGES = ["en_GB", "bella", "pl_PL", "de_DE", "fr_FR"]
+
+FUZZ_TOKENS = [
+    "word", "the", "The", "news", "In", "politics", "economy", "news", "Meanwhile", "However",
+    "Turning to", "From a banking", "From a", "Here's", "Heres", "heres", "This", "These", "Understanding",
+    "W wiadomościach", "polityka", "dzisiaj", "Tymczasem", "Ukraines", "NATO", "NHS", "MP", "MPs", "UK",
+    "US", "EU", "GDP", "CEO", "BBC", "UK's", "N A T O",
+    " ", " ", " ", " ", "  ", "\t", " ", "\n", ".", ". ", "..", "!", "?", "?! ", ",", ", ", ",,",
+    ";", "; ", " ;", ":", '"', "'", "—", "–", "x.y", "3.5",
+]
+
+
+def _fuzz_text(rng: random.Random) -> str:
+    size = rng.choice([3, 10, 40, 150, 400])
+    return "".join(rng.choice(FUZZ_TOKENS) for _ in range(size))
+
+
+def _corpus():
+    for path in sorted(ROOT.glob("docs/*/news_digest_ai_*.txt")):
+        language = path.parent.name
+        yield path, language, parse_existing_transcript(str(path))
+
+
+class TestNormalizerEquivalence(unittest.TestCase):
+    """Compiled normalizer output is byte-identical to the original chain of substitutions."""
+
+    def test_archived_transcripts(self):
+        checked = 0
+        for path, language, text in _corpus():
+            for variant in (text, reverse_edge_tts_edits(text)):
+                self.assertEqual(
+                    _normalize_for_tts(variant, language),
+                    legacy_normalize_for_tts(variant, language),
+                    f"{path.relative_to(ROOT)} ({language})",
+                )
+            checked += 1
+        if checked == 0:
+            self.skipTest("No archived transcripts found")
+
+    def test_transitions_after_reversing_semicolons(self):
+        # Archived text already has transitions folded into "; X"; turn them back into sentences.
+        for path, language, text in list(_corpus())[::7]:
+            text = reverse_edge_tts_edits(text).replace("; ", ". ").replace(", The", ". The")
+            self.assertEqual(
+                _normalize_for_tts(text, language),
+                legacy_normalize_for_tts(text, language),
+                f"{path.relative_to(ROOT)} ({language})",
+            )
+
+    def test_random_inputs(self):
+        rng = random.Random(20261018)
+        for _ in range(3000):
+            text = _fuzz_text(rng)
+            language = rng.choice(LANGUAGES)
+            self.assertEqual(
+                _normalize_for_tts(text, language),
+                legacy_normalize_for_tts(text, language),
+                repr((language, text)),
+            )
+
+
+class TestNormalizer(unittest.TestCase):
+    """Behaviour of the normalizer itself."""
+
+    def test_compiled_once_per_language(self):
+        self.assertIs(get_normalizer("en_GB"), get_normalizer("en_GB"))
+        self.assertIsNot(get_normalizer("en_GB"), get_normalizer("bella"))
+
+    def test_examples(self):
+        out = _normalize_for_tts("The NHS said no. Meanwhile the UK — and NATO — waited.", "en_GB")
+        self.assertEqual(
+            out,
+            "The\u00A0N\u00A0H\u00A0S\u00A0said\u00A0no;\u00A0Meanwhile\u00A0the\u00A0U\u00A0K\u00A0,"
+            "\u00A0\u00A0and\u00A0N\u00A0A\u00A0T\u00A0O\u00A0,\u00A0\u00A0waited.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Tests for the TTS provider registry and scheduler: lookup of the built-in providers, their declared
+capabilities, chunk sizes and parallelism chosen from them, and a new provider that implements only
+per-chunk synthesis dispatched, chunked, scheduled and assembled by the shared scheduler. No network required.
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT, ROOT / "tests"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from digest import mp3, tts, tts_providers
+from digest.tts_providers import Capabilities, plan
+from test_mp3 import edge_mp3
+
+
+class TestRegistry(unittest.TestCase):
+    def test_builtin_providers(self):
+        self.assertEqual(set(tts_providers.names()), {"edge_tts", "pocket_tts", "elevenlabs", "dd_tts"})
+        self.assertIs(tts_providers.get("edge_tts"), tts.EDGE_TTS)
+        with self.assertRaisesRegex(ValueError, "Unknown TTS provider 'google_tts'"):
+            tts_providers.get("google_tts")
+
+    def test_capabilities_follow_settings(self):
+        self.assertEqual(tts.POCKET_TTS.capabilities({"parallel_workers": 4}).max_concurrency, 4)
+        self.assertEqual(tts.POCKET_TTS.capabilities({}).max_concurrency, 1)
+        caps = tts.ELEVENLABS.capabilities({"output_format": "pcm_22050"})
+        self.assertEqual((caps.output_format, caps.sample_rate), ("pcm", 22050))
+        self.assertEqual(tts.DD_TTS.capabilities({}).output_format, "wav")
+        self.assertIsNone(tts.DD_TTS.capabilities({}).max_chars)
+
+
+class TestPlan(unittest.TestCase):
+    def test_request_limit_sets_the_minimum_chunk_count(self):
+        caps = Capabilities(max_chars=120, max_concurrency=1, min_chars=60)
+        self.assertEqual(plan(caps, 1000), tts_providers.Plan(chunk_chars=112, concurrency=1, chunks=9))
+
+    def test_chunks_fill_the_concurrent_slots(self):
+        caps = Capabilities(max_chars=4500, max_concurrency=3, min_chars=300)
+        self.assertEqual(plan(caps, 9000), tts_providers.Plan(chunk_chars=3000, concurrency=3, chunks=3))
+        # Too short to be worth splitting three ways
+        self.assertEqual(plan(caps, 700), tts_providers.Plan(chunk_chars=350, concurrency=2, chunks=2))
+        self.assertEqual(plan(caps, 250), tts_providers.Plan(chunk_chars=250, concurrency=1, chunks=1))
+
+    def test_unlimited_requests(self):
+        caps = Capabilities(max_chars=None, max_concurrency=3)
+        self.assertEqual(plan(caps, 12000).chunks, 3)
+        self.assertEqual(plan(Capabilities(max_chars=None), 12000).chunk_chars, 12000)
+
+    def test_settings_pin_chunk_size_and_concurrency(self):
+        caps = Capabilities(max_chars=4500, max_concurrency=3)
+        self.assertEqual(plan(caps, 9000, {"chunk_size": 1000, "max_concurrency": 5}, "chunk_size"),
+                         tts_providers.Plan(chunk_chars=1000, concurrency=5, chunks=9))
+        self.assertEqual(plan(caps, 9000, {"chunk_chars": None, "max_concurrency": None}).chunk_chars, 3000)
+        self.assertEqual(tts.ELEVENLABS.plan(9000, {"chunk_size": 1000}).chunk_chars, 1000)
+
+
+class EchoTTS(tts_providers.TTSProvider):
+    """Per-chunk synthesis only: one silent MPEG frame per word."""
+
+    name = "echo_tts"
+    label = "Echo"
+    CAPABILITIES = Capabilities(max_chars=10, max_concurrency=2)
+
+    def __init__(self):
+        self.chunks_seen = []
+        self.active = self.peak = 0
+
+    async def synthesize_chunk(self, job, pieces, index, connection, call):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01 * (len(pieces) - index))  # later chunks finish first
+        self.active -= 1
+        self.chunks_seen.append(pieces[index])
+        return edge_mp3(len(pieces[index].split()), fill=ord(pieces[index][0]))
+
+
+class PcmEchoTTS(EchoTTS):
+    """Raw 16-bit PCM chunks: 0.1 s of silence per word."""
+
+    name = "pcm_echo_tts"
+    CAPABILITIES = Capabilities(max_chars=10, max_concurrency=2, output_format="pcm", sample_rate=8000)
+
+    async def synthesize_chunk(self, job, pieces, index, connection, call):
+        self.chunks_seen.append(pieces[index])
+        return bytes(2 * 800 * len(pieces[index].split()))
+
+
+class TestNewProvider(unittest.TestCase):
+    TEXT = "One two. Six ten. Ten six."
+
+    def _run(self, provider, out):
+        tts_providers.register(provider)
+        try:
+            return asyncio.run(
+                tts.generate_audio_digest(
+                    self.TEXT, out, tts_provider=provider.name, voice_name="echo", language="en_GB",
+                    voice_config={"tts_settings": {"postprocess": {"measure_loudness": False}}},
+                )
+            )
+        finally:
+            tts_providers._registry.pop(provider.name, None)
+
+    def test_registered_provider_is_chunked_scheduled_and_joined(self):
+        provider = EchoTTS()
+        with tempfile.TemporaryDirectory() as tmp:
+            out = os.path.join(tmp, "out.mp3")
+            stats = self._run(provider, out)
+            with open(out, "rb") as f:
+                data = f.read()
+        self.assertEqual(sorted(provider.chunks_seen), sorted(["One two.", "Six ten.", "Ten six."]))
+        self.assertEqual(provider.peak, 2)
+        # Joined in text order whatever order the chunks completed in
+        expected = b"".join(edge_mp3(2, fill=ord(c)) for c in "OST")
+        self.assertEqual(mp3.audio_frames(data), expected)
+        self.assertEqual((stats["words"], stats["filename"]), (6, out))
+
+    @unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg not installed")
+    def test_raw_pcm_is_encoded_at_the_declared_rate(self):
+        provider = PcmEchoTTS()
+        with tempfile.TemporaryDirectory() as tmp:
+            stats = self._run(provider, os.path.join(tmp, "out.mp3"))
+        self.assertEqual(len(provider.chunks_seen), 3)
+        self.assertAlmostEqual(stats["duration"], 0.6, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()